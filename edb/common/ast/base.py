@@ -24,6 +24,7 @@ import collections.abc
 import functools
 import re
 import sys
+import types
 from typing import *  # NoQA
 
 import typing_inspect
@@ -53,7 +54,25 @@ class Field:
 
 class MetaAST(type):
     def __new__(mcls, name, bases, dct):
-        cls = super().__new__(mcls, name, bases, dct)
+        own_annos = dct.get('__annotations__', {})
+        # Field defaults are moved out of the class namespace, as they
+        # would otherwise conflict with the field slots.
+        defaults = {f_name: dct.pop(f_name)
+                    for f_name in own_annos if f_name in dct}
+
+        if '__slots__' not in dct and not dct.get('__abstract_node__'):
+            dct['__slots__'] = _get_field_slots(
+                name, bases, dct, own_annos)
+
+        try:
+            cls = super().__new__(mcls, name, bases, dct)
+        except TypeError as e:
+            if 'lay-out conflict' not in str(e):
+                raise
+            raise RuntimeError(
+                f'cannot create AST class {name!r}: '
+                f'more than one of its bases stores fields, mark the '
+                f'mixin bases with __abstract_node__ = True') from e
 
         cls.__abstract_node__ = bool(dct.get('__abstract_node__'))
 
@@ -116,11 +135,7 @@ class MetaAST(type):
                 if f_type is object:
                     f_type = None
 
-                if f_name in dct:
-                    f_default = dct[f_name]
-                    delattr(cls, f_name)
-                else:
-                    f_default = None
+                f_default = defaults.get(f_name)
 
                 f_default = _check_annotation(f_type, f_fullname, f_default)
 
@@ -178,11 +193,97 @@ class MetaAST(type):
 
         cls._fields = fields
 
+        if fields:
+            if _is_typecheck_enabled():
+                cls._init_fields = AST._init_fields
+            else:
+                cls._init_fields = _make_init_fields(cls)
+
     def get_field(cls, name):
         return cls._fields.get(name)
 
 
+def _get_field_slots(name, bases, dct, own_annos):
+    """Return the names of the fields that need a slot in a new class.
+
+    A concrete node class stores every field in a slot, unless it is
+    already stored in a slot by one of the bases, or is overridden by
+    a property or another class attribute.  Abstract node classes get
+    no slots, so that they can be freely used as mixins.
+    """
+    mro = [c for base in bases for c in base.__mro__]
+    slotted = set()
+    for c in mro:
+        slots = c.__dict__.get('__slots__', ())
+        slotted.update((slots,) if isinstance(slots, str) else slots)
+
+    field_names = []
+    for base in bases:
+        if isinstance(base, MetaAST):
+            field_names.extend(base._fields)
+    for field in dct.get(f'_{name}__fields', ()):
+        field_names.append(field[0] if isinstance(field, tuple) else field)
+    field_names.extend(own_annos)
+
+    slots = []
+    for f_name in field_names:
+        if (f_name in slotted or f_name in dct
+                or any(f_name in c.__dict__ for c in mro)):
+            continue
+        slotted.add(f_name)
+        slots.append(f_name)
+
+    return tuple(slots)
+
+
+def _make_init_fields(cls):
+    """Generate an _init_fields() method specialized for *cls*.
+
+    The generated code is equivalent to the generic AST._init_fields(),
+    sans type checks, but avoids iterating over the field specs and
+    resolving the defaults on every node instantiation.
+    """
+    ns = {'_setattr': object.__setattr__}
+    body = []
+    for i, (f_name, field) in enumerate(cls._fields.items()):
+        default = field.default
+        if default is None:
+            value = f'kwargs.get({f_name!r})'
+        elif callable(default):
+            ns[f'_default{i}'] = default
+            value = f'kwargs[{f_name!r}] if {f_name!r} in kwargs ' \
+                    f'else _default{i}()'
+        else:
+            ns[f'_default{i}'] = default
+            value = f'kwargs.get({f_name!r}, _default{i})'
+
+        stmt = f'_setattr(self, {f_name!r}, {value})'
+
+        attr = getattr(cls, f_name, None)
+        if (attr is not None
+                and not isinstance(attr, types.MemberDescriptorType)):
+            # Field overriden as a property in a subclass.
+            body.append(f'try:\n        {stmt}\n'
+                        f'    except AttributeError:\n        pass')
+        else:
+            body.append(stmt)
+
+    if not body:
+        body.append('pass')
+
+    code = 'def _init_fields(self, kwargs):\n    ' + '\n    '.join(body)
+    exec(code, ns)
+    func = ns['_init_fields']
+    func.__qualname__ = f'{cls.__qualname__}._init_fields'
+    func.__module__ = cls.__module__
+    return func
+
+
 class AST(object, metaclass=MetaAST):
+    # Field values of concrete nodes are stored in slots (see
+    # _get_field_slots()), __dict__ is only materialized for ad-hoc
+    # attributes.
+    __slots__ = ('__dict__',)
     __fields = []
     __ast_frozen_fields__ = frozenset()
 
@@ -192,7 +293,12 @@ class AST(object, metaclass=MetaAST):
                 f'cannot instantiate abstract AST node '
                 f'{self.__class__.__name__!r}')
 
-        should_check_types = __debug__ and _check_type is _check_type_real
+        self._init_fields(kwargs)
+
+    def _init_fields(self, kwargs):
+        # Unless the type checks are enabled, this is replaced by
+        # a version generated for each node class by the metaclass.
+        should_check_types = _is_typecheck_enabled()
         for field_name, field in self.__class__._fields.items():
             if field_name in kwargs:
                 value = kwargs[field_name]
@@ -222,16 +328,43 @@ class AST(object, metaclass=MetaAST):
 
     def __deepcopy__(self, memo):
         copied = self.__class__()
-        for field, value in iter_fields(self, include_meta=False):
-            setattr(copied, field, copy.deepcopy(value, memo))
+        for field_name, field in self.__class__._fields.items():
+            if field.meta:
+                continue
+            value = getattr(self, field_name, _marker)
+            if value is _marker:
+                continue
+            if value.__class__ not in _atomic_types:
+                value = copy.deepcopy(value, memo)
+            # Bypass overloaded setattr, the copied values have
+            # already passed the type checks.
+            try:
+                object.__setattr__(copied, field_name, value)
+            except AttributeError:
+                # Field overriden as a property in a subclass.
+                pass
         return copied
 
+    def __setstate__(self, state):
+        if isinstance(state, tuple) and len(state) == 2:
+            # (__dict__, slots) state.
+            state = {**(state[0] or {}), **(state[1] or {})}
+
+        for name, value in state.items():
+            # Bypass overloaded setattr
+            try:
+                object.__setattr__(self, name, value)
+            except AttributeError:
+                # Field overriden as a property in a subclass.
+                pass
+
     if __debug__:
         def __setattr__(self, name, value):
             super().__setattr__(name, value)
             field = self._fields.get(name)
             if field:
-                self.check_field_type(field, value)
+                if _check_type is _check_type_real:
+                    self.check_field_type(field, value)
                 if name in self.__ast_frozen_fields__:
                     raise TypeError(f'cannot set immutable {name} on {self!r}')
 
@@ -293,6 +426,10 @@ def is_ast_node(obj):
 
 _marker = object()
 
+#: Field value types that are immutable and are not copied by
+#: AST.__deepcopy__().
+_atomic_types = frozenset({type(None), bool, int, float, str})
+
 
 def iter_fields(node, *, include_meta=True, exclude_unset=False):
     exclude_meta = not include_meta
@@ -418,6 +555,10 @@ def _check_mapping_type(type_, value, raise_error, instance_type):
         _check_type(vtype, v, raise_error)
 
 
+def _is_typecheck_enabled():
+    return __debug__ and _check_type is _check_type_real
+
+
 def _check_type_passthrough(type_, value, raise_error):
     pass
 
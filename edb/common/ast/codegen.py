@@ -31,6 +31,8 @@ class SourceGenerator(NodeVisitor):
 
     result: List[str]
 
+    memoize = False
+
     def __init__(
         self,
         indent_with: str = ' ' * 4,
@@ -46,38 +48,62 @@ class SourceGenerator(NodeVisitor):
         self.current_line = 1
         self.pretty = pretty
 
+    @classmethod
+    def _find_visitor(cls, node_cls: type) -> Optional[Callable[..., Any]]:
+        # Source generators only dispatch on the exact class of a node.
+        return getattr(cls, 'visit_' + node_cls.__name__, None)
+
+    def visit(self, node: Any) -> None:
+        # Node classes that have already been dispatched on are never
+        # containers, so skip the container check for them.
+        try:
+            visitor = self._visitors[node.__class__]
+        except KeyError:
+            return super().visit(node)
+
+        if visitor is None:
+            return self.generic_visit(node)
+        else:
+            return visitor(self, node)
+
     def node_visit(self, node: base.AST) -> None:
-        method = 'visit_' + node.__class__.__name__
-        visitor = getattr(self, method, self.generic_visit)
-        return visitor(node)
+        try:
+            visitor = self._visitors[node.__class__]
+        except KeyError:
+            visitor = self._get_visitor(node.__class__)
+
+        if visitor is None:
+            return self.generic_visit(node)
+        else:
+            return visitor(self, node)
 
     def write(
         self,
         *x: str,
         delimiter: Optional[str] = None
     ) -> None:
+        result = self.result
         if self.new_lines:
-            if self.result and self.pretty:
+            if result and self.pretty:
                 self.current_line += self.new_lines
-                self.result.append('\n' * self.new_lines)
+                result.append('\n' * self.new_lines)
             if self.pretty:
-                self.result.append(self.indent_with * self.indentation)
-                self.result.append(' ' * self.char_indentation)
+                result.append(self.indent_with * self.indentation)
+                result.append(' ' * self.char_indentation)
             else:
-                self.result.append(' ')
+                result.append(' ')
             self.new_lines = 0
+
+        chunks: Sequence[str] = x
         if delimiter:
-            self.result.append(x[0])
             chain = itertools.chain.from_iterable
-            chunks = chain((delimiter, v) for v in x[1:])
-        else:
-            chunks = x
+            chunks = [x[0], *chain((delimiter, v) for v in x[1:])]
 
         for chunk in chunks:
-            if not isinstance(chunk, str):
+            if chunk.__class__ is not str and not isinstance(chunk, str):
                 raise ValueError(
                     'invalid text chunk in codegen: {!r}'.format(chunk))
-            self.result.append(chunk)
+        result.extend(chunks)
 
     def visit_list(
         self,
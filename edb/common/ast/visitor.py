@@ -18,6 +18,7 @@
 
 
 from __future__ import annotations
+from typing import *  # NoQA
 
 from edb.common import typeutils
 
@@ -107,8 +108,28 @@ class NodeVisitor:
     Don't use the `NodeVisitor` if you want to apply changes to nodes during
     traversing.  For this a special visitor exists (`NodeTransformer`) that
     allows modifications.
+
+    Visitor methods are looked up on the visitor class once per node
+    class, and the result is kept in a per-class dispatch table, so
+    they cannot be added to or replaced on visitor instances.
+
+    Every visited node is recorded in the `memo`, so that a node that
+    is reachable by more than one path is only visited once.  Visitors
+    that walk trees and can safely visit a node again may set `memoize`
+    to False to skip the bookkeeping.
     """
 
+    #: Whether to record the visited nodes and their results in the memo.
+    memoize = True
+
+    #: Visitor methods for node classes, computed on demand.  Every
+    #: subclass gets its own table.
+    _visitors: Dict[type, Optional[Callable[..., Any]]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._visitors = {}
+
     def __init__(self, *, context=None, memo=None):
         if memo is not None:
             self._memo = memo
@@ -141,21 +162,42 @@ class NodeVisitor:
         else:
             return result
 
-    def node_visit(self, node):
-        if node in self.memo:
-            return self.repeated_node_visit(node)
-        else:
-            self.memo[node] = None
+    @classmethod
+    def _get_visitor(cls, node_cls: type) -> Optional[Callable[..., Any]]:
+        try:
+            return cls._visitors[node_cls]
+        except KeyError:
+            visitor = cls._find_visitor(node_cls)
+            cls._visitors[node_cls] = visitor
+            return visitor
 
-        for cls in node.__class__.__mro__:
-            method = 'visit_' + cls.__name__
-            visitor = getattr(self, method, None)
+    @classmethod
+    def _find_visitor(cls, node_cls: type) -> Optional[Callable[..., Any]]:
+        for base_cls in node_cls.__mro__:
+            visitor = getattr(cls, 'visit_' + base_cls.__name__, None)
             if visitor is not None:
-                break
+                return visitor
+        return None
+
+    def node_visit(self, node):
+        if self.memoize:
+            if node in self._memo:
+                return self.repeated_node_visit(node)
+            else:
+                self._memo[node] = None
+
+        try:
+            visitor = self._visitors[node.__class__]
+        except KeyError:
+            visitor = self._get_visitor(node.__class__)
+
+        if visitor is None:
+            result = self.generic_visit(node)
         else:
-            visitor = self.generic_visit
-        result = visitor(node)
-        self.memo[node] = result
+            result = visitor(self, node)
+
+        if self.memoize:
+            self._memo[node] = result
         return result
 
     def visit(self, node):
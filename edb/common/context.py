@@ -34,6 +34,7 @@ contexts through the AST structure.
 from __future__ import annotations
 
 import bisect
+import copy
 
 from edb.common import ast
 from edb.common import markup
@@ -67,6 +68,21 @@ class ParserContext(markup.MarkupExceptionContext):
         if end.pointer is None and end.column is None:
             end.pointer, end.column = self.offset_col_from_line(end.line)
 
+    def __deepcopy__(self, memo):
+        # Contexts are copied along with every copied AST, so avoid
+        # the generic deepcopy machinery.  Only the source points are
+        # ever modified in place (see rebase_context()), the source
+        # buffer and names are immutable strings.
+        copied = self.__class__.__new__(self.__class__)
+        copied.__dict__.update(self.__dict__)
+        copied.start = SourcePoint(
+            self.start.line, self.start.column, self.start.pointer)
+        copied.end = SourcePoint(
+            self.end.line, self.end.column, self.end.pointer)
+        if self.document is not None:
+            copied.document = copy.deepcopy(self.document, memo)
+        return copied
+
     def line_col_from_offset(self, offset):
         line_no = 1
         col_no = 1
@@ -315,6 +331,9 @@ class ContextPropagator(ContextVisitor):
     descendants.
     """
 
+    # Visiting a node again yields the context it got the first time.
+    memoize = False
+
     def __init__(self, default=None):
         super().__init__()
         self._default = default
@@ -353,6 +372,9 @@ class ContextPropagator(ContextVisitor):
 
 
 class ContextValidator(ContextVisitor):
+
+    memoize = False
+
     def generic_visit(self, node):
         if getattr(node, 'context', None) is None:
             raise RuntimeError('node {} has no context'.format(node))
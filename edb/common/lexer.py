@@ -96,6 +96,10 @@ class Lexer:
     asbytes = False
     _NL = '\n'
 
+    # Token types that are consumed without being emitted, e.g.
+    # whitespace.  Skipped tokens only advance the lexer position.
+    skip_tokens = frozenset()
+
     def __init_subclass__(cls):
         if not hasattr(cls, 'states'):
             return
@@ -155,6 +159,15 @@ class Lexer:
         Update the lexer lineno, column, and start.
         """
         start_pos = pctx.SourcePoint(self.lineno, self.column, self.start)
+        self.advance(rule_token, txt)
+        end_pos = pctx.SourcePoint(self.lineno, self.column, self.start)
+
+        return Token(txt, type=rule_token, text=txt,
+                     start=start_pos, end=end_pos,
+                     filename=self.filename)
+
+    def advance(self, rule_token, txt):
+        """Update the lexer lineno, column, and start past txt."""
         len_txt = len(txt)
 
         if rule_token is self.NL:
@@ -171,11 +184,6 @@ class Lexer:
             self.column += len_txt
 
         self.start += len_txt
-        end_pos = pctx.SourcePoint(self.lineno, self.column, self.start)
-
-        return Token(txt, type=rule_token, text=txt,
-                     start=start_pos, end=end_pos,
-                     filename=self.filename)
 
     def lex(self):
         """Tokenize the src.
@@ -191,6 +199,9 @@ class Lexer:
         if start_tok is not None:
             yield start_tok
 
+        rules = Rule._map
+        skip_tokens = self.skip_tokens
+
         while self.start < self.end:
             for match in self.re_states[self._state].finditer(src, self.start):
                 rule_id = match.lastgroup
@@ -201,12 +212,13 @@ class Lexer:
                     # Error group -- no rule has been matched
                     self.handle_error(txt)
 
-                rule = Rule._map[rule_id]
+                rule = rules[rule_id]
                 rule_token = rule.token
 
-                token = self.token_from_text(rule_token, txt)
-
-                yield token
+                if rule_token in skip_tokens:
+                    self.advance(rule_token, txt)
+                else:
+                    yield self.token_from_text(rule_token, txt)
 
                 if rule.next_state and rule.next_state != self._state:
                     # Rule dictates that the lexer state should be
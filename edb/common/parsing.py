@@ -25,6 +25,7 @@ import sys
 import types
 
 import parsing
+from parsing import grammar as parsing_grammar
 
 from edb import errors
 
@@ -290,6 +291,41 @@ class ParserError(Exception):
             return None
 
 
+class ActionTable(list):
+    """LR action table with deduplicated action lists and rows.
+
+    The tables generated by the parsing module hold a separate action
+    object for every (state, token) pair, which makes the pickled spec
+    large and slow to load.  Actions and rows are immutable once the
+    table is built, so identical ones are shared instead.
+    """
+
+    @classmethod
+    def compact(cls, table):
+        actions = {}
+        rows = {}
+        compacted = cls()
+
+        for row in table:
+            new_row = {}
+            for token, token_actions in row.items():
+                key = tuple(
+                    (type(action), action.nextState)
+                    if type(action) is parsing_grammar.ShiftAction
+                    else (type(action), id(action.production))
+                    for action in token_actions
+                )
+                new_row[token] = actions.setdefault(key, token_actions)
+
+            row_key = tuple(
+                (id(token), id(token_actions))
+                for token, token_actions in new_row.items()
+            )
+            compacted.append(rows.setdefault(row_key, new_row))
+
+        return compacted
+
+
 class Spec(parsing.Spec):
 
     def __init__(self, mod, *args, **kwargs):
@@ -298,10 +334,17 @@ class Spec(parsing.Spec):
 
     def _unpickle(self, *args):
         ret = super()._unpickle(*args)
+        if ret == 'compatible' and not isinstance(self._action, ActionTable):
+            # Pickled by a version that did not compact the tables.
+            ret = 'repickle'
         if ret != 'compatible':
             logger.info('Rebuilding grammar for %s', self.__modname)
         return ret
 
+    def _pickle(self, *args):
+        self._action = ActionTable.compact(self._action)
+        super()._pickle(*args)
+
 
 class Parser:
     def __init__(self, **parser_data):
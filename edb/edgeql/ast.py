@@ -740,6 +740,7 @@ class DropProperty(DropObject):
 
 
 class CreateConcretePointer(CreateObject, BasesMixin):
+    __abstract_node__ = True
     is_required: bool = False
     declared_overloaded: bool = False
     target: typing.Optional[typing.Union[Expr, TypeExpr]]
@@ -88,9 +88,15 @@ class EdgeQLSourceGenerator(codegen.SourceGenerator):
         if isinstance(node, list):
             self.visit_list(node, terminator=';')
         else:
-            method = 'visit_' + node.__class__.__name__
-            visitor = getattr(self, method, self.generic_visit)
-            visitor(node, **kwargs)
+            try:
+                visitor = self._visitors[node.__class__]
+            except KeyError:
+                visitor = self._get_visitor(node.__class__)
+
+            if visitor is None:
+                self.generic_visit(node, **kwargs)
+            else:
+                visitor(self, node, **kwargs)
 
     def _write_keywords(self, *kws: str) -> None:
         kwstring = ' '.join(kws)
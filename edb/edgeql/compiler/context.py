@@ -210,6 +210,9 @@ class Environment:
     created_schema_objects: Set[s_obj.Object]
     """A set of all schema objects derived by this compilation."""
 
+    dml_stmts: Set[irast.MutatingStmt]
+    """A set of all DML statements in the expression."""
+
     allow_generic_type_output: bool
     """Whether to allow the expression to be of a generic type."""
 
@@ -248,6 +251,7 @@ class Environment:
         self.allow_generic_type_output = allow_generic_type_output
         self.schema_refs = set()
         self.created_schema_objects = set()
+        self.dml_stmts = set()
         self.func_params = func_params
         self.parent_object_type = parent_object_type
         self.ptr_ref_cache = PointerRefCache()
@@ -506,46 +510,17 @@ class ContextLevel(compiler.ContextLevel):
             self.in_conditional = None
 
         else:
-            self.env = prevlevel.env
-            self.derived_target_module = prevlevel.derived_target_module
-            self.aliases = prevlevel.aliases
-            self.stmt_metadata = prevlevel.stmt_metadata
-            self.completion_work = prevlevel.completion_work
-            self.pending_cardinality = prevlevel.pending_cardinality
-            self.pointer_derivation_map = prevlevel.pointer_derivation_map
-
-            self.source_map = prevlevel.source_map
-            self.view_nodes = prevlevel.view_nodes
-            self.view_sets = prevlevel.view_sets
-            self.must_use_views = prevlevel.must_use_views
-            self.expr_view_cache = prevlevel.expr_view_cache
-            self.shape_type_cache = prevlevel.shape_type_cache
-
-            self.iterator_ctx = prevlevel.iterator_ctx
-            self.path_id_namespace = prevlevel.path_id_namespace
-            self.pending_stmt_own_path_id_namespace = \
-                prevlevel.pending_stmt_own_path_id_namespace
-            self.pending_stmt_full_path_id_namespace = \
-                prevlevel.pending_stmt_full_path_id_namespace
-            self.banned_paths = prevlevel.banned_paths
-            self.view_map = prevlevel.view_map
-            self.path_scope = prevlevel.path_scope
-            self.path_scope_map = prevlevel.path_scope_map
-            self.scope_id_ctr = prevlevel.scope_id_ctr
-            self.view_scls = prevlevel.view_scls
-            self.expr_exposed = prevlevel.expr_exposed
-            self.partial_path_prefix = prevlevel.partial_path_prefix
-            self.toplevel_stmt = prevlevel.toplevel_stmt
-            self.implicit_id_in_shapes = prevlevel.implicit_id_in_shapes
-            self.implicit_tid_in_shapes = prevlevel.implicit_tid_in_shapes
-            self.implicit_limit = prevlevel.implicit_limit
-            self.inhibit_implicit_limit = prevlevel.inhibit_implicit_limit
-            self.special_computables_in_mutation_shape = \
-                prevlevel.special_computables_in_mutation_shape
-            self.empty_result_type_hint = prevlevel.empty_result_type_hint
-            self.defining_view = prevlevel.defining_view
-            self.in_conditional = prevlevel.in_conditional
-
+            # Inherit all fields of the parent level by reference at once,
+            # and then override only what this mode switch changes.
+            self.__dict__.update(prevlevel.__dict__)
+            self.mode = mode
+
+            # anchors, modaliases, class_view_overrides and banned_paths
+            # are copied eagerly on purpose: they hold a handful of
+            # entries, and copying such a dict or set is cheaper than
+            # creating a copy-on-write wrapper for it.  Levels of other
+            # modes must keep sharing them with the parent level, since
+            # their writes are expected to be seen by it.
             if mode == ContextSwitchMode.SUBQUERY:
                 self.anchors = prevlevel.anchors.copy()
                 self.modaliases = prevlevel.modaliases.copy()
@@ -588,17 +563,6 @@ class ContextLevel(compiler.ContextLevel):
 
                 self.view_rptr = None
                 self.toplevel_result_view_name = None
-            else:
-                self.anchors = prevlevel.anchors
-                self.modaliases = prevlevel.modaliases
-                self.aliased_views = prevlevel.aliased_views
-                self.class_view_overrides = prevlevel.class_view_overrides
-
-                self.stmt = prevlevel.stmt
-
-                self.view_rptr = prevlevel.view_rptr
-                self.toplevel_result_view_name = \
-                    prevlevel.toplevel_result_view_name
 
             if mode in {ContextSwitchMode.NEWFENCE_TEMP,
                         ContextSwitchMode.NEWSCOPE_TEMP}:
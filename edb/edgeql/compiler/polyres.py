@@ -30,6 +30,8 @@ from edb.ir import ast as irast
 from edb.ir import utils as irutils
 
 from edb.schema import functions as s_func
+from edb.schema import objects as so
+from edb.schema import pseudo as s_pseudo
 from edb.schema import types as s_types
 
 from edb.edgeql import qltypes as ft
@@ -79,10 +81,27 @@ def find_callable(
         kwargs: Mapping[str, Tuple[s_types.Type, irast.Set]],
         ctx: context.ContextLevel) -> List[BoundCall]:
 
+    candidates = tuple(candidates)
+    schema = ctx.env.schema
+
+    # Which candidates match is determined by the argument types
+    # alone, so the positions of the matching candidates are memoized
+    # in the schema, and on subsequent calls with the same types only
+    # those candidates are bound again.
+    memo_key = _get_memo_key(candidates, args, kwargs, ctx=ctx)
+    if memo_key is not None:
+        matched_pos = schema.get_memoized(memo_key)
+        if matched_pos is not None:
+            return [
+                cast(BoundCall, try_bind_call_args(
+                    args, kwargs, candidates[i], ctx=ctx))
+                for i in matched_pos
+            ]
+
     implicit_cast_distance = None
     matched = []
 
-    for candidate in candidates:
+    for i, candidate in enumerate(candidates):
         call = try_bind_call_args(args, kwargs, candidate, ctx=ctx)
         if call is None:
             continue
@@ -91,16 +110,16 @@ def find_callable(
 
         if implicit_cast_distance is None:
             implicit_cast_distance = total_cd
-            matched.append(call)
+            matched.append((i, call))
         elif implicit_cast_distance == total_cd:
-            matched.append(call)
+            matched.append((i, call))
         elif implicit_cast_distance > total_cd:
             implicit_cast_distance = total_cd
-            matched = [call]
+            matched = [(i, call)]
 
     if len(matched) <= 1:
         # Unabiguios resolution
-        return matched
+        remaining = matched
 
     else:
         # Ambiguous resolution, try to disambiguate by
@@ -108,7 +127,7 @@ def find_callable(
         type_dist = None
         remaining = []
 
-        for call in matched:
+        for i, call in matched:
             call_type_dist = 0
 
             for barg in call.args:
@@ -123,14 +142,59 @@ def find_callable(
 
             if type_dist is None:
                 type_dist = call_type_dist
-                remaining.append(call)
+                remaining.append((i, call))
             elif type_dist == call_type_dist:
-                remaining.append(call)
+                remaining.append((i, call))
             elif type_dist > call_type_dist:
                 type_dist = call_type_dist
-                remaining = [call]
+                remaining = [(i, call)]
+
+    if memo_key is not None:
+        schema.set_memoized(memo_key, tuple(i for i, _ in remaining))
+
+    return [call for _, call in remaining]
+
+
+def _get_memo_key(
+        candidates: Sequence[s_func.CallableLike],
+        args: Sequence[Tuple[s_types.Type, irast.Set]],
+        kwargs: Mapping[str, Tuple[s_types.Type, irast.Set]], *,
+        ctx: context.ContextLevel) -> Optional[Tuple[Any, ...]]:
+
+    if ctx.env.func_params is not None:
+        # Calls in function bodies may take polymorphic arguments.
+        return None
 
-        return remaining
+    schema = ctx.env.schema
+    for candidate in candidates:
+        if not isinstance(candidate, so.Object):
+            return None
+
+    for arg_type, _ in args:
+        if not _is_memoizable_type(arg_type, schema):
+            return None
+    for arg_type, _ in kwargs.values():
+        if not _is_memoizable_type(arg_type, schema):
+            return None
+
+    return (
+        'find_callable',
+        tuple(cast(so.Object, c).id for c in candidates),
+        tuple(arg_type.id for arg_type, _ in args),
+        tuple(sorted((k, t.id) for k, (t, _) in kwargs.items())),
+    )
+
+
+def _is_memoizable_type(stype: s_types.Type, schema) -> bool:
+    # Types derived for the query being compiled must not end up in
+    # the schema memo.
+    if stype.is_collection():
+        return all(_is_memoizable_type(st, schema)
+                   for st in stype.get_subtypes(schema))
+    elif isinstance(stype, s_pseudo.PseudoType):
+        return True
+    else:
+        return stype.get_name(schema).module != '__derived__'
 
 
 def try_bind_call_args(
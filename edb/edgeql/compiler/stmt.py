@@ -145,7 +145,7 @@ def compile_ForQuery(
         # of the UNION argument, but is perfectly legal to be referenced
         # inside a factoring fence that is an immediate child of this
         # scope.
-        iterator_scope_parent.factoring_whitelist.add(
+        iterator_scope_parent.add_factoring_whitelist(
             stmt.iterator_stmt.path_id)
         node = iterator_scope_parent.find_descendant(iterator_stmt.path_id)
         if node is not None:
@@ -598,6 +598,7 @@ def init_stmt(
 
     if isinstance(irstmt, irast.MutatingStmt):
         ctx.path_scope.factoring_fence = True
+        ctx.env.dml_stmts.add(irstmt)
 
     irstmt.parent_stmt = parent_ctx.stmt
 
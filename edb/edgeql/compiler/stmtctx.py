@@ -220,6 +220,7 @@ def fini_expression(
         schema=ctx.env.schema,
         schema_refs=frozenset(
             ctx.env.schema_refs - ctx.env.created_schema_objects),
+        dml_stmts=frozenset(ctx.env.dml_stmts),
     )
     return result
 
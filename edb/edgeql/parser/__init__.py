@@ -19,13 +19,40 @@
 
 from __future__ import annotations
 
+import copy
+
+from edb.common import lru
+
 from . import parser as ql_parser
 from .. import ast as qlast
 
 
+# Parsed trees are cached by source text.  The callers are free to
+# mutate the trees they get, so every call returns a fresh copy of
+# the cached tree (copying is still a lot cheaper than parsing).
+# Large sources, such as bootstrap DDL, are not cached.
+PARSE_CACHE_SIZE = 1000
+PARSE_CACHE_MAX_SOURCE_LEN = 32 * 1024
+
+_parse_cache = lru.LRUMapping(maxsize=PARSE_CACHE_SIZE)
+
+
+def _parse(parser_cls, expr):
+    if len(expr) > PARSE_CACHE_MAX_SOURCE_LEN:
+        return parser_cls().parse(expr)
+
+    key = (parser_cls, expr)
+    try:
+        tree = _parse_cache[key]
+    except KeyError:
+        tree = parser_cls().parse(expr)
+        _parse_cache[key] = tree
+
+    return copy.deepcopy(tree)
+
+
 def parse_fragment(expr):
-    parser = ql_parser.EdgeQLExpressionParser()
-    return parser.parse(expr)
+    return _parse(ql_parser.EdgeQLExpressionParser, expr)
 
 
 def append_module_aliases(tree, aliases):
@@ -55,13 +82,11 @@ def parse(expr, module_aliases=None):
 
 
 def parse_block(expr):
-    parser = ql_parser.EdgeQLBlockParser()
-    return parser.parse(expr)
+    return _parse(ql_parser.EdgeQLBlockParser, expr)
 
 
 def parse_sdl(expr, module_aliases=None):
-    parser = ql_parser.EdgeSDLParser()
-    return parser.parse(expr)
+    return _parse(ql_parser.EdgeSDLParser, expr)
 
 
 def preload():
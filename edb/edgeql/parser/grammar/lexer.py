@@ -35,6 +35,7 @@ STATE_BASE = 1
 
 
 re_dquote = r'\$(?:[A-Za-z_][A-Za-z_0-9]*)?\$'
+re_word_char = re.compile(r'\w')
 
 Rule = lexer.Rule
 
@@ -62,13 +63,15 @@ class EdgeQLLexer(lexer.Lexer):
     MULTILINE_TOKENS = frozenset(('SCONST', 'BCONST', 'RSCONST'))
     RE_FLAGS = re.X | re.M | re.I
 
-    # Basic keywords
-    keyword_rules = [Rule(token=tok[0],
-                          next_state=STATE_KEEP,
-                          regexp=lexer.group(val))
-                     for val, tok in edgeql_keywords.items()]
+    # Keywords are not part of the lexer regexp: a hundred or so
+    # case-insensitive word-bounded alternatives tried at every
+    # position make matching dramatically slower.  Instead, keywords
+    # are recognized in token_from_text() among the words matched by
+    # the rules listed in WORD_TOKENS.
+    keywords = {val: tok[0] for val, tok in edgeql_keywords.items()}
+    WORD_TOKENS = frozenset(('IDENT', 'BADIDENT'))
 
-    common_rules = keyword_rules + [
+    common_rules = [
         Rule(token='WS',
              next_state=STATE_KEEP,
              regexp=r'[^\S\n]+'),
@@ -272,12 +275,35 @@ class EdgeQLLexer(lexer.Lexer):
         super().__init__()
         self.strip_whitespace = strip_whitespace
         self.raise_lexerror = raise_lexerror
+        if strip_whitespace:
+            # Strip out whitespace and comments
+            self.skip_tokens = frozenset(('WS', 'NL', 'COMMENT'))
 
     def get_eof_token(self):
         """Return an EOF token or None if no EOF token is wanted."""
         return self.token_from_text('EOF', '')
 
+    def _keyword_token(self, rule_token, txt):
+        keyword = self.keywords.get(txt.lower())
+        if keyword is None:
+            return rule_token
+
+        # A keyword must be a whole word, same as \b...\b would
+        # require, e.g. "1or" is an integer followed by an identifier.
+        start = self.start
+        src = self.inputstr
+        if start and re_word_char.match(src, start - 1):
+            return rule_token
+        end = start + len(txt)
+        if end < self.end and re_word_char.match(src, end):
+            return rule_token
+
+        return keyword
+
     def token_from_text(self, rule_token, txt):
+        if rule_token in self.WORD_TOKENS:
+            rule_token = self._keyword_token(rule_token, txt)
+
         if rule_token == 'BADSCONST':
             self.handle_error(f"Unterminated string {txt}",
                               exact_message=True,
@@ -325,11 +351,7 @@ class EdgeQLLexer(lexer.Lexer):
         for tok in super().lex():
             tok_type = tok.type
 
-            if self.strip_whitespace and tok_type in {'WS', 'NL', 'COMMENT'}:
-                # Strip out whitespace and comments
-                continue
-
-            elif tok_type in self._possible_long_token:
+            if tok_type in self._possible_long_token:
                 # Buffer in case this is a merged token
                 if not buffer:
                     buffer.append(tok)
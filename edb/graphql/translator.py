@@ -97,6 +97,7 @@ class Operation(NamedTuple):
     name: Any
     stmt: Any
     critvars: Any
+    critdefaults: Any
     vars: Any
 
 
@@ -105,6 +106,7 @@ class TranspiledOperation(NamedTuple):
     edgeql_ast: qlast.Base
     cacheable: bool
     cache_deps_vars: dict
+    cache_deps_defaults: dict
     variables_desc: dict
 
 
@@ -260,6 +262,11 @@ class GraphQLTranslator:
         # of the query
         critvars = {name: var.val for name, var
                     in self._context.vars.items() if var.critical}
+        # declared defaults of the critical variables, which apply
+        # whenever a request omits them
+        critdefaults = {
+            name: var.defn.default_value if var.defn is not None else None
+            for name, var in self._context.vars.items() if var.critical}
         # variables that were defined in this operation
         defvars = {name: var.val for name, var in self._context.vars.items()
                    if var.defn is not None}
@@ -268,6 +275,7 @@ class GraphQLTranslator:
             name=opname,
             stmt=stmt,
             critvars=critvars,
+            critdefaults=critdefaults,
             vars=defvars,
         )
 
@@ -1550,6 +1558,11 @@ def translate(gqlcore: gt.GQLCoreSchema, query, *,
         if val is not None:
             critvars[name] = json.loads(gqlcodegen.generate_source(val))
 
+    critdefaults = {}
+    for name, val in op.critdefaults.items():
+        if val is not None:
+            critdefaults[name] = json.loads(gqlcodegen.generate_source(val))
+
     defvars = {}
     for name, val in op.vars.items():
         if val is not None:
@@ -1560,6 +1573,7 @@ def translate(gqlcore: gt.GQLCoreSchema, query, *,
         edgeql_ast=op.stmt,
         cacheable=True,
         cache_deps_vars=dict(critvars) if critvars else None,
+        cache_deps_defaults=critdefaults,
         variables_desc=defvars,
     )
 
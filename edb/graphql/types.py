@@ -195,6 +195,18 @@ class GQLCoreSchema:
         self._gql_ordertypes = {}
         self._gql_enums = {}
 
+        # The graphql-core schema is only built when it is first
+        # needed, so that compiler workers that never see a GraphQL
+        # query don't pay for it.
+        self._gql_schema = None
+
+        # field maps are materialized on first access per type
+        self._fields = {}
+
+        # this map is used for GQL -> EQL translator needs
+        self._type_map = {}
+
+    def _build_graphql_schema(self):
         self._define_types()
 
         query = self._gql_objtypes['Query'] = GraphQLObjectType(
@@ -225,11 +237,7 @@ class GQLCoreSchema:
             if name not in TOP_LEVEL_TYPES
         ]
         types = sorted(types, key=lambda x: x.name)
-        self._gql_schema = GraphQLSchema(
-            query=query, mutation=mutation, types=types)
-
-        # this map is used for GQL -> EQL translator needs
-        self._type_map = {}
+        return GraphQLSchema(query=query, mutation=mutation, types=types)
 
     @property
     def edgedb_schema(self):
@@ -237,6 +245,8 @@ class GQLCoreSchema:
 
     @property
     def graphql_schema(self):
+        if self._gql_schema is None:
+            self._gql_schema = self._build_graphql_schema()
         return self._gql_schema
 
     def get_gql_name(self, name):
@@ -372,6 +382,12 @@ class GQLCoreSchema:
         return args
 
     def get_fields(self, typename):
+        fields = self._fields.get(typename)
+        if fields is None:
+            fields = self._fields[typename] = self._get_fields(typename)
+        return fields
+
+    def _get_fields(self, typename):
         fields = OrderedDict()
 
         if typename == 'Query':
@@ -401,6 +401,7 @@ class Statement(Command):
     view_shapes_metadata: typing.Dict[so.Object, ViewShapeMetadata]
     schema: s_schema.Schema
     schema_refs: typing.FrozenSet[so.Object]
+    dml_stmts: typing.FrozenSet[MutatingStmt]
     scope_tree: ScopeTreeNode
     source_map: typing.Dict[s_pointers.Pointer,
                             typing.Tuple[qlast.Expr,
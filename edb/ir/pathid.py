@@ -63,7 +63,7 @@ class PathId:
     """
 
     __slots__ = ('_path', '_norm_path', '_namespace', '_prefix',
-                 '_is_ptr', '_is_linkprop')
+                 '_is_ptr', '_is_linkprop', '_hash')
 
     #: Actual path information.
     _path: Tuple[
@@ -99,6 +99,11 @@ class PathId:
     #: True if this PathId represents a link property path.
     _is_linkprop: bool
 
+    #: Cached hash of this PathId.  PathIds are built by assigning
+    #: the above attributes directly, so the hash is computed on first
+    #: use, by which time the instance is no longer modified.
+    _hash: Optional[int]
+
     def __init__(
         self,
         initializer: Optional[PathId] = None,
@@ -126,6 +131,8 @@ class PathId:
             self._is_ptr = False
             self._is_linkprop = False
 
+        self._hash = None
+
     @classmethod
     def from_type(
         cls,
@@ -207,14 +214,24 @@ class PathId:
         return pid
 
     def __hash__(self) -> int:
-        return hash((
-            self.__class__, self._norm_path,
-            self._namespace, self._prefix, self._is_ptr))
+        h = self._hash
+        if h is None:
+            h = self._hash = hash((
+                self.__class__, self._norm_path,
+                self._namespace, self._prefix, self._is_ptr))
+        return h
 
     def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+
         if not isinstance(other, PathId):
             return NotImplemented
 
+        if (self._hash is not None and other._hash is not None
+                and self._hash != other._hash):
+            return False
+
         return (
             self._norm_path == other._norm_path and
             self._namespace == other._namespace and
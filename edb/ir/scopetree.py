@@ -48,10 +48,80 @@ class FenceInfo(NamedTuple):
         )
 
 
-class ScopeTreeNode:
-    unique_id: Optional[int]
-    """A unique identifier used to map scopes on sets."""
+class ScopeTreeIndex:
+    """Path and unique id lookup index shared by connected scope nodes.
+
+    The index is maintained incrementally as nodes are attached to each
+    other: when two trees are joined, the index of the smaller one is
+    merged into the index of the larger one.  Entries are never removed
+    when a subtree is detached, so a lookup must verify that a candidate
+    node is actually reachable from the node the lookup is done on.
+
+    Paths are indexed by their namespace-independent part, which is a
+    necessary condition for two paths to be considered equal by
+    _paths_equal() with any set of stripped namespaces.
+
+    The index also memoizes the results of find_visible_ex().  Any change
+    to the shape of the tree, or to a node attribute that affects
+    visibility, discards all memoized results (see
+    ScopeTreeNode.__setattr__).
+    """
+
+    def __init__(self) -> None:
+        self.nodes: List[ScopeTreeNode] = []
+        self.by_path: Dict[
+            Tuple[Any, bool],
+            Set[ScopeTreeNode],
+        ] = {}
+        self.by_unique_id: Dict[int, Set[ScopeTreeNode]] = {}
+        self.visible: Dict[
+            Tuple[ScopeTreeNode, pathid.PathId],
+            Tuple[Optional[ScopeTreeNode], Optional[FenceInfo]],
+        ] = {}
+
+    def add(self, node: ScopeTreeNode) -> None:
+        node._index = self
+        self.nodes.append(node)
+        if node.path_id is not None:
+            self.add_path(node)
+        if node.unique_id is not None:
+            self.add_unique_id(node)
+
+    def add_path(self, node: ScopeTreeNode) -> None:
+        assert node.path_id is not None
+        key = _path_key(node.path_id)
+        try:
+            self.by_path[key].add(node)
+        except KeyError:
+            self.by_path[key] = {node}
+
+    def add_unique_id(self, node: ScopeTreeNode) -> None:
+        assert node.unique_id is not None
+        try:
+            self.by_unique_id[node.unique_id].add(node)
+        except KeyError:
+            self.by_unique_id[node.unique_id] = {node}
+
+    def merge(self, other: ScopeTreeIndex) -> None:
+        self.visible.clear()
+        for node in other.nodes:
+            node._index = self
+        self.nodes.extend(other.nodes)
+
+        for key, nodes in other.by_path.items():
+            try:
+                self.by_path[key].update(nodes)
+            except KeyError:
+                self.by_path[key] = nodes
+
+        for uid, nodes in other.by_unique_id.items():
+            try:
+                self.by_unique_id[uid].update(nodes)
+            except KeyError:
+                self.by_unique_id[uid] = nodes
+
 
+class ScopeTreeNode:
     path_id: Optional[pathid.PathId]
     """Node path id, or None for branch nodes."""
 
@@ -92,7 +162,8 @@ class ScopeTreeNode:
         fenced: bool=False,
         unique_id: Optional[int]=None,
     ) -> None:
-        self.unique_id = unique_id
+        self._index: Optional[ScopeTreeIndex] = None
+        self._unique_id = unique_id
         self.path_id = path_id
         self.fenced = fenced
         self.protect_parent = False
@@ -104,10 +175,31 @@ class ScopeTreeNode:
         self.namespaces = set()
         self._parent: Optional[weakref.ReferenceType[ScopeTreeNode]] = None
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _VISIBILITY_ATTRS:
+            self._invalidate_visible()
+        object.__setattr__(self, name, value)
+
+    def _invalidate_visible(self) -> None:
+        index = self.__dict__.get('_index')
+        if index is not None:
+            index.visible.clear()
+
     def __repr__(self) -> str:
         name = 'ScopeFenceNode' if self.fenced else 'ScopeTreeNode'
         return (f'<{name} {self.path_id!r} at {id(self):0x}>')
 
+    @property
+    def unique_id(self) -> Optional[int]:
+        """A unique identifier used to map scopes on sets."""
+        return self._unique_id
+
+    @unique_id.setter
+    def unique_id(self, unique_id: Optional[int]) -> None:
+        self._unique_id = unique_id
+        if unique_id is not None and self._index is not None:
+            self._index.add_unique_id(self)
+
     def _copy(self, parent: Optional[ScopeTreeNode]) -> ScopeTreeNode:
         cp = self.__class__(
             path_id=self.path_id,
@@ -574,7 +666,14 @@ class ScopeTreeNode:
         # Make sure we don't add namespaces that already appear
         # in on of the ancestors.
         namespaces = frozenset(namespaces) - self.get_effective_namespaces()
-        self.namespaces.update(namespaces)
+        if namespaces:
+            self._invalidate_visible()
+            self.namespaces.update(namespaces)
+
+    def add_factoring_whitelist(self, path_id: pathid.PathId) -> None:
+        """Allow *path_id* to be factored across child factoring fences."""
+        self._invalidate_visible()
+        self.factoring_whitelist.add(path_id)
 
     def get_effective_namespaces(self) -> AbstractSet[pathid.AnyNamespace]:
         namespaces: Set[pathid.AnyNamespace] = set()
@@ -654,30 +753,72 @@ class ScopeTreeNode:
         path_id: pathid.PathId,
     ) -> Tuple[Optional[ScopeTreeNode], Optional[FenceInfo]]:
         """Find the visible node with the given *path_id*."""
+        index = self._index
+        if index is None:
+            return self._find_visible_ex(path_id)
+
+        key = (self, path_id)
+        try:
+            return index.visible[key]
+        except KeyError:
+            result = index.visible[key] = self._find_visible_ex(path_id)
+            return result
+
+    def _find_visible_ex(
+        self,
+        path_id: pathid.PathId,
+    ) -> Tuple[Optional[ScopeTreeNode], Optional[FenceInfo]]:
         namespaces: Set[pathid.AnyNamespace] = set()
         finfo = None
         found = None
 
-        for node, ans in self.ancestors_and_namespaces:
-            if (node.path_id is not None
+        # Visible nodes are ancestors and their direct children.
+        # Use the path index to find the few that can possibly
+        # match *path_id*, keyed by the ancestor they're visible at.
+        ancestors = list(self.ancestors)
+        ancestor_set = set(ancestors)
+        matches_self: Set[ScopeTreeNode] = set()
+        matches_children: Dict[ScopeTreeNode, List[ScopeTreeNode]] = {}
+        for candidate in self._get_path_candidates(path_id):
+            if candidate in ancestor_set:
+                matches_self.add(candidate)
+            parent = candidate.parent
+            if parent is not None and parent in ancestor_set:
+                try:
+                    matches_children[parent].append(candidate)
+                except KeyError:
+                    matches_children[parent] = [candidate]
+
+        # Nearest strict ancestor fence for each ancestor.
+        parent_fences: List[Optional[ScopeTreeNode]] = [None] * len(ancestors)
+        for i in range(len(ancestors) - 2, -1, -1):
+            above = ancestors[i + 1]
+            parent_fences[i] = above if above.fenced else parent_fences[i + 1]
+
+        for i, (node, ans) in enumerate(self.ancestors_and_namespaces):
+            if (node in matches_self
                     and _paths_equal(node.path_id, path_id, namespaces)):
                 found = node
                 break
 
-            for child in node.children:
-                if (child.path_id is not None
-                        and _paths_equal(child.path_id, path_id, namespaces)):
-                    found = child
+            children = matches_children.get(node)
+            if children:
+                children = [
+                    c for c in children
+                    if _paths_equal(c.path_id, path_id, namespaces)
+                ]
+                if len(children) > 1:
+                    # Preserve the child iteration order.
+                    children = [c for c in node.children if c in children]
+                if children:
+                    found = children[0]
                     break
 
-            if found is not None:
-                break
-
             namespaces |= ans
 
             if node is not self:
                 ans_finfo = node.fence_info
-                parent_fence = node.parent_fence
+                parent_fence = parent_fences[i]
                 if (parent_fence is not None
                         and any(_paths_equal(path_id, wl, namespaces)
                                 for wl in parent_fence.factoring_whitelist)):
@@ -719,29 +860,88 @@ class ScopeTreeNode:
 
         return None
 
-    def find_descendant(
+    def _get_path_candidates(
         self,
         path_id: pathid.PathId,
-    ) -> Optional[ScopeTreeNode]:
-        for descendant, dns, _ in self.strict_descendants_and_namespaces:
-            if (descendant.path_id is not None
-                    and _paths_equal(descendant.path_id, path_id, dns)):
-                return descendant
+    ) -> Iterable[ScopeTreeNodeWithPathId]:
+        """Return nodes that may be matching *path_id* in this tree.
 
-        return None
+        The result is a superset of nodes matching *path_id* with any
+        namespaces stripped.  It may include nodes that are no longer
+        connected to this tree.
+        """
+        if self._index is None:
+            if (self.path_id is not None
+                    and _path_key(self.path_id) == _path_key(path_id)):
+                return (cast(ScopeTreeNodeWithPathId, self),)
+            else:
+                return ()
+        else:
+            return cast(
+                Iterable[ScopeTreeNodeWithPathId],
+                self._index.by_path.get(_path_key(path_id), ()),
+            )
 
-    def find_descendants(
+    def _find_descendants_and_ns(
         self,
         path_id: pathid.PathId,
-    ) -> List[ScopeTreeNodeWithPathId]:
+    ) -> List[
+        Tuple[
+            ScopeTreeNodeWithPathId,
+            AbstractSet[pathid.AnyNamespace],
+            Optional[FenceInfo],
+        ]
+    ]:
+        """Find strict descendants matching *path_id* using the index.
+
+        The order of the returned list is arbitrary.
+        """
         matched = []
-        for descendant, dns, _ in self.strict_descendants_and_namespaces:
-            if (descendant.path_id is not None
-                    and _paths_equal(descendant.path_id, path_id, dns)):
-                matched.append(cast(ScopeTreeNodeWithPathId, descendant))
+
+        for candidate in self._get_path_candidates(path_id):
+            if candidate is self:
+                continue
+
+            dns: Set[pathid.AnyNamespace] = set()
+            finfo: Optional[FenceInfo] = None
+            node: Optional[ScopeTreeNode] = candidate
+            while node is not None and node is not self:
+                dns |= node.namespaces
+                if finfo is None:
+                    finfo = node.fence_info
+                else:
+                    finfo = finfo | node.fence_info
+                node = node.parent
+
+            if (node is not None
+                    and _paths_equal(candidate.path_id, path_id, dns)):
+                matched.append((candidate, dns, finfo))
 
         return matched
 
+    def find_descendant(
+        self,
+        path_id: pathid.PathId,
+    ) -> Optional[ScopeTreeNode]:
+        descendant, _, _ = self.find_descendant_and_ns(path_id)
+        return descendant
+
+    def find_descendants(
+        self,
+        path_id: pathid.PathId,
+    ) -> List[ScopeTreeNodeWithPathId]:
+        matched = self._find_descendants_and_ns(path_id)
+        if len(matched) <= 1:
+            return [descendant for descendant, _, _ in matched]
+
+        # Multiple matches, return them in the traversal order.
+        matched_nodes = {descendant for descendant, _, _ in matched}
+        return [
+            cast(ScopeTreeNodeWithPathId, descendant)
+            for descendant in self.strict_descendants
+            if descendant in matched_nodes
+        ]
+
     def find_descendant_and_ns(
         self,
         path_id: pathid.PathId
@@ -750,10 +950,17 @@ class ScopeTreeNode:
         AbstractSet[pathid.AnyNamespace],
         Optional[FenceInfo],
     ]:
-        for descendant, dns, finfo in self.strict_descendants_and_namespaces:
-            if (descendant.path_id is not None
-                    and _paths_equal(descendant.path_id, path_id, dns)):
-                return descendant, dns, finfo
+        matched = self._find_descendants_and_ns(path_id)
+        if len(matched) == 1:
+            return matched[0]
+        elif matched:
+            # Multiple matches, return the first one in the
+            # traversal order.
+            matched_nodes = {descendant: (descendant, dns, finfo)
+                             for descendant, dns, finfo in matched}
+            for descendant in self.strict_descendants:
+                if descendant in matched_nodes:
+                    return matched_nodes[descendant]
 
         return None, frozenset(), None
 
@@ -763,12 +970,38 @@ class ScopeTreeNode:
         namespaces: Set[str] = set()
         unnest_fence_seen = False
 
+        # For every candidate node determine the nodes it is
+        # an unfenced descendant of.
+        reachable_from: Dict[ScopeTreeNode, List[ScopeTreeNode]] = {}
+        for candidate in self._get_path_candidates(path_id):
+            node = candidate
+            while True:
+                try:
+                    reachable_from[node].append(candidate)
+                except KeyError:
+                    reachable_from[node] = [candidate]
+
+                parent = node.parent
+                if node.fenced or parent is None:
+                    break
+                node = parent
+
         for node, ans in self.ancestors_and_namespaces:
-            for descendant in node.unfenced_descendants:
-                if (descendant.path_id is not None
-                        and _paths_equal(descendant.path_id,
-                                         path_id, namespaces)):
-                    return descendant, unnest_fence_seen
+            candidates = reachable_from.get(node)
+            if candidates:
+                candidates = [
+                    d for d in candidates
+                    if _paths_equal(cast(pathid.PathId, d.path_id),
+                                    path_id, namespaces)
+                ]
+                if len(candidates) > 1:
+                    # Preserve the traversal order.
+                    candidates = [
+                        d for d in node.unfenced_descendants
+                        if d in candidates
+                    ]
+                if candidates:
+                    return candidates[0], unnest_fence_seen
 
             namespaces |= ans
             unnest_fence_seen = unnest_fence_seen or node.unnest_fence
@@ -776,9 +1009,22 @@ class ScopeTreeNode:
         return None, unnest_fence_seen
 
     def find_by_unique_id(self, unique_id: int) -> Optional[ScopeTreeNode]:
-        for node in self.descendants:
-            if node.unique_id == unique_id:
-                return node
+        if self._index is None:
+            return self if self.unique_id == unique_id else None
+
+        matched = [
+            node for node in self._index.by_unique_id.get(unique_id, ())
+            if node.unique_id == unique_id and self in node.ancestors
+        ]
+
+        if len(matched) == 1:
+            return matched[0]
+        elif matched:
+            # Multiple matches, return the first one in the
+            # traversal order.
+            for node in self.descendants:
+                if node in matched:
+                    return node
 
         return None
 
@@ -830,15 +1076,53 @@ class ScopeTreeNode:
         if parent is not None:
             self._parent = weakref.ref(parent)
             parent.children.add(self)
+            self._join_index(parent)
+            self._invalidate_visible()
         else:
             self._parent = None
 
+    def _join_index(self, parent: ScopeTreeNode) -> None:
+        index = self._index
+        parent_index = parent._index
+
+        if index is None:
+            # A node without an index has never had children.
+            if parent_index is None:
+                parent_index = ScopeTreeIndex()
+                parent_index.add(parent)
+            parent_index.add(self)
+        elif parent_index is None:
+            index.add(parent)
+        elif index is not parent_index:
+            if len(index.nodes) > len(parent_index.nodes):
+                index.merge(parent_index)
+            else:
+                parent_index.merge(index)
+
+
+# Node attributes that find_visible_ex() results depend on.
+_VISIBILITY_ATTRS = frozenset({
+    '_parent',
+    'path_id',
+    'fenced',
+    'unnest_fence',
+    'factoring_fence',
+    'factoring_whitelist',
+    'namespaces',
+})
+
 
 class ScopeTreeNodeWithPathId(ScopeTreeNode):
 
     path_id: pathid.PathId
 
 
+def _path_key(path_id: pathid.PathId) -> Tuple[Any, bool]:
+    # The part of the PathId identity that does not depend
+    # on namespaces.
+    return (path_id._norm_path, path_id._is_ptr)
+
+
 def _paths_equal(path_id_1: pathid.PathId, path_id_2: pathid.PathId,
                  namespaces: AbstractSet[str]) -> bool:
     if namespaces:
@@ -114,6 +114,8 @@ class OutputVar(ImmutableBaseExpr):
 class EdgeQLPathInfo(Base):
     """A general mixin providing EdgeQL-specific metadata on certain nodes."""
 
+    __abstract_node__ = True
+
     # Ignore the below fields in AST visitor/transformer.
     __ast_meta__ = {
         'path_scope', 'path_outputs', 'path_id', 'is_distinct', 'value_scope',
@@ -62,7 +62,14 @@ def _quote_ident(string):
 
 
 def quote_ident(string, *, force=False):
-    return _quote_ident(string) if needs_quoting(string) or force else string
+    return _quote_ident(string) if force else _maybe_quote_ident(string)
+
+
+@functools.lru_cache(4096)
+def _maybe_quote_ident(string):
+    # The same identifiers are quoted over and over again by the SQL
+    # code generator.
+    return _quote_ident(string) if needs_quoting(string) else string
 
 
 def quote_bytea_literal(data: bytes) -> str:
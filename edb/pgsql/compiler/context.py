@@ -52,6 +52,9 @@ class OutputFormat(enum.Enum):
     NATIVE = enum.auto()
     JSON = enum.auto()
     JSONB = enum.auto()
+    # Like JSON, but the top-level set is not aggregated into a single
+    # array: every element is returned as a separate row.
+    JSON_ELEMENTS = enum.auto()
 
 
 class NoVolatilitySentinel:
@@ -108,11 +111,14 @@ class CompilerContextLevel(compiler.ContextLevel):
     ]
 
     #: Paths, for which semi-join is banned in this context.
-    disable_semi_join: Set[irast.PathId]
+    #: This is a frozenset shared with the parent context until
+    #: it's changed in this context.
+    disable_semi_join: FrozenSet[irast.PathId]
 
     #: Paths, which need to be explicitly wrapped into SQL
-    #: optionality scaffolding.
-    force_optional: Set[irast.PathId]
+    #: optionality scaffolding.  Shared with the parent context
+    #: the same way as *disable_semi_join*.
+    force_optional: FrozenSet[irast.PathId]
 
     #: ir.TypeRef used to narrow the joined relation representing
     #: the mapping key.
@@ -178,8 +184,8 @@ class CompilerContextLevel(compiler.ContextLevel):
             self.volatility_ref = None
             self.group_by_rels = {}
 
-            self.disable_semi_join = set()
-            self.force_optional = set()
+            self.disable_semi_join = frozenset()
+            self.force_optional = frozenset()
             self.join_target_type_filter = {}
 
             self.path_scope = collections.ChainMap()
@@ -188,31 +194,9 @@ class CompilerContextLevel(compiler.ContextLevel):
             self.ptr_rel_overlays = collections.defaultdict(list)
 
         else:
-            self.env = prevlevel.env
-            self.argmap = prevlevel.argmap
-
-            self.singleton_mode = prevlevel.singleton_mode
-
-            self.toplevel_stmt = prevlevel.toplevel_stmt
-            self.stmt = prevlevel.stmt
-            self.rel = prevlevel.rel
-            self.rel_hierarchy = prevlevel.rel_hierarchy
-            self.dml_stmts = prevlevel.dml_stmts
-            self.parent_rel = prevlevel.parent_rel
-            self.pending_query = prevlevel.pending_query
-
-            self.expr_exposed = prevlevel.expr_exposed
-            self.volatility_ref = prevlevel.volatility_ref
-            self.group_by_rels = prevlevel.group_by_rels
-
-            self.disable_semi_join = prevlevel.disable_semi_join.copy()
-            self.force_optional = prevlevel.force_optional.copy()
-            self.join_target_type_filter = prevlevel.join_target_type_filter
-
-            self.path_scope = prevlevel.path_scope
-            self.scope_tree = prevlevel.scope_tree
-            self.type_rel_overlays = prevlevel.type_rel_overlays
-            self.ptr_rel_overlays = prevlevel.ptr_rel_overlays
+            # Inherit all fields of the parent level by reference at once,
+            # and then override only what this mode switch changes.
+            self.__dict__.update(prevlevel.__dict__)
 
             if mode in {ContextSwitchMode.SUBREL, ContextSwitchMode.NEWREL,
                         ContextSwitchMode.SUBSTMT}:
@@ -34,7 +34,8 @@ from . import context
 
 def _get_json_func(name: str, *,
                    env: context.Environment) -> Tuple[str, ...]:
-    if env.output_format is context.OutputFormat.JSON:
+    if env.output_format in (context.OutputFormat.JSON,
+                             context.OutputFormat.JSON_ELEMENTS):
         prefix_suffix = 'json'
     else:
         prefix_suffix = 'jsonb'
@@ -413,6 +414,7 @@ def serialize_expr(
         env: context.Environment) -> pgast.BaseExpr:
 
     if env.output_format in (context.OutputFormat.JSON,
+                             context.OutputFormat.JSON_ELEMENTS,
                              context.OutputFormat.JSONB):
         val = serialize_expr_to_json(
             expr, path_id=path_id, nested=nested, env=env)
@@ -433,7 +435,8 @@ def get_pg_type(
     if in_serialization_ctx(ctx):
         if ctx.env.output_format is context.OutputFormat.JSONB:
             return ('jsonb',)
-        elif ctx.env.output_format is context.OutputFormat.JSON:
+        elif ctx.env.output_format in (context.OutputFormat.JSON,
+                                       context.OutputFormat.JSON_ELEMENTS):
             return ('json',)
         elif irtyputils.is_object(typeref):
             return ('record',)
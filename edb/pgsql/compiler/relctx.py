@@ -248,6 +248,17 @@ def _get_path_rvar(
         stmt: pgast.Query, path_id: irast.PathId, *,
         aspect: str, ctx: context.CompilerContextLevel,
 ) -> Tuple[pgast.PathRangeVar, irast.PathId]:
+    result = _maybe_get_path_rvar(stmt, path_id, aspect=aspect, ctx=ctx)
+    if result is None:
+        raise LookupError(
+            f'there is no range var for {path_id} in {stmt}')
+    return result
+
+
+def _maybe_get_path_rvar(
+        stmt: pgast.Query, path_id: irast.PathId, *,
+        aspect: str, ctx: context.CompilerContextLevel,
+) -> Optional[Tuple[pgast.PathRangeVar, irast.PathId]]:
     qry: Optional[pgast.Query] = stmt
     while qry is not None:
         rvar = pathctx.maybe_get_path_rvar(
@@ -263,8 +274,7 @@ def _get_path_rvar(
                 path_id, qry.view_path_id_map)
         qry = ctx.rel_hierarchy.get(qry)
 
-    raise LookupError(
-        f'there is no range var for {path_id} in {stmt}')
+    return None
 
 
 def get_path_rvar(
@@ -291,26 +301,26 @@ def maybe_get_path_rvar(
         stmt: pgast.Query, path_id: irast.PathId, *,
         aspect: str, ctx: context.CompilerContextLevel
 ) -> Optional[pgast.PathRangeVar]:
-    try:
-        return get_path_rvar(stmt, path_id, aspect=aspect, ctx=ctx)
-    except LookupError:
+    result = _maybe_get_path_rvar(stmt, path_id, aspect=aspect, ctx=ctx)
+    if result is None:
         return None
+    rvar, _ = result
+    return rvar
 
 
 def maybe_get_path_var(
         stmt: pgast.Query, path_id: irast.PathId, *,
         aspect: str, ctx: context.CompilerContextLevel
 ) -> Optional[pgast.OutputVar]:
+    result = _maybe_get_path_rvar(stmt, path_id, aspect=aspect, ctx=ctx)
+    if result is None:
+        return None
+    rvar, path_id = result
     try:
-        rvar, path_id = _get_path_rvar(stmt, path_id, aspect=aspect, ctx=ctx)
+        return pathctx.get_rvar_path_var(
+            rvar, path_id, aspect=aspect, env=ctx.env)
     except LookupError:
         return None
-    else:
-        try:
-            return pathctx.get_rvar_path_var(
-                rvar, path_id, aspect=aspect, env=ctx.env)
-        except LookupError:
-            return None
 
 
 def new_empty_rvar(
@@ -623,9 +633,7 @@ def update_scope(
 def get_scope_stmt(
         path_id: irast.PathId, *,
         ctx: context.CompilerContextLevel) -> pgast.SelectStmt:
-    stmt = ctx.path_scope.get(path_id)
-    if stmt is None and path_id.is_ptr_path():
-        stmt = ctx.path_scope.get(path_id.tgt_path())
+    stmt = maybe_get_scope_stmt(path_id, ctx=ctx)
     if stmt is None:
         raise LookupError(f'cannot find scope statement for {path_id}')
     return stmt
@@ -635,10 +643,10 @@ def maybe_get_scope_stmt(
         path_id: irast.PathId, *,
         ctx: context.CompilerContextLevel
 ) -> Optional[pgast.SelectStmt]:
-    try:
-        return get_scope_stmt(path_id, ctx=ctx)
-    except LookupError:
-        return None
+    stmt = ctx.path_scope.get(path_id)
+    if stmt is None and path_id.is_ptr_path():
+        stmt = ctx.path_scope.get(path_id.tgt_path())
+    return stmt
 
 
 def rel_join(
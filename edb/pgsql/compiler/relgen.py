@@ -802,10 +802,10 @@ def process_set_as_path(
 
     if is_linkprop:
         backtrack_src = ir_source
-        ctx.disable_semi_join.add(backtrack_src.path_id)
+        ctx.disable_semi_join |= {backtrack_src.path_id}
         while backtrack_src.path_id.is_type_intersection_path():
             backtrack_src = ir_source.rptr.source
-            ctx.disable_semi_join.add(backtrack_src.path_id)
+            ctx.disable_semi_join |= {backtrack_src.path_id}
 
     semi_join = (
         not source_is_visible and
@@ -1281,7 +1281,7 @@ def process_set_as_coalesce(
             left = dispatch.compile(left_ir, ctx=newctx)
 
             with newctx.new() as rightctx:
-                rightctx.force_optional.add(right_ir.path_id)
+                rightctx.force_optional |= {right_ir.path_id}
                 right = dispatch.compile(right_ir, ctx=rightctx)
 
             set_expr = pgast.CoalesceExpr(args=[left, right])
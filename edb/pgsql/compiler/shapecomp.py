@@ -43,7 +43,7 @@ def compile_shape(
     elements = []
 
     with ctx.newscope() as shapectx:
-        shapectx.disable_semi_join.add(ir_set.path_id)
+        shapectx.disable_semi_join |= {ir_set.path_id}
 
         if isinstance(ir_set.expr, irast.Stmt):
             iterators = irutils.get_iterator_sets(ir_set.expr)
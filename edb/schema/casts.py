@@ -19,7 +19,6 @@
 
 from __future__ import annotations
 
-import functools
 from typing import *  # NoQA
 
 from edb import errors
@@ -37,39 +36,47 @@ from . import types as s_types
 from . import utils
 
 
-_NOT_REACHABLE = 10000000
+_void = object()
 
 
-def _is_reachable(schema, cast_kwargs, source: s_types.Type,
-                  target: s_types.Type, distance: int) -> int:
+def _get_implicit_cast_distances(schema) -> Mapping[Tuple[Any, Any], int]:
+    # The distance of every type pair connected by a chain of implicit
+    # casts, keyed by the pair of type ids.  Computed once for all
+    # types and memoized until the schema is modified.
+    distances = schema.get_memoized('implicit_cast_distances')
+    if distances is not None:
+        return distances
 
-    if source == target:
-        return distance
-
-    casts = schema.get_casts_to_type(target, **cast_kwargs)
-    if not casts:
-        return _NOT_REACHABLE
+    edges: Dict[Any, Set[Any]] = {}
+    for cast in schema.get_objects(type=Cast):
+        if cast.get_allow_implicit(schema):
+            from_id = cast.get_from_type(schema).id
+            to_id = cast.get_to_type(schema).id
+            edges.setdefault(from_id, set()).add(to_id)
 
-    sources = {c.get_from_type(schema) for c in casts}
+    distances = {}
+    for source_id in edges:
+        front = edges[source_id]
+        distance = 1
+        while front:
+            next_front: Set[Any] = set()
+            for target_id in front:
+                if (source_id, target_id) not in distances:
+                    distances[source_id, target_id] = distance
+                    next_front.update(edges.get(target_id, ()))
+            front = next_front
+            distance += 1
 
-    distance += 1
-    if source in sources:
-        return distance
-    else:
-        return min(
-            _is_reachable(schema, cast_kwargs, source, s, distance)
-            for s in sources
-        )
+    schema.set_memoized('implicit_cast_distances', distances)
+    return distances
 
 
-@functools.lru_cache()
 def get_implicit_cast_distance(
         schema, source: s_types.Type, target: s_types.Type) -> int:
-    dist = _is_reachable(schema, {'implicit': True}, source, target, 0)
-    if dist == _NOT_REACHABLE:
-        return -1
-    else:
-        return dist
+    if source == target:
+        return 0
+    distances = _get_implicit_cast_distances(schema)
+    return distances.get((source.id, target.id), -1)
 
 
 def is_implicitly_castable(
@@ -77,11 +84,22 @@ def is_implicitly_castable(
     return get_implicit_cast_distance(schema, source, target) >= 0
 
 
-@functools.lru_cache()
 def find_common_castable_type(
         schema, source: s_types.Type,
         target: s_types.Type) -> Optional[s_types.Type]:
 
+    key = ('common_castable_type', source.id, target.id)
+    result = schema.get_memoized(key, _void)
+    if result is _void:
+        result = _find_common_castable_type(schema, source, target)
+        schema.set_memoized(key, result)
+    return result
+
+
+def _find_common_castable_type(
+        schema, source: s_types.Type,
+        target: s_types.Type) -> Optional[s_types.Type]:
+
     if get_implicit_cast_distance(schema, target, source) >= 0:
         return source
     if get_implicit_cast_distance(schema, source, target) >= 0:
@@ -109,7 +127,6 @@ def find_common_castable_type(
                 return target
 
 
-@functools.lru_cache()
 def is_assignment_castable(
         schema, source: s_types.Type, target: s_types.Type) -> bool:
 
@@ -117,15 +134,14 @@ def is_assignment_castable(
     if is_implicitly_castable(schema, source, target):
         return True
 
-    # Assignment casts are valid only as one-hop casts.
-    casts = schema.get_casts_to_type(target, assignment=True)
-    if not casts:
-        return False
-
-    for c in casts:
-        if c.get_from_type(schema) == source:
-            return True
-    return False
+    key = ('assignment_castable', source.id, target.id)
+    result = schema.get_memoized(key)
+    if result is None:
+        # Assignment casts are valid only as one-hop casts.
+        casts = schema.get_casts_to_type(target, assignment=True)
+        result = any(c.get_from_type(schema) == source for c in casts)
+        schema.set_memoized(key, result)
+    return result
 
 
 def get_cast_shortname(
@@ -512,6 +512,12 @@ class CreateInheritingObject(InheritingObjectCommand,
         schema: s_schema.Schema,
         context: sd.CommandContext
     ) -> s_schema.Schema:
+        if not context.canonical and context.mark_derived:
+            # Derived objects are created as such right away, so that
+            # the schema can treat query-local ones as ephemeral from
+            # the start.
+            self.set_attribute_value('is_derived', True)
+
         schema = super()._create_begin(schema, context)
 
         if not context.canonical:
@@ -527,13 +533,6 @@ class CreateInheritingObject(InheritingObjectCommand,
             else:
                 bases = ()
 
-            if context.mark_derived:
-                schema = self.scls.update(schema, {
-                    'is_derived': True,
-                })
-
-                self.set_attribute_value('is_derived', True)
-
             if context.preserve_path_id and len(bases) == 1:
                 base_name = bases[0].get_name(schema)
                 schema = self.scls.set_field_value(
@@ -21,8 +21,9 @@ from __future__ import annotations
 
 from typing import *  # NoQA
 
-import functools
 import itertools
+import uuid
+import weakref
 
 import immutables as immu
 
@@ -48,6 +49,102 @@ STD_MODULES = frozenset(STD_LIB + ('stdgraphql',))
 
 _void = object()
 
+# Maximum number of entries in the lookup cache of a schema, see
+# Schema._init_lookup_cache().
+LOOKUP_CACHE_SIZE = 10000
+
+
+def _index_add(index: immu.Map, key: Any, obj_id: Any) -> immu.Map:
+    try:
+        ids = index[key]
+    except KeyError:
+        ids = immu.Map()
+    return index.set(key, ids.set(obj_id, None))
+
+
+def _index_discard(index: immu.Map, key: Any, obj_id: Any) -> immu.Map:
+    try:
+        ids = index[key].delete(obj_id)
+    except KeyError:
+        return index
+    if ids:
+        return index.set(key, ids)
+    else:
+        return index.delete(key)
+
+
+# The field values of a schema object are stored in a tuple, the first
+# element of which is the object "layout": a dict mapping field names to
+# positions in the tuple.  Layouts are interned by the sequence of their
+# fields, so all objects with the same set of fields share one layout,
+# which takes considerably less memory than a mapping per object.
+ObjectData = Tuple[Any, ...]
+
+
+class _Layout(dict):
+
+    def __reduce__(self):
+        # Unpickled objects share the layouts of this process.
+        return (_get_layout, (tuple(self),))
+
+
+_layouts: Dict[Tuple[str, ...], _Layout] = {}
+
+
+def _get_layout(fields: Tuple[str, ...]) -> _Layout:
+    try:
+        return _layouts[fields]
+    except KeyError:
+        layout = _Layout((field, i) for i, field in enumerate(fields, 1))
+        _layouts[fields] = layout
+        return layout
+
+
+_EMPTY_DATA: ObjectData = (_get_layout(()),)
+
+
+def _data_pack(fields: Mapping[str, Any]) -> ObjectData:
+    return (_get_layout(tuple(fields)), *fields.values())
+
+
+def _data_unpack(data: ObjectData) -> Dict[str, Any]:
+    return dict(zip(data[0], data[1:]))
+
+
+def _data_get(data: ObjectData, field: str) -> Any:
+    i = data[0].get(field)
+    return None if i is None else data[i]
+
+
+def _data_set(data: ObjectData, field: str, value: Any) -> ObjectData:
+    layout = data[0]
+    i = layout.get(field)
+    if i is None:
+        return (_get_layout((*layout, field)), *data[1:], value)
+    else:
+        return (layout, *data[1:i], value, *data[i + 1:])
+
+
+def _data_delete(data: ObjectData, field: str) -> ObjectData:
+    layout = data[0]
+    i = layout[field]
+    fields = tuple(f for f in layout if f != field)
+    return (_get_layout(fields), *data[1:i], *data[i + 1:])
+
+
+def _is_query_local(data: ObjectData) -> bool:
+    # Views, shapes and computables derived by the query compiler live
+    # in the ephemeral __derived__ module and are discarded along with
+    # the compiled query.  No schema object ever refers to them, so
+    # references *from* them are not recorded in the _refs_to index,
+    # which saves most of the cost of adding them to the schema.
+    name = _data_get(data, 'name')
+    if not _data_get(data, 'is_derived'):
+        # The __derived__ module itself is created on demand by the
+        # compiler when the schema does not have it yet.
+        return name == '__derived__'
+    return getattr(name, 'module', None) == '__derived__'
+
 
 class Schema(s_abc.Schema):
 
@@ -58,11 +155,124 @@ class Schema(s_abc.Schema):
         self._name_to_id = immu.Map()
         self._globalname_to_id = immu.Map()
         self._refs_to = immu.Map()
+        # Secondary indexes used by SchemaIterator:
+        # concrete object class -> Map(id -> None), and
+        # module name -> Map(id -> None) for all module-qualified objects.
+        self._type_to_ids = immu.Map()
+        self._module_to_ids = immu.Map()
         self._generation = 0
+        self._init_lookup_cache()
+        self._memo = {}
+        self._interned = {}
+
+    def _init_lookup_cache(self, parent=None):
+        # Memoized results of derived lookups (referrers, casts,
+        # function and operator overloads).  Every entry records the
+        # schema data it was computed from, and is only reused while
+        # that data is the very same object in this schema.  The cache
+        # is a persistent map: a new schema generation starts with its
+        # parent's map and stores into its own version of it, so entries
+        # that are unaffected by a change carry forward without being
+        # copied, and no global cache ever keeps short-lived schemas
+        # alive.  A stale entry is replaced by the next store for its key,
+        # and the whole cache is dropped once it has LOOKUP_CACHE_SIZE
+        # entries, so that entries of dropped objects and stale entries
+        # that are never looked up again do not pile up along a long
+        # lineage of schema changes.
+        if parent is None:
+            self._lookup_cache = immu.Map()
+        else:
+            self._lookup_cache = parent._lookup_cache
+
+    def _get_cached(self, key, deps):
+        try:
+            cached_deps, value = self._lookup_cache[key]
+        except KeyError:
+            return _void
+
+        if len(cached_deps) != len(deps):
+            return _void
+        for cached_dep, dep in zip(cached_deps, deps):
+            if cached_dep is not dep:
+                return _void
+
+        return value
+
+    def _set_cached(self, key, deps, value):
+        cache = self._lookup_cache
+        if len(cache) >= LOOKUP_CACHE_SIZE and key not in cache:
+            cache = immu.Map()
+        self._lookup_cache = cache.set(key, (deps, value))
+
+    def get_memoized(self, key, default=None):
+        """Return the value memoized for *key* by set_memoized().
+
+        The memo is shared by all schema generations that differ only
+        in query-local objects, so values memoized while compiling one
+        query are reused by the following ones.  It is discarded as
+        soon as any other object is created, altered or deleted.
+        """
+        return self._memo.get(key, default)
+
+    def set_memoized(self, key, value):
+        """Memoize *value*, derived from the schema, for *key*.
+
+        The value must only depend on objects that outlive the query
+        being compiled, and neither the key nor the value may refer to
+        query-local objects, as those would be kept alive until the
+        next schema change.
+        """
+        self._memo[key] = value
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lookup_cache']
+        del state['_memo']
+        del state['_interned']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_lookup_cache()
+        self._memo = {}
+        self._interned = {}
+
+    def _intern_value(self, value):
+        # Field values of persistent objects are shared between objects
+        # and schema generations: object references resolve to the very
+        # instance stored in the schema, and equal immutable collections
+        # are stored once.  Values that are already shared are preserved
+        # by pickle, so this also holds for an unpickled schema.
+        #
+        # The intern tables only hold weak references, keyed by hash,
+        # so a value is released as soon as no schema generation stores
+        # it anymore.  On a hash collision the value is not interned.
+        if isinstance(value, so.Object):
+            obj = self._id_to_type.get(value.id)
+            if obj is not None and type(obj) is type(value):
+                return obj
+        elif isinstance(value, (so.ObjectCollection, immu.Map)):
+            try:
+                interned = self._interned[type(value)]
+            except KeyError:
+                interned = self._interned[type(value)] = (
+                    weakref.WeakValueDictionary())
+            try:
+                h = hash(value)
+            except TypeError:
+                return value
+            existing = interned.get(h)
+            if existing is None:
+                interned[h] = value
+            elif existing == value:
+                return existing
+
+        return value
 
     def _replace(self, *, id_to_data=None, id_to_type=None,
                  name_to_id=None, shortname_to_id=None, globalname_to_id=None,
-                 refs_to=None):
+                 refs_to=None, type_to_ids=None, module_to_ids=None,
+                 query_local=False):
         new = Schema.__new__(Schema)
 
         if id_to_data is None:
@@ -95,7 +305,20 @@ class Schema(s_abc.Schema):
         else:
             new._refs_to = refs_to
 
+        if type_to_ids is None:
+            new._type_to_ids = self._type_to_ids
+        else:
+            new._type_to_ids = type_to_ids
+
+        if module_to_ids is None:
+            new._module_to_ids = self._module_to_ids
+        else:
+            new._module_to_ids = module_to_ids
+
         new._generation = self._generation + 1
+        new._init_lookup_cache(parent=self)
+        new._memo = self._memo if query_local else {}
+        new._interned = self._interned
 
         return new
 
@@ -103,6 +326,7 @@ class Schema(s_abc.Schema):
         name_to_id = self._name_to_id
         shortname_to_id = self._shortname_to_id
         globalname_to_id = self._globalname_to_id
+        module_to_ids = self._module_to_ids
         stype = type(scls)
         is_global = issubclass(stype, so.UnqualifiedObject)
 
@@ -113,6 +337,8 @@ class Schema(s_abc.Schema):
                 globalname_to_id = globalname_to_id.delete((stype, old_name))
             else:
                 name_to_id = name_to_id.delete(old_name)
+                module_to_ids = _index_discard(
+                    module_to_ids, old_name.module, obj_id)
             if has_sn_cache:
                 old_shortname = sn.shortname_from_fullname(old_name)
                 sn_key = (stype, old_shortname)
@@ -137,6 +363,8 @@ class Schema(s_abc.Schema):
                     raise errors.SchemaError(
                         f'name {new_name!r} is already in the schema')
                 name_to_id = name_to_id.set(new_name, obj_id)
+                module_to_ids = _index_add(
+                    module_to_ids, new_name.module, obj_id)
 
             if has_sn_cache:
                 new_shortname = sn.shortname_from_fullname(new_name)
@@ -150,7 +378,7 @@ class Schema(s_abc.Schema):
                 shortname_to_id = shortname_to_id.set(
                     sn_key, ids | {obj_id})
 
-        return name_to_id, shortname_to_id, globalname_to_id
+        return name_to_id, shortname_to_id, globalname_to_id, module_to_ids
 
     def _update_obj(self, obj_id, updates):
         if not updates:
@@ -159,38 +387,51 @@ class Schema(s_abc.Schema):
         try:
             data = self._id_to_data[obj_id]
         except KeyError:
-            data = immu.Map()
+            data = _EMPTY_DATA
 
         name_to_id = None
         shortname_to_id = None
         globalname_to_id = None
-        with data.mutate() as mm:
-            for field, value in updates.items():
-                if field == 'name':
-                    name_to_id, shortname_to_id, globalname_to_id = (
-                        self._update_obj_name(
-                            obj_id,
-                            self._id_to_type[obj_id],
-                            mm.get('name'),
-                            value
-                        )
+        module_to_ids = None
+        orig_fields = _data_unpack(data)
+        fields = dict(orig_fields)
+        for field, value in updates.items():
+            if field == 'name':
+                (name_to_id, shortname_to_id, globalname_to_id,
+                 module_to_ids) = (
+                    self._update_obj_name(
+                        obj_id,
+                        self._id_to_type[obj_id],
+                        fields.get('name'),
+                        value
                     )
+                )
 
-                if value is None:
-                    mm.pop(field, None)
-                else:
-                    mm[field] = value
+            if value is None:
+                fields.pop(field, None)
+            else:
+                fields[field] = value
 
-            new_data = mm.finish()
+        new_data = _data_pack(fields)
+        was_local = _is_query_local(data)
+        is_local = _is_query_local(new_data)
+        if not is_local:
+            new_data = (new_data[0], *map(self._intern_value, new_data[1:]))
 
         id_to_data = self._id_to_data.set(obj_id, new_data)
         scls = self._id_to_type[obj_id]
-        refs_to = self._update_refs_to(scls, data, new_data)
+        refs_to = self._update_refs_to(
+            scls,
+            None if was_local else orig_fields,
+            None if is_local else _data_unpack(new_data),
+        )
         return self._replace(name_to_id=name_to_id,
                              shortname_to_id=shortname_to_id,
                              globalname_to_id=globalname_to_id,
+                             module_to_ids=module_to_ids,
                              id_to_data=id_to_data,
-                             refs_to=refs_to)
+                             refs_to=refs_to,
+                             query_local=was_local and is_local)
 
     def _get_obj_field(self, obj_id, field):
         try:
@@ -200,7 +441,8 @@ class Schema(s_abc.Schema):
                    f'is not present in the schema {self!r}')
             raise errors.SchemaError(err) from None
 
-        return d.get(field)
+        i = d[0].get(field)
+        return None if i is None else d[i]
 
     def _set_obj_field(self, obj_id, field, value):
         try:
@@ -213,9 +455,11 @@ class Schema(s_abc.Schema):
         name_to_id = None
         shortname_to_id = None
         globalname_to_id = None
+        module_to_ids = None
         if field == 'name':
-            old_name = data.get('name')
-            name_to_id, shortname_to_id, globalname_to_id = (
+            old_name = _data_get(data, 'name')
+            (name_to_id, shortname_to_id, globalname_to_id,
+             module_to_ids) = (
                 self._update_obj_name(
                     obj_id,
                     self._id_to_type[obj_id],
@@ -224,22 +468,43 @@ class Schema(s_abc.Schema):
                 )
             )
 
-        new_data = data.set(field, value)
+        new_data = _data_set(data, field, value)
+        was_local = _is_query_local(data)
+        is_local = _is_query_local(new_data)
+        if not is_local:
+            interned = self._intern_value(value)
+            if interned is not value:
+                value = interned
+                new_data = _data_set(data, field, value)
+
         id_to_data = self._id_to_data.set(obj_id, new_data)
         scls = self._id_to_type[obj_id]
 
-        if field in data:
-            orig_field_data = {field: data[field]}
+        if was_local and is_local:
+            refs_to = None
+        elif was_local or is_local:
+            refs_to = self._update_refs_to(
+                scls,
+                None if was_local else _data_unpack(data),
+                None if is_local else _data_unpack(new_data),
+            )
         else:
-            orig_field_data = {}
+            i = data[0].get(field)
+            if i is not None:
+                orig_field_data = {field: data[i]}
+            else:
+                orig_field_data = {}
 
-        refs_to = self._update_refs_to(scls, orig_field_data, {field: value})
+            refs_to = self._update_refs_to(
+                scls, orig_field_data, {field: value})
 
         return self._replace(name_to_id=name_to_id,
                              shortname_to_id=shortname_to_id,
                              globalname_to_id=globalname_to_id,
+                             module_to_ids=module_to_ids,
                              id_to_data=id_to_data,
-                             refs_to=refs_to)
+                             refs_to=refs_to,
+                             query_local=was_local and is_local)
 
     def _unset_obj_field(self, obj_id, field):
         try:
@@ -250,9 +515,11 @@ class Schema(s_abc.Schema):
         name_to_id = None
         shortname_to_id = None
         globalname_to_id = None
-        name = data.get('name')
+        module_to_ids = None
+        name = _data_get(data, 'name')
         if field == 'name' and name is not None:
-            name_to_id, shortname_to_id, globalname_to_id = (
+            (name_to_id, shortname_to_id, globalname_to_id,
+             module_to_ids) = (
                 self._update_obj_name(
                     obj_id,
                     self._id_to_type[obj_id],
@@ -260,27 +527,43 @@ class Schema(s_abc.Schema):
                     None
                 )
             )
-            new_data = data.delete(field)
+            new_data = _data_delete(data, field)
         else:
             try:
-                new_data = data.delete(field)
+                new_data = _data_delete(data, field)
             except KeyError:
                 return self
 
         id_to_data = self._id_to_data.set(obj_id, new_data)
         scls = self._id_to_type[obj_id]
-        refs_to = self._update_refs_to(scls, {field: data[field]}, None)
+
+        was_local = _is_query_local(data)
+        is_local = _is_query_local(new_data)
+
+        if was_local and is_local:
+            refs_to = None
+        elif was_local or is_local:
+            refs_to = self._update_refs_to(
+                scls,
+                None if was_local else _data_unpack(data),
+                None if is_local else _data_unpack(new_data),
+            )
+        else:
+            refs_to = self._update_refs_to(
+                scls, {field: _data_get(data, field)}, None)
 
         return self._replace(name_to_id=name_to_id,
                              shortname_to_id=shortname_to_id,
                              globalname_to_id=globalname_to_id,
+                             module_to_ids=module_to_ids,
                              id_to_data=id_to_data,
-                             refs_to=refs_to)
+                             refs_to=refs_to,
+                             query_local=was_local and is_local)
 
     def _update_refs_to(self, scls, orig_data, new_data) -> immu.Map:
         scls_type = type(scls)
         objfields = scls_type.get_object_fields()
-        if not objfields:
+        if not objfields or (not orig_data and not new_data):
             return self._refs_to
 
         with self._refs_to.mutate() as mm:
@@ -372,10 +655,13 @@ class Schema(s_abc.Schema):
                 f'{type(scls).__name__} {name!r} is already present '
                 f'in the schema {self!r}')
 
-        data = immu.Map(data)
+        data = _data_pack(data)
+        query_local = _is_query_local(data)
+        if not query_local:
+            data = (data[0], *map(self._intern_value, data[1:]))
 
-        name_to_id, shortname_to_id, globalname_to_id = self._update_obj_name(
-            id, scls, None, name)
+        name_to_id, shortname_to_id, globalname_to_id, module_to_ids = (
+            self._update_obj_name(id, scls, None, name))
 
         updates = dict(
             id_to_data=self._id_to_data.set(id, data),
@@ -383,9 +669,16 @@ class Schema(s_abc.Schema):
             name_to_id=name_to_id,
             shortname_to_id=shortname_to_id,
             globalname_to_id=globalname_to_id,
-            refs_to=self._update_refs_to(scls, None, data),
+            module_to_ids=module_to_ids,
+            type_to_ids=_index_add(self._type_to_ids, type(scls), id),
         )
 
+        if query_local:
+            updates['query_local'] = True
+        else:
+            updates['refs_to'] = self._update_refs_to(
+                scls, None, _data_unpack(data))
+
         if (not isinstance(scls, so.UnqualifiedObject)
                 and not self.has_module(name.module)):
             raise errors.UnknownModuleError(
@@ -399,22 +692,30 @@ class Schema(s_abc.Schema):
             raise errors.InvalidReferenceError(
                 f'cannot delete {obj!r}: not in this schema')
 
-        name = data['name']
+        name = _data_get(data, 'name')
 
         updates = {}
 
-        name_to_id, shortname_to_id, globalname_to_id = self._update_obj_name(
-            obj.id, self._id_to_type[obj.id], name, None)
+        scls = self._id_to_type[obj.id]
+        name_to_id, shortname_to_id, globalname_to_id, module_to_ids = (
+            self._update_obj_name(obj.id, scls, name, None))
 
-        refs_to = self._update_refs_to(obj, self._id_to_data[obj.id], None)
+        query_local = _is_query_local(data)
+        if query_local:
+            refs_to = None
+        else:
+            refs_to = self._update_refs_to(obj, _data_unpack(data), None)
 
         updates.update(dict(
             name_to_id=name_to_id,
             shortname_to_id=shortname_to_id,
             globalname_to_id=globalname_to_id,
+            module_to_ids=module_to_ids,
+            type_to_ids=_index_discard(self._type_to_ids, type(scls), obj.id),
             id_to_data=self._id_to_data.delete(obj.id),
             id_to_type=self._id_to_type.delete(obj.id),
             refs_to=refs_to,
+            query_local=query_local,
         ))
 
         return self._replace(**updates)
@@ -487,7 +788,6 @@ class Schema(s_abc.Schema):
         raise errors.InvalidReferenceError(
             f'operator {name!r} does not exist')
 
-    @functools.lru_cache()
     def _get_casts(
             self, stype: s_types.Type, *,
             disposition: str,
@@ -497,6 +797,16 @@ class Schema(s_abc.Schema):
         all_casts = self.get_referrers(
             stype, scls_type=s_casts.Cast, field_name=disposition)
 
+        if not implicit and not assignment:
+            return all_casts
+
+        key = ('casts', stype.id, disposition, implicit, assignment)
+        deps = (all_casts,) + tuple(
+            self._id_to_data.get(cast.id) for cast in all_casts)
+        casts = self._get_cached(key, deps)
+        if casts is not _void:
+            return casts
+
         casts = []
         for cast in all_casts:
             if implicit and not cast.get_allow_implicit(self):
@@ -505,7 +815,9 @@ class Schema(s_abc.Schema):
                 continue
             casts.append(cast)
 
-        return frozenset(casts)
+        casts = frozenset(casts)
+        self._set_cached(key, deps, casts)
+        return casts
 
     def get_casts_to_type(
             self, to_type: s_types.Type, *,
@@ -521,7 +833,6 @@ class Schema(s_abc.Schema):
         return self._get_casts(from_type, disposition='from_type',
                                implicit=implicit, assignment=assignment)
 
-    @functools.lru_cache()
     def get_referrers(
             self, scls: so.Object, *,
             scls_type: Optional[so.ObjectMeta]=None,
@@ -532,6 +843,12 @@ class Schema(s_abc.Schema):
         except KeyError:
             return frozenset()
         else:
+            key = ('referrers', scls.id, scls_type, field_name)
+            deps = (refs,)
+            referrers = self._get_cached(key, deps)
+            if referrers is not _void:
+                return referrers
+
             referrers = set()
 
             if scls_type is not None:
@@ -553,9 +870,10 @@ class Schema(s_abc.Schema):
                 ids = itertools.chain.from_iterable(refs.values())
                 referrers.update(self._id_to_type[objid] for objid in ids)
 
-            return frozenset(referrers)
+            referrers = frozenset(referrers)
+            self._set_cached(key, deps, referrers)
+            return referrers
 
-    @functools.lru_cache()
     def get_referrers_ex(self, scls: so.Object):
 
         try:
@@ -563,11 +881,18 @@ class Schema(s_abc.Schema):
         except KeyError:
             return {}
         else:
+            key = ('referrers_ex', scls.id)
+            deps = (refs,)
+            result = self._get_cached(key, deps)
+            if result is not _void:
+                return result
+
             result = {}
 
             for (st, fn), ids in refs.items():
                 result[st, fn] = {self._id_to_type[objid] for objid in ids}
 
+            self._set_cached(key, deps, result)
             return result
 
     def get_by_id(self, obj_id, default=so.NoDefault):
@@ -711,22 +1036,23 @@ class SchemaIterator:
 
         filters = []
 
-        if type is not None:
-            filters.append(lambda schema, obj: isinstance(obj, type))
+        # The module and type constraints are resolved through the
+        # schema's secondary indexes in _get_candidate_ids() and only
+        # need a filter when both are present.
+        self._type = type
+        self._included_modules = None
+        self._excluded_modules = None
 
         if included_modules:
-            modules = frozenset(included_modules)
-            filters.append(
-                lambda schema, obj:
-                    not isinstance(obj, so.UnqualifiedObject) and
-                    obj.get_name(schema).module in modules)
-
-        if excluded_modules:
-            excluded_modules = frozenset(excluded_modules)
-            filters.append(
-                lambda schema, obj:
-                    isinstance(obj, so.UnqualifiedObject) or
-                    obj.get_name(schema).module not in excluded_modules)
+            self._included_modules = frozenset(included_modules)
+            if excluded_modules:
+                self._included_modules -= frozenset(excluded_modules)
+            if type is not None:
+                filters.append(lambda schema, obj: isinstance(obj, type))
+        elif excluded_modules:
+            self._excluded_modules = frozenset(excluded_modules)
+            if type is not None:
+                filters.append(lambda schema, obj: isinstance(obj, type))
 
         if included_items:
             objs = frozenset(included_items)
@@ -744,26 +1070,63 @@ class SchemaIterator:
         self._filters = filters
         self._schema = schema
 
+    def _get_candidate_ids(self) -> Iterable[Iterable[uuid.UUID]]:
+        schema = self._schema
+
+        if self._included_modules is not None:
+            return [
+                schema._module_to_ids.get(module, ())
+                for module in self._included_modules
+            ]
+
+        if self._excluded_modules is not None:
+            # Unqualified objects (modules, roles etc) are never excluded.
+            candidates = [
+                ids for cls, ids in schema._type_to_ids.items()
+                if issubclass(cls, so.UnqualifiedObject)
+            ]
+            candidates.extend(
+                ids for module, ids in schema._module_to_ids.items()
+                if module not in self._excluded_modules
+            )
+            return candidates
+
+        if self._type is not None:
+            return [
+                ids for cls, ids in schema._type_to_ids.items()
+                if issubclass(cls, self._type)
+            ]
+
+        return [schema._id_to_type]
+
     def __iter__(self):
         filters = self._filters
-        index = self._schema._id_to_type
+        schema = self._schema
+        id_to_type = schema._id_to_type
 
-        for obj in index.values():
-            if all(f(self._schema, obj) for f in filters):
-                yield obj
+        for ids in self._get_candidate_ids():
+            for obj_id in ids:
+                obj = id_to_type[obj_id]
+                if all(f(schema, obj) for f in filters):
+                    yield obj
 
 
-@functools.lru_cache()
-def _get_functions(schema, name):
-    objids = schema._shortname_to_id.get((s_func.Function, name))
+def _get_overloads(schema, sn_key):
+    objids = schema._shortname_to_id.get(sn_key)
     if objids is None:
         return
-    return tuple(schema._id_to_type[oid] for oid in objids)
+
+    deps = (objids,)
+    result = schema._get_cached(sn_key, deps)
+    if result is _void:
+        result = tuple(schema._id_to_type[oid] for oid in objids)
+        schema._set_cached(sn_key, deps, result)
+    return result
+
+
+def _get_functions(schema, name):
+    return _get_overloads(schema, (s_func.Function, name))
 
 
-@functools.lru_cache()
 def _get_operators(schema, name):
-    objids = schema._shortname_to_id.get((s_oper.Operator, name))
-    if objids is None:
-        return
-    return tuple(schema._id_to_type[oid] for oid in objids)
+    return _get_overloads(schema, (s_oper.Operator, name))
@@ -31,7 +31,7 @@ class Port:
     def __init__(self, *, server, loop,
                  pg_addr,
                  runstate_dir, internal_runstate_dir,
-                 dbindex):
+                 dbindex, reuse_port=False):
 
         self._server = server
         self._loop = loop
@@ -39,6 +39,8 @@ class Port:
         self._dbindex = dbindex
         self._runstate_dir = runstate_dir
         self._internal_runstate_dir = internal_runstate_dir
+        # Set when several server processes share the TCP ports.
+        self._reuse_port = reuse_port
 
         self._devmode = devmode.is_in_dev_mode()
 
@@ -19,7 +19,8 @@
 
 from __future__ import annotations
 
+from .result_cache import ResultCache
 from .stmt_cache import StatementsCache
 
 
-__all__ = ('StatementsCache',)
+__all__ = ('ResultCache', 'StatementsCache',)
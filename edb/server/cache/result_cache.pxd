@@ -0,0 +1,44 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from libc.stdint cimport uint64_t
+
+
+cdef class ResultCache:
+
+    cdef:
+        object _dict
+        object _dict_move_to_end
+        object _dict_get
+
+        int _maxsize
+        double _ttl
+        ssize_t _max_entry_size
+        ssize_t _max_bytes
+        ssize_t _nbytes
+
+        readonly uint64_t hits
+        readonly uint64_t misses
+        readonly uint64_t invalidations
+        readonly uint64_t expirations
+        readonly uint64_t evictions
+
+    cdef lookup(self, key, data_version)
+    cdef store(self, key, data_version, bytes data)
+    cdef _discard(self, key, entry)
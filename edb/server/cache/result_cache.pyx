@@ -0,0 +1,130 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import collections
+import time
+
+
+cdef class ResultCache:
+
+    # An LRU cache of serialized query results.
+    #
+    # Every entry is stored along with the data version it was
+    # computed at (see DatabaseIndex.get_data_version()), which is
+    # the version taken *before* the query was executed.  Lookups
+    # pass the current data version and an entry is only returned if
+    # the versions are equal, so a result computed concurrently with
+    # a modification of the data it depends on is never served.
+    # Entries also expire *ttl* seconds after they were stored, which
+    # bounds the staleness in case the data is modified bypassing the
+    # server.
+    #
+    # The cache is bounded by the number of entries (*maxsize*) and
+    # by the total size of the stored results (*max_bytes*); results
+    # larger than *max_entry_size* are not cached at all.
+
+    def __init__(self, *, maxsize, ttl, max_entry_size, max_bytes):
+        if maxsize <= 0:
+            raise ValueError(
+                f'maxsize is expected to be greater than 0, got {maxsize}')
+        if ttl <= 0:
+            raise ValueError(
+                f'ttl is expected to be greater than 0, got {ttl}')
+
+        self._dict = collections.OrderedDict()
+        self._dict_move_to_end = self._dict.move_to_end
+        self._dict_get = self._dict.get
+
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._max_entry_size = max_entry_size
+        self._max_bytes = max_bytes
+        self._nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    cdef lookup(self, key, data_version):
+        entry = self._dict_get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        entry_version, expires_at, data = entry
+        if entry_version != data_version:
+            self._discard(key, entry)
+            self.invalidations += 1
+            self.misses += 1
+            return None
+
+        if expires_at < time.monotonic():
+            self._discard(key, entry)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._dict_move_to_end(key)  # last=True
+        self.hits += 1
+        return data
+
+    cdef store(self, key, data_version, bytes data):
+        cdef ssize_t size = len(data)
+
+        if size > self._max_entry_size:
+            return
+
+        existing = self._dict_get(key)
+        if existing is not None:
+            self._discard(key, existing)
+
+        self._dict[key] = (data_version, time.monotonic() + self._ttl, data)
+        self._nbytes += size
+
+        while (len(self._dict) > self._maxsize or
+                self._nbytes > self._max_bytes):
+            _, (_, _, evicted) = self._dict.popitem(last=False)
+            self._nbytes -= len(evicted)
+            self.evictions += 1
+
+    cdef _discard(self, key, entry):
+        del self._dict[key]
+        self._nbytes -= len(entry[2])
+
+    def clear(self):
+        self._dict.clear()
+        self._nbytes = 0
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._dict),
+            'bytes': self._nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'expirations': self.expirations,
+            'evictions': self.evictions,
+        }
+
+    def __len__(self):
+        return len(self._dict)
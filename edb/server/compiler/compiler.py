@@ -66,6 +66,7 @@ from edb.pgsql import types as pg_types
 
 from edb.server import config
 
+from . import datadeps
 from . import dbstate
 from . import enums
 from . import errormech
@@ -427,6 +428,8 @@ class Compiler(BaseCompiler):
                 in_array_backend_tids=in_array_backend_tids,
                 out_type_id=out_type_id.bytes,
                 out_type_data=out_type_data,
+                read_types=datadeps.get_read_types(ir),
+                dml_types=datadeps.get_dml_types(ir),
             )
 
         else:
@@ -434,7 +437,10 @@ class Compiler(BaseCompiler):
                 raise errors.QueryError(
                     'EdgeQL script queries cannot accept parameters')
 
-            return dbstate.SimpleQuery(sql=(sql_bytes,))
+            return dbstate.SimpleQuery(
+                sql=(sql_bytes,),
+                dml_types=datadeps.get_dml_types(ir),
+            )
 
     def _compile_and_apply_migration_command(
             self, ctx: CompileContext, cmd) -> dbstate.BaseQuery:
@@ -957,16 +963,22 @@ class Compiler(BaseCompiler):
                     unit.in_type_args = comp.in_type_args
                     unit.in_type_id = comp.in_type_id
                     unit.in_array_backend_tids = comp.in_array_backend_tids
+                    unit.read_types = comp.read_types
+                    unit.dml_types = comp.dml_types
 
                     unit.cacheable = True
 
                     unit.cardinality = comp.cardinality
                 else:
                     unit.sql += comp.sql
+                    unit.dml_types = datadeps.merge_dml_types(
+                        unit.dml_types, comp.dml_types)
 
             elif isinstance(comp, dbstate.SimpleQuery):
                 assert not single_stmt_mode
                 unit.sql += comp.sql
+                unit.dml_types = datadeps.merge_dml_types(
+                    unit.dml_types, comp.dml_types)
 
             elif isinstance(comp, dbstate.DDLQuery):
                 unit.sql += comp.sql
@@ -1068,6 +1080,7 @@ class Compiler(BaseCompiler):
         capability: enums.Capability,
         implicit_limit: int=0,
         json_parameters: bool=False,
+        json_elements: bool=False,
         schema: Optional[s_schema.Schema] = None,
         schema_object_ids: Optional[Mapping[str, uuid.UUID]] = None,
     ) -> CompileContext:
@@ -1093,7 +1106,9 @@ class Compiler(BaseCompiler):
 
         state = self._current_db_state
 
-        if json_mode:
+        if json_mode and json_elements:
+            of = pg_compiler.OutputFormat.JSON_ELEMENTS
+        elif json_mode:
             of = pg_compiler.OutputFormat.JSON
         else:
             of = pg_compiler.OutputFormat.NATIVE
@@ -1189,7 +1204,8 @@ class Compiler(BaseCompiler):
             implicit_limit: int,
             stmt_mode: enums.CompileStatementMode,
             capability: enums.Capability,
-            json_parameters: bool=False) -> List[dbstate.QueryUnit]:
+            json_parameters: bool=False,
+            json_elements: bool=False) -> List[dbstate.QueryUnit]:
 
         ctx = await self._ctx_new_con_state(
             dbver=dbver,
@@ -1200,7 +1216,8 @@ class Compiler(BaseCompiler):
             session_config=sess_config,
             stmt_mode=enums.CompileStatementMode(stmt_mode),
             capability=capability,
-            json_parameters=json_parameters)
+            json_parameters=json_parameters,
+            json_elements=json_elements)
 
         return self._compile(ctx=ctx, eql=eql)
 
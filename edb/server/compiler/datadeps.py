@@ -0,0 +1,151 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Data dependencies of compiled queries.
+
+The functions in this module determine which object types a query
+reads and modifies.  Query results are cached by the HTTP ports, and
+the caches are invalidated whenever a query modifying one of the types
+read by a cached query is executed by the server.  The dependencies
+are tracked per object type: the data of a type includes the tables of
+all its links, and reading a type reads the data of all its subtypes.
+"""
+
+from __future__ import annotations
+from typing import *  # NoQA
+
+from edb.edgeql import qltypes
+
+from edb.ir import ast as irast
+
+from edb.schema import functions as s_func
+from edb.schema import links as s_links
+from edb.schema import objtypes as s_objtypes
+from edb.schema import pointers as s_pointers
+from edb.schema import schema as s_schema
+
+
+# Modules whose types and functions expose server state
+# rather than database data.
+_STATEFUL_MODULES = frozenset({'cfg', 'sys'})
+
+
+def _add_type(
+    schema: s_schema.Schema,
+    stype: s_objtypes.ObjectType,
+    result: Set[str],
+) -> None:
+    stype = stype.material_type(schema)
+
+    components = (
+        stype.get_union_of(schema) or stype.get_intersection_of(schema))
+    if components:
+        for component in components.objects(schema):
+            _add_type(schema, component, result)
+    else:
+        result.add(str(stype.get_name(schema)))
+
+
+def get_read_types(ir: irast.Statement) -> Optional[Tuple[str, ...]]:
+    """Return sorted names of object types whose data *ir* reads.
+
+    None is returned if the result of the query might depend on
+    anything besides the data of these types and the query arguments
+    (i.e. the query modifies data, calls functions that are not
+    IMMUTABLE, or looks at the server state), and so must not be
+    cached.
+    """
+    if ir.dml_stmts:
+        return None
+
+    schema = ir.schema
+    result: Set[str] = set()
+
+    for obj in ir.schema_refs:
+        if obj.get_name(schema).module in _STATEFUL_MODULES:
+            return None
+
+        if isinstance(obj, s_func.VolatilitySubject):
+            volatility = obj.get_volatility(schema)
+            if volatility is not qltypes.Volatility.IMMUTABLE:
+                return None
+
+        elif isinstance(obj, s_pointers.Pointer):
+            source = obj.get_source(schema)
+            if isinstance(source, s_links.Link):
+                # A link property: the data is in the link table.
+                source = source.get_source(schema)
+            if isinstance(source, s_objtypes.ObjectType):
+                _add_type(schema, source, result)
+
+            target = obj.get_target(schema)
+            if isinstance(target, s_objtypes.ObjectType):
+                _add_type(schema, target, result)
+
+        elif isinstance(obj, s_objtypes.ObjectType):
+            _add_type(schema, obj, result)
+
+    return tuple(sorted(result))
+
+
+def get_dml_types(ir: irast.Statement) -> Optional[FrozenSet[str]]:
+    """Return names of object types whose data *ir* modifies.
+
+    The result includes the ancestors of every modified type, as
+    their data includes the data of the subtypes.  An empty set means
+    that the query does not modify any data.  None is returned if the
+    modified types cannot be determined statically, which is the case
+    for DELETE: deleting an object affects all objects linking to it.
+    """
+    if not ir.dml_stmts:
+        return frozenset()
+
+    schema = ir.schema
+    result: Set[str] = set()
+
+    for stmt in ir.dml_stmts:
+        if isinstance(stmt, irast.DeleteStmt):
+            return None
+
+        stype = schema.get_by_id(stmt.subject.typeref.id)
+        stype = stype.material_type(schema)
+        stype = stype.get_nearest_non_derived_parent(schema)
+
+        modified = {stype}
+        if isinstance(stmt, irast.UpdateStmt):
+            # UPDATE modifies the objects of all subtypes as well.
+            modified.update(
+                d for d in stype.descendants(schema)
+                if not d.get_is_derived(schema))
+
+        for mtype in modified:
+            result.add(str(mtype.get_name(schema)))
+            for ancestor in mtype.get_ancestors(schema).objects(schema):
+                result.add(str(ancestor.get_name(schema)))
+
+    return frozenset(result)
+
+
+def merge_dml_types(
+    a: Optional[FrozenSet[str]],
+    b: Optional[FrozenSet[str]],
+) -> Optional[FrozenSet[str]]:
+    """Combine the results of get_dml_types() for several queries."""
+    if a is None or b is None:
+        return None
+    return a | b
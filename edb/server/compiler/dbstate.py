@@ -73,6 +73,9 @@ class Query(BaseQuery):
     is_transactional: bool = True
     single_unit: bool = False
 
+    read_types: Optional[Tuple[str, ...]] = None
+    dml_types: Optional[FrozenSet[str]] = frozenset()
+
 
 @dataclasses.dataclass(frozen=True)
 class SimpleQuery(BaseQuery):
@@ -81,6 +84,8 @@ class SimpleQuery(BaseQuery):
     is_transactional: bool = True
     single_unit: bool = False
 
+    dml_types: Optional[FrozenSet[str]] = frozenset()
+
 
 @dataclasses.dataclass(frozen=True)
 class SessionStateQuery(BaseQuery):
@@ -183,6 +188,16 @@ class QueryUnit:
         Mapping[int, int]
     ] = None
 
+    # Names of object types whose data is read by the query.  Set only
+    # for read-only queries whose result depends on nothing but that
+    # data and the arguments, i.e. the result can be cached.
+    read_types: Optional[Tuple[str, ...]] = None
+
+    # Names of object types whose data is modified by this unit.
+    # None if the unit modifies data, but the affected types are
+    # not known.
+    dml_types: Optional[FrozenSet[str]] = frozenset()
+
     # Set only when this unit contains a CONFIGURE SYSTEM command.
     system_config: bool = False
     config_requires_restart: bool = False
@@ -27,6 +27,7 @@ import uuid
 
 from edb import errors
 from edb.common import binwrapper
+from edb.common import lru
 from edb.common import uuidgen
 
 from edb.schema import links as s_links
@@ -57,6 +58,13 @@ CTYPE_NAMEDTUPLE = b'\x05'
 CTYPE_ARRAY = b'\x06'
 CTYPE_ENUM = b'\x07'
 
+# Bounds on the number of encoded type descriptors and descriptor
+# nodes memoized per schema version.  The memo lives until the next
+# schema change, so these keep ad-hoc shapes from accumulating in
+# a long-running compiler worker.
+TYPE_DESCRIPTOR_CACHE_SIZE = 1000
+TYPE_DESCRIPTOR_NODES_CACHE_SIZE = 10000
+
 
 class TypeSerializer:
 
@@ -70,6 +78,15 @@ class TypeSerializer:
         self.schema = schema
         self.buffer = []
         self.uuid_to_pos = {}
+        self.scalar_sigs = {}
+
+        # Encoded type descriptor nodes by type signature, shared by
+        # all descriptors built for this version of the schema.
+        self.nodes = schema.get_memoized('type_descriptor_nodes')
+        if self.nodes is None:
+            self.nodes = lru.LRUMapping(
+                maxsize=TYPE_DESCRIPTOR_NODES_CACHE_SIZE)
+            schema.set_memoized('type_descriptor_nodes', self.nodes)
 
     def _get_collection_type_id(self, coll_type, subtypes,
                                 element_names=None):
@@ -109,112 +126,60 @@ class TypeSerializer:
         if type_id not in self.uuid_to_pos:
             self.uuid_to_pos[type_id] = len(self.uuid_to_pos)
 
-    def _describe_set(self, t, view_shapes, view_shapes_metadata):
-        type_id = self._describe_type(t, view_shapes, view_shapes_metadata)
-        set_id = self._get_set_type_id(type_id)
-        if set_id in self.uuid_to_pos:
-            return set_id
-
-        self.buffer.append(CTYPE_SET)
-        self.buffer.append(set_id.bytes)
-        self.buffer.append(_uint16_packer(self.uuid_to_pos[type_id]))
+    def _get_type_signature(self, t, view_shapes, view_shapes_metadata,
+                            follow_links: bool = True):
+        # A signature is a hashable description of everything that
+        # affects the descriptor of *t*.  It only refers to the ids of
+        # the material types and to pointer names, never to the
+        # (possibly query-local) view types themselves, so descriptors
+        # can be memoized by signature in the schema.
 
-        self._register_type_id(set_id)
-        return set_id
-
-    def _describe_type(self, t, view_shapes, view_shapes_metadata,
-                       follow_links: bool = True):
-        # The encoding format is documented in edb/api/types.txt.
-
-        buf = self.buffer
+        schema = self.schema
 
         if isinstance(t, s_types.Tuple):
-            subtypes = [self._describe_type(st, view_shapes,
-                                            view_shapes_metadata)
-                        for st in t.get_subtypes(self.schema)]
+            subtypes = tuple(
+                self._get_type_signature(st, view_shapes,
+                                         view_shapes_metadata)
+                for st in t.get_subtypes(schema))
 
             if t.named:
-                element_names = list(t.get_element_names(self.schema))
+                element_names = tuple(t.get_element_names(schema))
                 assert len(element_names) == len(subtypes)
-
-                type_id = self._get_collection_type_id(
-                    t.schema_name, subtypes, element_names)
-
-                if type_id in self.uuid_to_pos:
-                    return type_id
-
-                buf.append(CTYPE_NAMEDTUPLE)
-                buf.append(type_id.bytes)
-                buf.append(_uint16_packer(len(subtypes)))
-                for el_name, el_type in zip(element_names, subtypes):
-                    el_name_bytes = el_name.encode('utf-8')
-                    buf.append(_uint32_packer(len(el_name_bytes)))
-                    buf.append(el_name_bytes)
-                    buf.append(_uint16_packer(self.uuid_to_pos[el_type]))
-
+                return (CTYPE_NAMEDTUPLE, t.schema_name, subtypes,
+                        element_names)
             else:
-                type_id = self._get_collection_type_id(t.schema_name, subtypes)
-
-                if type_id in self.uuid_to_pos:
-                    return type_id
-
-                buf.append(CTYPE_TUPLE)
-                buf.append(type_id.bytes)
-                buf.append(_uint16_packer(len(subtypes)))
-                for el_type in subtypes:
-                    buf.append(_uint16_packer(self.uuid_to_pos[el_type]))
-
-            self._register_type_id(type_id)
-            return type_id
+                return (CTYPE_TUPLE, t.schema_name, subtypes)
 
         elif isinstance(t, s_types.Array):
-            subtypes = [self._describe_type(st, view_shapes,
-                                            view_shapes_metadata)
-                        for st in t.get_subtypes(self.schema)]
+            subtypes = tuple(
+                self._get_type_signature(st, view_shapes,
+                                         view_shapes_metadata)
+                for st in t.get_subtypes(schema))
 
             assert len(subtypes) == 1
-            type_id = self._get_collection_type_id(t.schema_name, subtypes)
-
-            if type_id in self.uuid_to_pos:
-                return type_id
-
-            buf.append(CTYPE_ARRAY)
-            buf.append(type_id.bytes)
-            buf.append(_uint16_packer(self.uuid_to_pos[subtypes[0]]))
-            # Number of dimensions (currently always 1)
-            buf.append(_uint16_packer(1))
-            # Dimension cardinality (currently always unbound)
-            buf.append(_int32_packer(-1))
-
-            self._register_type_id(type_id)
-            return type_id
+            return (CTYPE_ARRAY, t.schema_name, subtypes)
 
         elif isinstance(t, s_types.Collection):
             raise errors.SchemaError(f'unsupported collection type {t!r}')
 
         elif view_shapes.get(t):
             # This is a view
-            mt = t.material_type(self.schema)
-            base_type_id = mt.id
-
-            subtypes = []
-            element_names = []
-            link_props = []
-            links = []
+            mt = t.material_type(schema)
+            elements = []
 
             metadata = view_shapes_metadata.get(t)
             implicit_id = metadata is not None and metadata.has_implicit_id
 
             for ptr in view_shapes[t]:
-                if ptr.singular(self.schema):
+                if ptr.singular(schema):
                     if isinstance(ptr, s_links.Link) and not follow_links:
-                        subtype_id = self._describe_type(
-                            self.schema.get('std::uuid'), view_shapes,
+                        subtype = self._get_type_signature(
+                            schema.get('std::uuid'), view_shapes,
                             view_shapes_metadata,
                         )
                     else:
-                        subtype_id = self._describe_type(
-                            ptr.get_target(self.schema), view_shapes,
+                        subtype = self._get_type_signature(
+                            ptr.get_target(schema), view_shapes,
                             view_shapes_metadata)
                 else:
                     if isinstance(ptr, s_links.Link) and not follow_links:
@@ -223,49 +188,169 @@ class TypeSerializer:
                             'follow_links=False'
                         )
                     else:
-                        subtype_id = self._describe_set(
-                            ptr.get_target(self.schema), view_shapes,
-                            view_shapes_metadata)
-                subtypes.append(subtype_id)
-                element_names.append(ptr.get_shortname(self.schema).name)
-                link_props.append(False)
-                links.append(not ptr.is_property(self.schema))
-
-            t_rptr = t.get_rptr(self.schema)
+                        subtype = (
+                            CTYPE_SET,
+                            self._get_type_signature(
+                                ptr.get_target(schema), view_shapes,
+                                view_shapes_metadata),
+                        )
+                elements.append((
+                    ptr.get_shortname(schema).name,
+                    False,
+                    not ptr.is_property(schema),
+                    subtype,
+                ))
+
+            t_rptr = t.get_rptr(schema)
             if t_rptr is not None:
                 # There are link properties in the mix
                 for ptr in view_shapes[t_rptr]:
-                    if ptr.singular(self.schema):
-                        subtype_id = self._describe_type(
-                            ptr.get_target(self.schema), view_shapes,
-                            view_shapes_metadata)
-                    else:
-                        subtype_id = self._describe_set(
-                            ptr.get_target(self.schema), view_shapes,
-                            view_shapes_metadata)
-                    subtypes.append(subtype_id)
-                    element_names.append(
-                        ptr.get_shortname(self.schema).name)
-                    link_props.append(True)
-                    links.append(False)
+                    subtype = self._get_type_signature(
+                        ptr.get_target(schema), view_shapes,
+                        view_shapes_metadata)
+                    if not ptr.singular(schema):
+                        subtype = (CTYPE_SET, subtype)
+                    elements.append((
+                        ptr.get_shortname(schema).name,
+                        True,
+                        False,
+                        subtype,
+                    ))
+
+            return (CTYPE_SHAPE, mt.id, implicit_id, tuple(elements))
+
+        elif t.is_scalar():
+            # This is a scalar type.  Its descriptor depends on its
+            # bases and enum values, which are looked up only once per
+            # schema version.
+            sig = self.scalar_sigs.get(t)
+            if sig is None:
+                mt = t.material_type(schema)
+                sig = (CTYPE_SCALAR, mt.id)
+                if sig not in self.nodes:
+                    self.nodes[sig] = self._make_scalar_node(mt)
+                self.scalar_sigs[t] = sig
+            return sig
+
+        else:
+            raise errors.InternalServerError(
+                f'cannot describe type {t.get_name(schema)}')
+
+    def _make_scalar_node(self, mt):
+        type_id = mt.id
+        base_type = mt.get_topmost_concrete_base(self.schema)
+        enum_values = mt.get_enum_values(self.schema)
+
+        if enum_values:
+            head = [CTYPE_ENUM, type_id.bytes,
+                    _uint16_packer(len(enum_values))]
+            for enum_val in enum_values:
+                enum_val_bytes = enum_val.encode('utf-8')
+                head.append(_uint32_packer(len(enum_val_bytes)))
+                head.append(enum_val_bytes)
+            return (type_id, b''.join(head), (), b'')
+
+        elif mt is base_type:
+            return (type_id, CTYPE_BASE_SCALAR + type_id.bytes, (), b'')
+
+        else:
+            bt_sig = self._get_type_signature(base_type, {}, {})
+            return (type_id, CTYPE_SCALAR + type_id.bytes,
+                    ((b'', bt_sig),), b'')
+
+    def _get_node(self, sig):
+        # A node is the encoded descriptor of a single type, less the
+        # positions of its element types in the descriptor being built:
+        # (type_id, head, ((prefix, element_sig), ...), tail).
+        try:
+            return self.nodes[sig]
+        except KeyError:
+            pass
+
+        node = self._make_node(sig)
+        self.nodes[sig] = node
+        return node
+
+    def _make_node(self, sig):
+        # The encoding format is documented in edb/api/types.txt.
+
+        ctype = sig[0]
+
+        if ctype == CTYPE_SET:
+            el_sig = sig[1]
+            type_id = self._get_set_type_id(self._get_node(el_sig)[0])
+            return (type_id, CTYPE_SET + type_id.bytes,
+                    ((b'', el_sig),), b'')
+
+        elif ctype == CTYPE_NAMEDTUPLE:
+            _, coll_type, el_sigs, element_names = sig
+            type_id = self._get_collection_type_id(
+                coll_type, [self._get_node(st)[0] for st in el_sigs],
+                element_names)
+
+            elements = []
+            for el_name, el_sig in zip(element_names, el_sigs):
+                el_name_bytes = el_name.encode('utf-8')
+                elements.append(
+                    (_uint32_packer(len(el_name_bytes)) + el_name_bytes,
+                     el_sig))
+
+            return (
+                type_id,
+                CTYPE_NAMEDTUPLE + type_id.bytes
+                + _uint16_packer(len(el_sigs)),
+                tuple(elements),
+                b'',
+            )
+
+        elif ctype == CTYPE_TUPLE:
+            _, coll_type, el_sigs = sig
+            type_id = self._get_collection_type_id(
+                coll_type, [self._get_node(st)[0] for st in el_sigs])
+
+            return (
+                type_id,
+                CTYPE_TUPLE + type_id.bytes + _uint16_packer(len(el_sigs)),
+                tuple((b'', st) for st in el_sigs),
+                b'',
+            )
+
+        elif ctype == CTYPE_ARRAY:
+            _, coll_type, el_sigs = sig
+            type_id = self._get_collection_type_id(
+                coll_type, [self._get_node(st)[0] for st in el_sigs])
+
+            return (
+                type_id,
+                CTYPE_ARRAY + type_id.bytes,
+                ((b'', el_sigs[0]),),
+                # Number of dimensions (currently always 1)
+                _uint16_packer(1)
+                # Dimension cardinality (currently always unbound)
+                + _int32_packer(-1),
+            )
+
+        elif ctype == CTYPE_SHAPE:
+            _, base_type_id, implicit_id, shape_els = sig
+
+            subtypes = []
+            element_names = []
+            link_props = []
+            links = []
+            for el_name, el_lp, el_l, el_sig in shape_els:
+                subtypes.append(self._get_node(el_sig)[0])
+                element_names.append(el_name)
+                link_props.append(el_lp)
+                links.append(el_l)
 
             type_id = self._get_object_type_id(
                 base_type_id, subtypes, element_names,
                 links_props=link_props, links=links,
                 has_implicit_fields=implicit_id)
 
-            if type_id in self.uuid_to_pos:
-                return type_id
-
-            buf.append(CTYPE_SHAPE)
-            buf.append(type_id.bytes)
-
-            assert len(subtypes) == len(element_names)
-            buf.append(_uint16_packer(len(subtypes)))
-
-            for el_name, el_type, el_lp, el_l in zip(element_names,
-                                                     subtypes, link_props,
-                                                     links):
+            elements = []
+            for (el_name, el_lp, el_l, el_sig), el_type in zip(shape_els,
+                                                               subtypes):
                 flags = 0
                 if el_lp:
                     flags |= self.EDGE_POINTER_IS_LINKPROP
@@ -277,64 +362,71 @@ class TypeSerializer:
                     flags |= self.EDGE_POINTER_IS_IMPLICIT
                 if el_l:
                     flags |= self.EDGE_POINTER_IS_LINK
-                buf.append(_uint8_packer(flags))
 
                 el_name_bytes = el_name.encode('utf-8')
-                buf.append(_uint32_packer(len(el_name_bytes)))
-                buf.append(el_name_bytes)
-                buf.append(_uint16_packer(self.uuid_to_pos[el_type]))
-
-            self._register_type_id(type_id)
-            return type_id
+                elements.append((
+                    _uint8_packer(flags)
+                    + _uint32_packer(len(el_name_bytes)) + el_name_bytes,
+                    el_sig,
+                ))
+
+            return (
+                type_id,
+                CTYPE_SHAPE + type_id.bytes + _uint16_packer(len(subtypes)),
+                tuple(elements),
+                b'',
+            )
+
+        elif ctype == CTYPE_SCALAR:
+            # Normally made by _get_type_signature(), but the node
+            # may have been evicted since.
+            return self._make_scalar_node(self.schema.get_by_id(sig[1]))
 
-        elif t.is_scalar():
-            # This is a scalar type
-
-            mt = t.material_type(self.schema)
-            type_id = mt.id
-            if type_id in self.uuid_to_pos:
-                # already described
-                return type_id
-
-            base_type = mt.get_topmost_concrete_base(self.schema)
-            enum_values = mt.get_enum_values(self.schema)
-
-            if enum_values:
-                buf.append(CTYPE_ENUM)
-                buf.append(type_id.bytes)
-                buf.append(_uint16_packer(len(enum_values)))
-                for enum_val in enum_values:
-                    enum_val_bytes = enum_val.encode('utf-8')
-                    buf.append(_uint32_packer(len(enum_val_bytes)))
-                    buf.append(enum_val_bytes)
-
-            elif mt is base_type:
-                buf.append(CTYPE_BASE_SCALAR)
-                buf.append(type_id.bytes)
+        else:
+            raise errors.InternalServerError(
+                f'unexpected type descriptor signature {sig!r}')
 
-            else:
-                bt_id = self._describe_type(
-                    base_type, view_shapes, view_shapes_metadata)
+    def _describe_type(self, sig):
+        type_id, head, elements, tail = self._get_node(sig)
+        if type_id in self.uuid_to_pos:
+            # already described, and so are all of its element types
+            return type_id
 
-                buf.append(CTYPE_SCALAR)
-                buf.append(type_id.bytes)
-                buf.append(_uint16_packer(self.uuid_to_pos[bt_id]))
+        el_positions = [
+            self.uuid_to_pos[self._describe_type(el_sig)]
+            for _, el_sig in elements
+        ]
 
-            self._register_type_id(type_id)
-            return type_id
+        buf = self.buffer
+        buf.append(head)
+        for (prefix, _), el_pos in zip(elements, el_positions):
+            buf.append(prefix)
+            buf.append(_uint16_packer(el_pos))
+        buf.append(tail)
 
-        else:
-            raise errors.InternalServerError(
-                f'cannot describe type {t.get_name(self.schema)}')
+        self._register_type_id(type_id)
+        return type_id
 
     @classmethod
     def describe(cls, schema, typ, view_shapes, view_shapes_metadata,
                  *, follow_links: bool = True) -> bytes:
         builder = cls(schema)
-        type_id = builder._describe_type(
+        sig = builder._get_type_signature(
             typ, view_shapes, view_shapes_metadata,
             follow_links=follow_links)
-        return b''.join(builder.buffer), type_id
+
+        descriptors = schema.get_memoized('type_descriptors')
+        if descriptors is None:
+            descriptors = lru.LRUMapping(maxsize=TYPE_DESCRIPTOR_CACHE_SIZE)
+            schema.set_memoized('type_descriptors', descriptors)
+
+        result = descriptors.get(sig)
+        if result is None:
+            type_id = builder._describe_type(sig)
+            result = (b''.join(builder.buffer), type_id)
+            descriptors[sig] = result
+
+        return result
 
     @classmethod
     def describe_json(cls) -> bytes:
@@ -37,7 +37,15 @@ cdef class Database:
         object _eql_to_compiled
         DatabaseIndex _index
 
+        object _dml_ver
+        object _any_dml_ver
+        dict _type_dml_vers
+
     cdef _signal_ddl(self)
+    cdef _advance_dbver(self)
+    cdef _signal_dml(self, dml_types)
+    cdef _advance_dml_ver(self, dml_types)
+    cdef _get_data_version(self, tuple read_types)
     cdef _invalidate_caches(self)
     cdef _cache_compiled_query(self, key, query_unit)
     cdef _new_view(self, user, query_cache)
@@ -60,6 +68,7 @@ cdef class DatabaseConnectionView:
         bint _in_tx
         bint _in_tx_with_ddl
         bint _in_tx_with_set
+        object _in_tx_dml_types
         bint _tx_error
 
     cdef _invalidate_local_cache(self)
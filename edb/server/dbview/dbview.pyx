@@ -28,6 +28,7 @@ import immutables
 from edb import errors
 from edb.common import lru
 from edb.server import defines, config
+from edb.server.compiler import datadeps
 from edb.server.compiler import dbstate
 from edb.pgsql import dbops
 
@@ -49,10 +50,41 @@ cdef class Database:
         self._eql_to_compiled = lru.LRUMapping(
             maxsize=defines._MAX_QUERIES_CACHE)
 
+        # Data versions: _type_dml_vers maps object type names to
+        # the value of _dml_ver at the time the data of that type
+        # was last modified; _any_dml_ver is the value at the time
+        # of the last modification of unknown types.
+        self._dml_ver = 0
+        self._any_dml_ver = 0
+        self._type_dml_vers = {}
+
     cdef _signal_ddl(self):
+        self._advance_dbver()
+        self._index._server._on_database_ddl(self._name)
+
+    cdef _advance_dbver(self):
         self._dbver = time.monotonic_ns()  # Advance the version
         self._invalidate_caches()
 
+    cdef _signal_dml(self, dml_types):
+        self._advance_dml_ver(dml_types)
+        self._index._server._on_database_dml(self._name, dml_types)
+
+    cdef _advance_dml_ver(self, dml_types):
+        self._dml_ver += 1
+        if dml_types is None:
+            self._any_dml_ver = self._dml_ver
+        else:
+            for name in dml_types:
+                self._type_dml_vers[name] = self._dml_ver
+
+    cdef _get_data_version(self, tuple read_types):
+        # A cached query result is valid for as long as the data
+        # version of the types it was computed from stays the same.
+        vers = self._type_dml_vers
+        return (self._dbver, self._any_dml_ver) + tuple(
+            [vers.get(name, 0) for name in read_types])
+
     cdef _invalidate_caches(self):
         self._eql_to_compiled.clear()
 
@@ -102,6 +134,7 @@ cdef class DatabaseConnectionView:
         self._in_tx_config = None
         self._in_tx_with_ddl = False
         self._in_tx_with_set = False
+        self._in_tx_dml_types = frozenset()
         self._tx_error = False
         self._invalidate_local_cache()
 
@@ -227,6 +260,14 @@ cdef class DatabaseConnectionView:
         if not self._in_tx and query_unit.has_ddl:
             self._db._signal_ddl()
 
+        dml_types = query_unit.dml_types
+        if dml_types is None or dml_types:
+            if self._in_tx:
+                self._in_tx_dml_types = datadeps.merge_dml_types(
+                    self._in_tx_dml_types, dml_types)
+            else:
+                self._db._signal_dml(dml_types)
+
         if query_unit.modaliases is not None:
             self._modaliases = query_unit.modaliases
 
@@ -239,6 +280,8 @@ cdef class DatabaseConnectionView:
             self._config = self._in_tx_config
             if self._in_tx_with_ddl:
                 self._db._signal_ddl()
+            if self._in_tx_dml_types is None or self._in_tx_dml_types:
+                self._db._signal_dml(self._in_tx_dml_types)
             self._reset_tx_state()
 
         elif query_unit.tx_rollback:
@@ -318,10 +361,30 @@ cdef class DatabaseIndex:
     def get_sys_config(self):
         return self._sys_config
 
+    def signal_ddl(self, dbname):
+        # A DDL command was committed by another I/O worker process.
+        db = self._dbs.get(dbname)
+        if db is not None:
+            (<Database>db)._advance_dbver()
+
     def get_dbver(self, dbname):
         db = self._get_db(dbname)
         return (<Database>db)._dbver
 
+    def signal_dml(self, dbname, dml_types, *, broadcast=True):
+        # Data was modified by a query executed outside of a
+        # connection view: by an HTTP port or, if *broadcast* is
+        # False, by another I/O worker process.
+        db = self._get_db(dbname)
+        if broadcast:
+            (<Database>db)._signal_dml(dml_types)
+        else:
+            (<Database>db)._advance_dml_ver(dml_types)
+
+    def get_data_version(self, dbname, tuple read_types):
+        db = self._get_db(dbname)
+        return (<Database>db)._get_data_version(read_types)
+
     def _get_db(self, dbname):
         try:
             db = self._dbs[dbname]
@@ -340,6 +403,8 @@ cdef class DatabaseIndex:
         await conn.simple_query(block.to_string().encode(), True)
 
     async def apply_system_config_op(self, conn, op):
+        # *conn* is None when replaying an operation that another
+        # I/O worker process has already applied and persisted.
         op_value = op.get_setting(config.get_settings())
         if op.opcode is not None:
             allow_missing = (
@@ -352,7 +417,9 @@ cdef class DatabaseIndex:
         # the callbacks below, because certain config changes
         # may cause the backend connection to drop.
         self._sys_config = op.apply(config.get_settings(), self._sys_config)
-        await self._save_system_overrides(conn)
+        if conn is not None:
+            await self._save_system_overrides(conn)
+            self._server._on_system_config_persisted(op)
 
         if op.opcode is config.OpCode.CONFIG_ADD:
             await self._server._on_system_config_add(op.setting_name, op_value)
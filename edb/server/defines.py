@@ -27,7 +27,7 @@ EDGEDB_ENCODING = 'utf-8'
 EDGEDB_VISIBLE_METADATA_PREFIX = r'EdgeDB metadata follows, do not modify.\n'
 
 # Increment this whenever the database layout or stdlib changes.
-EDGEDB_CATALOG_VERSION = 2020_01_16_00_00
+EDGEDB_CATALOG_VERSION = 2020_01_22_00_00
 
 # Resource limit on open FDs for the server process.
 # By default, at least on macOS, the max number of open FDs
@@ -35,6 +35,10 @@ EDGEDB_CATALOG_VERSION = 2020_01_16_00_00
 # We try to bump the rlimit on server start if pemitted.
 EDGEDB_MIN_RLIMIT_NOFILE = 2048
 
+# Name of the UNIX socket (in the internal runstate directory) through
+# which I/O worker processes exchange cache invalidation events.
+EDGEDB_IO_CONTROL_SOCKET = '.s.EDGEDB.control'
+
 
 _MAX_QUERIES_CACHE = 1000
 
@@ -45,4 +49,29 @@ DEFAULT_MODULE_ALIAS = 'default'
 
 
 HTTP_PORT_QUERY_CACHE_SIZE = 500
+# Maximum number of compiled variants of a single GraphQL operation
+# whose SQL depends on the values of its variables (@include/@skip).
+HTTP_PORT_GRAPHQL_VARIANTS_CACHE_SIZE = 20
+# Maximum number of GraphQL persisted queries kept by a port.
+HTTP_PORT_GRAPHQL_PERSISTED_QUERIES_SIZE = 1000
+# Maximum number of operations in a single batched GraphQL request,
+# and how many of them are executed at once.  The latter is further
+# capped at half the port's concurrency, so that one batch cannot
+# take the whole compiler and backend connection pools.
+HTTP_PORT_GRAPHQL_MAX_BATCH_SIZE = 100
+HTTP_PORT_GRAPHQL_BATCH_CONCURRENCY = 4
 HTTP_PORT_MAX_CONCURRENCY = 250
+# Results of HTTP EdgeQL queries larger than this many bytes are
+# streamed to the client with chunked transfer encoding.
+HTTP_PORT_STREAM_CHUNK_SIZE = 64 * 1024
+# Query results larger than this are not put in the result cache
+# of an HTTP port; the total size of the cached results is capped
+# at HTTP_PORT_RESULT_CACHE_MAX_BYTES.
+HTTP_PORT_RESULT_CACHE_MAX_ENTRY_SIZE = 1024 * 1024
+HTTP_PORT_RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# HTTP response bodies smaller than this are never compressed.
+HTTP_COMPRESSION_MIN_SIZE = 1024
+# Bodies at least this large are compressed in a thread pool.
+HTTP_COMPRESSION_OFFLOAD_SIZE = 256 * 1024
+HTTP_COMPRESSION_LEVEL = 6
@@ -26,6 +26,8 @@ cdef class HttpRequest:
         bytes content_type
         bytes method
         bytes body
+        bytes accept_encoding
+        bytes if_none_match
 
 
 cdef class HttpResponse:
@@ -35,6 +37,14 @@ cdef class HttpResponse:
         bint close_connection
         bytes content_type
         bytes body
+        # Set once the response headers have been sent with
+        # start_chunked(); the body is then written in chunks.
+        bint chunked
+        # Whether to tag a successful response to a GET request with
+        # an ETag derived from the body and honor If-None-Match.
+        bint use_etag
+        bytes etag
+        bytes content_encoding
 
 
 cdef class HttpProtocol:
@@ -46,13 +56,23 @@ cdef class HttpProtocol:
         object unprocessed
         bint in_response
 
+        bint writing_paused
+        object drain_waiter
+        object chunk_compressor
+
         HttpRequest current_request
 
     cdef _write(self, bytes req_version, bytes resp_status,
-                bytes content_type, bytes body, bint close_connection)
+                bytes content_type, bytes body, bint close_connection,
+                list headers=*)
 
     cdef write(self, HttpRequest request, HttpResponse response)
 
+    cdef start_chunked(self, HttpRequest request, HttpResponse response)
+    cdef write_chunk(self, list data)
+    cdef end_chunked(self)
+    cdef get_drain_waiter(self)
+
     cdef unhandled_exception(self, ex)
     cdef resume(self)
     cdef close(self)
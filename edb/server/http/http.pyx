@@ -18,17 +18,97 @@
 
 
 import collections
+import hashlib
 import http
+import zlib
 
 import httptools
 
 from edb.common import debug
 from edb.common import markup
 
+from edb.server import defines
+
 
 HTTPStatus = http.HTTPStatus
 
 
+cdef _choose_encoding(bytes accept_encoding):
+    # Pick a content coding we support from the Accept-Encoding
+    # header, preferring gzip.  Returns None for "identity".
+    if not accept_encoding:
+        return None
+
+    qvalues = {}
+    wildcard_q = None
+    for item in accept_encoding.split(b','):
+        coding, _, params = item.partition(b';')
+        coding = coding.strip().lower()
+        if coding != b'*' and coding != b'gzip' and coding != b'deflate':
+            continue
+
+        q = 1.0
+        params = params.strip()
+        if params.startswith(b'q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+
+        if coding == b'*':
+            wildcard_q = q
+        else:
+            qvalues[coding] = q
+
+    best = None
+    best_q = 0.0
+    for coding in (b'gzip', b'deflate'):
+        # "*" only covers codings that are not listed explicitly,
+        # so it never brings back one that was refused with q=0.
+        q = qvalues.get(coding, wildcard_q)
+        if q is not None and q > best_q:
+            best = coding
+            best_q = q
+
+    return best
+
+
+cdef bint _is_compressible(bytes content_type):
+    return (
+        content_type is not None and
+        (content_type.startswith(b'text/') or b'json' in content_type)
+    )
+
+
+cdef bint _etag_matches(bytes if_none_match, bytes etag):
+    # Weak comparison, as per RFC 7232, section 3.2.
+    if if_none_match.strip() == b'*':
+        return True
+    if etag.startswith(b'W/'):
+        etag = etag[2:]
+    for tag in if_none_match.split(b','):
+        tag = tag.strip()
+        if tag.startswith(b'W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def _new_compressor(bytes encoding):
+    if encoding == b'gzip':
+        wbits = 16 + zlib.MAX_WBITS
+    else:
+        wbits = zlib.MAX_WBITS
+    return zlib.compressobj(
+        defines.HTTP_COMPRESSION_LEVEL, zlib.DEFLATED, wbits)
+
+
+def _compress(bytes data, bytes encoding):
+    compressor = _new_compressor(encoding)
+    return compressor.compress(data) + compressor.flush()
+
+
 cdef class HttpRequest:
     pass
 
@@ -40,6 +120,8 @@ cdef class HttpResponse:
         self.content_type = b'text/plain'
         self.body = b''
         self.close_connection = False
+        self.chunked = False
+        self.use_etag = False
 
 
 cdef class HttpProtocol:
@@ -53,12 +135,30 @@ cdef class HttpProtocol:
         self.in_response = False
         self.unprocessed = None
 
+        self.writing_paused = False
+        self.drain_waiter = None
+        self.chunk_compressor = None
+
     def connection_made(self, transport):
         self.transport = transport
 
     def connection_lost(self, exc):
         self.transport = None
         self.unprocessed = None
+        self._wakeup_drain_waiter()
+
+    def pause_writing(self):
+        self.writing_paused = True
+
+    def resume_writing(self):
+        self.writing_paused = False
+        self._wakeup_drain_waiter()
+
+    def _wakeup_drain_waiter(self):
+        if self.drain_waiter is not None:
+            if not self.drain_waiter.done():
+                self.drain_waiter.set_result(None)
+            self.drain_waiter = None
 
     def data_received(self, data):
         try:
@@ -73,6 +173,10 @@ cdef class HttpProtocol:
         name = name.lower()
         if name == b'content-type':
             self.current_request.content_type = value
+        elif name == b'accept-encoding':
+            self.current_request.accept_encoding = value
+        elif name == b'if-none-match':
+            self.current_request.if_none_match = value
 
     def on_body(self, body: bytes):
         self.current_request.body = body
@@ -125,29 +229,153 @@ cdef class HttpProtocol:
             self.transport.resume_reading()
 
     cdef _write(self, bytes req_version, bytes resp_status,
-                bytes content_type, bytes body, bint close_connection):
+                bytes content_type, bytes body, bint close_connection,
+                list headers=None):
+        # *body* is None for responses that must not have one
+        # (304 Not Modified); *headers* are extra raw header lines.
         if self.transport is None:
             return
-        data = [
-            b'HTTP/', req_version, b' ', resp_status, b'\r\n',
-            b'Content-Type: ', content_type, b'\r\n',
-            b'Content-Length: ', f'{len(body)}'.encode(), b'\r\n',
-        ]
+        data = [b'HTTP/', req_version, b' ', resp_status, b'\r\n']
+        if body is not None:
+            data.extend((
+                b'Content-Type: ', content_type, b'\r\n',
+                b'Content-Length: ', f'{len(body)}'.encode(), b'\r\n',
+            ))
+        if headers:
+            data.extend(headers)
         if close_connection:
             data.append(b'Connection: close\r\n')
         data.append(b'\r\n')
         if body:
             data.append(body)
-        self.transport.write(b''.join(data))
+        self.transport.writelines(data)
 
     cdef write(self, HttpRequest request, HttpResponse response):
         assert type(response.status) is HTTPStatus
+
+        headers = []
+        if response.etag is not None:
+            headers.extend((b'ETag: ', response.etag, b'\r\n'))
+        if response.content_encoding is not None:
+            headers.extend((
+                b'Content-Encoding: ', response.content_encoding, b'\r\n'))
+        if _is_compressible(response.content_type):
+            headers.append(b'Vary: Accept-Encoding\r\n')
+
+        if response.status is HTTPStatus.NOT_MODIFIED:
+            body = None
+        else:
+            body = response.body
+
         self._write(
             request.version,
             f'{response.status.value} {response.status.phrase}'.encode(),
             response.content_type,
-            response.body,
-            response.close_connection)
+            body,
+            response.close_connection,
+            headers)
+
+    async def _finalize_response(self, HttpRequest request,
+                                 HttpResponse response):
+        # Handle conditional requests and compress the response body
+        # if the client accepts it.
+        body = response.body
+
+        if (response.use_etag and request.method == b'GET'
+                and response.status is HTTPStatus.OK):
+            digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+            # The tag is weak, as it is shared by all content codings
+            # of the same response.
+            response.etag = f'W/"{digest}"'.encode()
+            if (request.if_none_match is not None and
+                    _etag_matches(request.if_none_match, response.etag)):
+                response.status = HTTPStatus.NOT_MODIFIED
+                response.body = b''
+                return
+
+        if (len(body) < defines.HTTP_COMPRESSION_MIN_SIZE or
+                not _is_compressible(response.content_type)):
+            return
+
+        encoding = _choose_encoding(request.accept_encoding)
+        if encoding is None:
+            return
+
+        if len(body) >= defines.HTTP_COMPRESSION_OFFLOAD_SIZE:
+            # zlib releases the GIL, so compressing large bodies
+            # in a thread keeps the event loop responsive.
+            body = await self.loop.run_in_executor(
+                None, _compress, body, encoding)
+        else:
+            body = _compress(body, encoding)
+
+        response.body = body
+        response.content_encoding = encoding
+
+    cdef start_chunked(self, HttpRequest request, HttpResponse response):
+        # Send the response headers for a body of unknown length,
+        # which will then be written with write_chunk() and terminated
+        # with end_chunked().  Requires HTTP/1.1.
+        assert type(response.status) is HTTPStatus
+        assert request.version == b'1.1'
+        response.chunked = True
+        if self.transport is None:
+            return
+        data = [
+            b'HTTP/', request.version, b' ',
+            f'{response.status.value} {response.status.phrase}'.encode(),
+            b'\r\n',
+            b'Content-Type: ', response.content_type, b'\r\n',
+            b'Transfer-Encoding: chunked\r\n',
+        ]
+        if _is_compressible(response.content_type):
+            data.append(b'Vary: Accept-Encoding\r\n')
+            encoding = _choose_encoding(request.accept_encoding)
+            if encoding is not None:
+                response.content_encoding = encoding
+                self.chunk_compressor = _new_compressor(encoding)
+                data.extend((b'Content-Encoding: ', encoding, b'\r\n'))
+        if response.close_connection:
+            data.append(b'Connection: close\r\n')
+        data.append(b'\r\n')
+        self.transport.writelines(data)
+
+    cdef write_chunk(self, list data):
+        # Write a single chunk made of the given byte strings;
+        # *data* is modified in place.
+        if self.transport is None:
+            return
+        if self.chunk_compressor is not None:
+            data = [self.chunk_compressor.compress(b''.join(data))]
+        size = 0
+        for part in data:
+            size += len(part)
+        if not size:
+            # A zero-length chunk would terminate the body.
+            return
+        data.insert(0, f'{size:x}\r\n'.encode())
+        data.append(b'\r\n')
+        self.transport.writelines(data)
+
+    cdef end_chunked(self):
+        compressor = self.chunk_compressor
+        self.chunk_compressor = None
+        if self.transport is None:
+            return
+        if compressor is not None:
+            tail = compressor.flush()
+            self.transport.writelines(
+                (f'{len(tail):x}\r\n'.encode(), tail, b'\r\n'))
+        self.transport.write(b'0\r\n\r\n')
+
+    cdef get_drain_waiter(self):
+        # Returns a future to wait on before writing more data if the
+        # transport's write buffer is full, or None otherwise.
+        if not self.writing_paused or self.transport is None:
+            return None
+        if self.drain_waiter is None:
+            self.drain_waiter = self.loop.create_future()
+        return self.drain_waiter
 
     async def _handle_request(self, HttpRequest request):
         cdef:
@@ -159,10 +387,22 @@ cdef class HttpProtocol:
         try:
             await self.handle_request(request, response)
         except Exception as ex:
-            self.unhandled_exception(ex)
+            if response.chunked:
+                # The headers are already sent, so all we can do is
+                # to drop the connection.
+                if debug.flags.server:
+                    markup.dump(ex)
+                if self.transport is not None:
+                    self.close()
+            else:
+                self.unhandled_exception(ex)
             return
 
-        self.write(request, response)
+        if not response.chunked:
+            await self._finalize_response(request, response)
+            if self.transport is None:
+                return
+            self.write(request, response)
         self.in_response = False
 
         if response.close_connection or not request.should_keep_alive:
@@ -0,0 +1,245 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from __future__ import annotations
+from typing import *  # NoQA
+
+import asyncio
+import collections
+import logging
+import time
+
+from edb import errors
+from edb.common import taskgroup
+
+
+logger = logging.getLogger('edb.server')
+
+
+class ResourcePool:
+    """An elastic pool of backend resources (compilers, connections).
+
+    The pool starts with *min_size* resources and creates new ones on
+    demand, up to *max_size*, whenever a request finds no idle
+    resource.  Once all *max_size* resources are busy, requests wait
+    in a FIFO queue for at most *queue_timeout* seconds.  Resources
+    that stay idle for more than *idle_timeout* seconds are closed
+    for as long as the pool has more than *min_size* of them.
+    """
+
+    def __init__(
+        self,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        name: str,
+        connect: Callable[[], Awaitable[Any]],
+        disconnect: Callable[[Any], Awaitable[None]],
+        min_size: int,
+        max_size: int,
+        idle_timeout: float,
+        queue_timeout: float,
+    ) -> None:
+        if min_size < 0 or min_size > max_size:
+            raise ValueError(
+                f'min_size must be between 0 and max_size ({max_size}), '
+                f'got {min_size}')
+
+        self._loop = loop
+        self._name = name
+        self._connect = connect
+        self._disconnect = disconnect
+        self._min_size = min_size
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._queue_timeout = queue_timeout
+
+        # Idle resources along with the time they were released at;
+        # the most recently used ones are at the end.
+        self._idle: Deque[Tuple[Any, float]] = collections.deque()
+        self._waiters: Deque[asyncio.Future] = collections.deque()
+        self._tasks: Set[asyncio.Task] = set()
+        # The number of resources, including those being connected.
+        self._size = 0
+        self._shrink_handle: Optional[asyncio.TimerHandle] = None
+        self._closed = False
+
+    @property
+    def min_size(self) -> int:
+        return self._min_size
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'size': self._size,
+            'idle': len(self._idle),
+            'waiting': len(self._waiters),
+            'min_size': self._min_size,
+            'max_size': self._max_size,
+        }
+
+    async def start(self) -> None:
+        async with taskgroup.TaskGroup() as g:
+            tasks = [g.create_task(self._new_resource())
+                     for _ in range(self._min_size)]
+
+        now = time.monotonic()
+        for task in tasks:
+            self._idle.append((task.result(), now))
+
+    async def acquire(self) -> Any:
+        if self._closed:
+            raise errors.InternalServerError(f'{self._name} pool is closed')
+
+        if self._idle:
+            resource, _ = self._idle.pop()
+            return resource
+
+        if self._size < self._max_size:
+            return await self._new_resource()
+
+        waiter = self._loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, self._queue_timeout)
+        except asyncio.TimeoutError:
+            raise errors.QueryTimeoutError(
+                f'timed out waiting for a free {self._name} after '
+                f'{self._queue_timeout} seconds') from None
+        except asyncio.CancelledError:
+            if (waiter.done() and not waiter.cancelled() and
+                    waiter.exception() is None):
+                # The resource was handed over just as the request
+                # got cancelled.
+                self.release(waiter.result())
+            raise
+        finally:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def release(self, resource: Any, *, discard: bool = False) -> None:
+        """Return *resource* to the pool.
+
+        If *discard* is True, the resource is closed, e.g. because
+        it is broken, and a new one is created in its place if there
+        are requests waiting.
+        """
+        if discard or self._closed:
+            self._size -= 1
+            self._spawn(self._disconnect_resource(resource))
+            if self._has_waiters():
+                self._spawn(self._replenish())
+            return
+
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(resource)
+                return
+
+        self._idle.append((resource, time.monotonic()))
+        self._schedule_shrink()
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._shrink_handle is not None:
+            self._shrink_handle.cancel()
+            self._shrink_handle = None
+
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(errors.InternalServerError(
+                    f'{self._name} pool is closed'))
+
+        idle = [resource for resource, _ in self._idle]
+        self._idle.clear()
+        self._size -= len(idle)
+
+        # Resources that are currently in use are closed on release.
+        async with taskgroup.TaskGroup() as g:
+            for resource in idle:
+                g.create_task(self._disconnect_resource(resource))
+            for task in list(self._tasks):
+                g.create_task(asyncio.wait([task]))
+
+    def _has_waiters(self) -> bool:
+        return any(not waiter.done() for waiter in self._waiters)
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _new_resource(self) -> Any:
+        self._size += 1
+        try:
+            return await self._connect()
+        except BaseException:
+            self._size -= 1
+            raise
+
+    async def _replenish(self) -> None:
+        if (self._closed or self._size >= self._max_size or
+                not self._has_waiters()):
+            return
+        try:
+            resource = await self._new_resource()
+        except Exception:
+            logger.exception('could not create a new %s', self._name)
+            return
+        self.release(resource)
+
+    async def _disconnect_resource(self, resource: Any) -> None:
+        try:
+            await self._disconnect(resource)
+        except Exception:
+            logger.exception('could not close a %s', self._name)
+
+    def _schedule_shrink(self) -> None:
+        if (self._shrink_handle is None and
+                self._size > self._min_size and not self._closed):
+            self._shrink_handle = self._loop.call_later(
+                self._idle_timeout, self._shrink)
+
+    def _shrink(self) -> None:
+        self._shrink_handle = None
+
+        deadline = time.monotonic() - self._idle_timeout
+        while (self._idle and self._size > self._min_size and
+                self._idle[0][1] <= deadline):
+            resource, _ = self._idle.popleft()
+            self._size -= 1
+            self._spawn(self._disconnect_resource(resource))
+
+        if self._idle and self._size > self._min_size:
+            # Check again when the oldest idle resource expires.
+            self._shrink_handle = self._loop.call_later(
+                self._idle[0][1] - deadline, self._shrink)
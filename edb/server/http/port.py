@@ -19,7 +19,7 @@
 
 from __future__ import annotations
 
-import asyncio
+import logging
 
 from edb.common import taskgroup
 
@@ -27,6 +27,11 @@ from edb.server import baseport
 from edb.server import cache
 from edb.server import defines
 
+from . import pool
+
+
+logger = logging.getLogger('edb.server')
+
 
 class BaseHttpPort(baseport.Port):
 
@@ -35,6 +40,11 @@ class BaseHttpPort(baseport.Port):
                  user: str,
                  concurrency: int,
                  protocol: str,
+                 min_concurrency: int = 1,
+                 idle_timeout: int = 300,
+                 queue_timeout: int = 30,
+                 result_cache_size: int = 0,
+                 result_cache_ttl: int = 60,
                  **kwargs):
 
         super().__init__(**kwargs)
@@ -45,11 +55,18 @@ class BaseHttpPort(baseport.Port):
             raise RuntimeError(
                 f'concurrency must be greater than 0 and '
                 f'less than {defines.HTTP_PORT_MAX_CONCURRENCY}')
-
-        self._compilers = asyncio.LifoQueue()
-        self._pgcons = asyncio.LifoQueue()
-        self._compilers_list = []
-        self._pgcons_list = []
+        if min_concurrency < 0 or min_concurrency > concurrency:
+            raise RuntimeError(
+                f'min_concurrency must be between 0 and concurrency '
+                f'({concurrency})')
+        if idle_timeout <= 0:
+            raise RuntimeError('idle_timeout must be greater than 0')
+        if queue_timeout <= 0:
+            raise RuntimeError('queue_timeout must be greater than 0')
+        if result_cache_size < 0:
+            raise RuntimeError('result_cache_size must not be negative')
+        if result_cache_ttl <= 0:
+            raise RuntimeError('result_cache_ttl must be greater than 0')
 
         self._nethost = nethost
         self._netport = netport
@@ -57,11 +74,41 @@ class BaseHttpPort(baseport.Port):
         self.database = database
         self.user = user
         self.concurrency = concurrency
+        self.min_concurrency = min_concurrency
+
+        self._compilers = pool.ResourcePool(
+            loop=self._loop,
+            name='compiler',
+            connect=self._new_compiler,
+            disconnect=self._close_compiler,
+            min_size=min_concurrency,
+            max_size=concurrency,
+            idle_timeout=idle_timeout,
+            queue_timeout=queue_timeout)
+
+        self._pgcons = pool.ResourcePool(
+            loop=self._loop,
+            name='backend connection',
+            connect=self._new_pgcon,
+            disconnect=self._close_pgcon,
+            min_size=min_concurrency,
+            max_size=concurrency,
+            idle_timeout=idle_timeout,
+            queue_timeout=queue_timeout)
 
         self._servers = []
         self._query_cache = cache.StatementsCache(
             maxsize=defines.HTTP_PORT_QUERY_CACHE_SIZE)
 
+        if result_cache_size:
+            self._result_cache = cache.ResultCache(
+                maxsize=result_cache_size,
+                ttl=result_cache_ttl,
+                max_entry_size=defines.HTTP_PORT_RESULT_CACHE_MAX_ENTRY_SIZE,
+                max_bytes=defines.HTTP_PORT_RESULT_CACHE_MAX_BYTES)
+        else:
+            self._result_cache = None
+
     @property
     def compilers(self):
         return self._compilers
@@ -77,6 +124,23 @@ class BaseHttpPort(baseport.Port):
     def get_dbver(self):
         return self._dbindex.get_dbver(self.database)
 
+    def get_data_version(self, read_types):
+        return self._dbindex.get_data_version(self.database, read_types)
+
+    def signal_dml(self, dml_types):
+        self._dbindex.signal_dml(self.database, dml_types)
+
+    def get_result_cache_stats(self):
+        if self._result_cache is None:
+            return None
+        return self._result_cache.get_stats()
+
+    def get_pool_stats(self):
+        return {
+            'compilers': self._compilers.get_stats(),
+            'pgcons': self._pgcons.get_stats(),
+        }
+
     def get_compiler_worker_cls(self):
         raise NotImplementedError
 
@@ -86,36 +150,42 @@ class BaseHttpPort(baseport.Port):
     def build_protocol(self):
         raise NotImplementedError
 
-    async def start(self):
-        compilers = []
-        pgcons = []
+    async def _new_compiler(self):
+        return await self.new_compiler(self.database, self.get_dbver())
 
-        await super().start()
+    async def _close_compiler(self, compiler):
+        await compiler.close()
 
-        async with taskgroup.TaskGroup() as g:
-            for _ in range(self.concurrency):
-                compilers.append(
-                    g.create_task(self.new_compiler(
-                        self.database, self.get_dbver())))
-                pgcons.append(
-                    g.create_task(self.get_server().new_pgcon(self.database)))
+    async def _new_pgcon(self):
+        return await self.get_server().new_pgcon(self.database)
 
-        for com_task in compilers:
-            self._compilers.put_nowait(com_task.result())
-            self._compilers_list.append(com_task.result())
+    async def _close_pgcon(self, pgcon):
+        pgcon.terminate()
 
-        for con_task in pgcons:
-            self._pgcons.put_nowait(con_task.result())
-            self._pgcons_list.append(con_task.result())
+    async def start(self):
+        await super().start()
+
+        async with taskgroup.TaskGroup() as g:
+            g.create_task(self._compilers.start())
+            g.create_task(self._pgcons.start())
 
         nethost = await self._fix_localhost(self._nethost, self._netport)
         srv = await self._loop.create_server(
             self.build_protocol,
-            host=nethost, port=self._netport)
+            host=nethost, port=self._netport,
+            reuse_port=self._reuse_port)
 
         self._servers.append(srv)
 
     async def stop(self):
+        logger.info(
+            'pool statistics of port %d: %r',
+            self._netport, self.get_pool_stats())
+        if self._result_cache is not None:
+            logger.info(
+                'result cache statistics of port %d: %r',
+                self._netport, self._result_cache.get_stats())
+
         try:
             async with taskgroup.TaskGroup() as g:
                 for srv in self._servers:
@@ -125,12 +195,7 @@ class BaseHttpPort(baseport.Port):
         finally:
             try:
                 async with taskgroup.TaskGroup() as g:
-                    for cmp in self._compilers_list:
-                        g.create_task(cmp.close())
-                    self._compilers_list.clear()
-
-                for pgcon in self._pgcons_list:
-                    pgcon.terminate()
-                self._pgcons_list.clear()
+                    g.create_task(self._compilers.close())
+                    g.create_task(self._pgcons.close())
             finally:
                 await super().stop()
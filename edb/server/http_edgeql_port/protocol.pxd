@@ -18,6 +18,7 @@
 
 
 from edb.server.http cimport http
+from edb.server.cache cimport result_cache
 from edb.server.cache cimport stmt_cache
 
 
@@ -25,3 +26,20 @@ cdef class Protocol(http.HttpProtocol):
     cdef:
         object server
         stmt_cache.StatementsCache query_cache
+        result_cache.ResultCache result_cache
+
+
+cdef class ResultStream:
+    cdef:
+        Protocol proto
+        http.HttpRequest request
+        http.HttpResponse response
+
+        list pending
+        ssize_t pending_size
+        ssize_t chunk_size
+        ssize_t nrows
+
+    cdef flush(self)
+    cdef finish(self)
+    cdef abort(self, bytes error)
@@ -29,16 +29,89 @@ from edb.common import debug
 from edb.common import markup
 
 from edb.server import compiler
+from edb.server import defines
 from edb.server.http import http
 from edb.server.http cimport http
 
 
+cdef class ResultStream:
+
+    # Serializes the rows of a JSON_ELEMENTS query into the
+    # '{"data": [...]}' response document.  Rows are buffered until
+    # they add up to HTTP_PORT_STREAM_CHUNK_SIZE bytes, so small
+    # results are still sent as one regular response, and larger ones
+    # are streamed with chunked transfer encoding as they arrive.
+
+    def __init__(self, Protocol proto, http.HttpRequest request,
+                 http.HttpResponse response):
+        self.proto = proto
+        self.request = request
+        self.response = response
+
+        self.pending = []
+        self.pending_size = 0
+        self.nrows = 0
+
+        if request.version == b'1.1':
+            self.chunk_size = defines.HTTP_PORT_STREAM_CHUNK_SIZE
+        else:
+            # Chunked transfer encoding is not available in HTTP/1.0,
+            # buffer the whole result instead.
+            self.chunk_size = -1
+
+    def on_row(self, bytes row):
+        if self.nrows:
+            self.pending.append(b',')
+        else:
+            self.pending.append(b'{"data":[')
+        self.pending.append(row)
+        self.pending_size += len(row) + 1
+        self.nrows += 1
+
+        if self.chunk_size > 0 and self.pending_size >= self.chunk_size:
+            return self.flush()
+
+    cdef flush(self):
+        if not self.response.chunked:
+            self.proto.start_chunked(self.request, self.response)
+
+        pending = self.pending
+        self.pending = []
+        self.pending_size = 0
+        self.proto.write_chunk(pending)
+
+        return self.proto.get_drain_waiter()
+
+    cdef finish(self):
+        if not self.nrows:
+            self.response.body = b'{"data":[]}'
+            return
+
+        self.pending.append(b']}')
+        if self.response.chunked:
+            self.proto.write_chunk(self.pending)
+            self.proto.end_chunked()
+        else:
+            self.response.body = b''.join(self.pending)
+        self.pending = []
+
+    cdef abort(self, bytes error):
+        # An error occurred after a part of the result has already
+        # been sent; complete the document with an "error" key.
+        assert self.response.chunked
+        self.pending.extend((b'],"error":', error, b'}'))
+        self.proto.write_chunk(self.pending)
+        self.proto.end_chunked()
+        self.pending = []
+
+
 cdef class Protocol(http.HttpProtocol):
 
-    def __init__(self, loop, server, query_cache):
+    def __init__(self, loop, server, query_cache, result_cache):
         http.HttpProtocol.__init__(self, loop)
         self.server = server
         self.query_cache = query_cache
+        self.result_cache = result_cache
 
     async def handle_request(self, http.HttpRequest request,
                              http.HttpResponse response):
@@ -103,8 +176,9 @@ cdef class Protocol(http.HttpProtocol):
 
         response.status = http.HTTPStatus.OK
         response.content_type = b'application/json'
+        stream = ResultStream(self, request, response)
         try:
-            result = await self.execute(query.encode(), variables)
+            await self.execute(query.encode(), variables, stream)
         except Exception as ex:
             if debug.flags.server:
                 markup.dump(ex)
@@ -120,12 +194,15 @@ cdef class Protocol(http.HttpProtocol):
                 'code': ex_type.get_code(),
             }
 
-            response.body = json.dumps({'error': err_dct}).encode()
+            if response.chunked:
+                stream.abort(json.dumps(err_dct).encode())
+            else:
+                response.body = json.dumps({'error': err_dct}).encode()
         else:
-            response.body = b'{"data":' + result + b'}'
+            response.use_etag = True
 
     async def compile(self, dbver, bytes query):
-        comp = await self.server.compilers.get()
+        comp = await self.server.compilers.acquire()
         try:
             units = await comp.call(
                 'compile_eql',
@@ -139,12 +216,13 @@ cdef class Protocol(http.HttpProtocol):
                 compiler.CompileStatementMode.SINGLE,
                 compiler.Capability.QUERY,
                 True,  # json parameters
+                True,  # one JSON element per row
             )
             return units[0]
         finally:
-            self.server.compilers.put_nowait(comp)
+            self.server.compilers.release(comp)
 
-    async def execute(self, bytes query, variables):
+    async def execute(self, bytes query, variables, ResultStream stream):
         dbver = self.server.get_dbver()
         cache_key = (query, dbver)
         use_prep_stmt = False
@@ -168,16 +246,32 @@ cdef class Protocol(http.HttpProtocol):
                 else:
                     args.append(variables[name])
 
-        pgcon = await self.server.pgcons.get()
+        result_key = None
+        if (self.result_cache is not None and
+                query_unit.read_types is not None):
+            result_key = (query_unit.sql_hash, json.dumps(args))
+            data_version = self.server.get_data_version(
+                query_unit.read_types)
+            data = self.result_cache.lookup(result_key, data_version)
+            if data is not None:
+                stream.response.body = data
+                return
+
+        pgcon = await self.server.pgcons.acquire()
         try:
-            data = await pgcon.parse_execute_json(
+            await pgcon.parse_execute_json_stream(
                 query_unit.sql[0], query_unit.sql_hash, query_unit.dbver,
-                use_prep_stmt, args)
+                use_prep_stmt, args, stream.on_row)
         finally:
-            self.server.pgcons.put_nowait(pgcon)
-
-        if data is None:
-            raise errors.InternalServerError(
-                f'no data received for a JSON query {query_unit.sql[0]!r}')
-
-        return data
+            self.server.pgcons.release(
+                pgcon, discard=not pgcon.is_connected())
+
+        stream.finish()
+
+        if result_key is not None:
+            # Streamed results are only cached if they fit in one chunk.
+            if not stream.response.chunked:
+                self.result_cache.store(
+                    result_key, data_version, stream.response.body)
+        elif query_unit.dml_types is None or query_unit.dml_types:
+            self.server.signal_dml(query_unit.dml_types)
@@ -30,6 +30,7 @@ from edb.edgeql import compiler as ql_compiler
 from edb.edgeql import qltypes
 from edb.pgsql import compiler as pg_compiler
 from edb.server import compiler
+from edb.server.compiler import datadeps
 
 
 @dataclasses.dataclass(frozen=True)
@@ -47,12 +48,17 @@ class CompiledOperation:
     dbver: int
     cacheable: bool
     cache_deps_vars: Dict
+    cache_deps_defaults: Dict
     variables: Dict
+    read_types: Optional[Tuple[str, ...]]
+    dml_types: Optional[FrozenSet[str]]
 
 
 class Compiler(compiler.BaseCompiler):
 
     def _wrap_schema(self, dbver, schema) -> CompilerDatabaseState:
+        # GQLCoreSchema is cheap to create: the GraphQL types are only
+        # built on first use, so idle workers never pay for them.
         gqlcore = graphql.GQLCoreSchema(schema)
         return CompilerDatabaseState(
             dbver=dbver,
@@ -104,5 +110,8 @@ class Compiler(compiler.BaseCompiler):
             dbver=dbver,
             cacheable=op.cacheable,
             cache_deps_vars=op.cache_deps_vars,
+            cache_deps_defaults=op.cache_deps_defaults,
             variables=op.variables_desc,
+            read_types=datadeps.get_read_types(ir),
+            dml_types=datadeps.get_dml_types(ir),
         )
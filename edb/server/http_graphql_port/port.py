@@ -19,6 +19,8 @@
 
 from __future__ import annotations
 
+from edb.server import cache
+from edb.server import defines
 from edb.server import http
 
 from . import compiler
@@ -27,8 +29,17 @@ from . import protocol
 
 class HttpGraphQLPort(http.BaseHttpPort):
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Maps sha256 hashes of persisted queries to their text;
+        # compiled operations are then looked up in the query cache.
+        self._persisted_queries = cache.StatementsCache(
+            maxsize=defines.HTTP_PORT_GRAPHQL_PERSISTED_QUERIES_SIZE)
+
     def build_protocol(self):
-        return protocol.Protocol(self._loop, self, self._query_cache)
+        return protocol.Protocol(
+            self._loop, self, self._query_cache, self._persisted_queries,
+            self._result_cache)
 
     def get_compiler_worker_cls(self):
         return compiler.Compiler
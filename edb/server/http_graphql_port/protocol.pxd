@@ -18,10 +18,24 @@
 
 
 from edb.server.http cimport http
+from edb.server.cache cimport result_cache
 from edb.server.cache cimport stmt_cache
 
 
+cdef class OperationVariants:
+    cdef:
+        tuple deps_vars
+        dict defaults
+        stmt_cache.StatementsCache variants
+
+    cdef get_key(self, variables)
+
+
 cdef class Protocol(http.HttpProtocol):
     cdef:
         object server
         stmt_cache.StatementsCache query_cache
+        stmt_cache.StatementsCache persisted_queries
+        result_cache.ResultCache result_cache
+
+    cdef _cleanup_cache(self, stmt_cache.StatementsCache cache)
@@ -17,6 +17,8 @@
 #
 
 
+import asyncio
+import hashlib
 import json
 import urllib.parse
 
@@ -26,7 +28,10 @@ from edb.server.pgcon import errors as pgerrors
 
 from edb.common import debug
 from edb.common import markup
+from edb.common import taskgroup
 
+from edb.server import defines
+from edb.server.cache cimport stmt_cache
 from edb.server.http import http
 from edb.server.http cimport http
 
@@ -34,12 +39,59 @@ from . import explore
 from . import compiler
 
 
+cdef _get_var_value(op, variables, name):
+    if variables is not None and name in variables:
+        return variables[name]
+    else:
+        # Not `op.variables`: those are the values sent by the request
+        # that compiled `op`, not the declared defaults.
+        return op.cache_deps_defaults.get(name)
+
+
+cdef _deps_vars_match(op, variables):
+    for name, value in op.cache_deps_vars.items():
+        if _get_var_value(op, variables, name) != value:
+            return False
+    return True
+
+
+cdef class OperationVariants:
+
+    # Compiled variants of a GraphQL operation whose SQL depends on
+    # the values of some of its variables (e.g. `@include(if: $foo)`).
+    # Variants are keyed by the values of those variables and are
+    # kept in a bounded LRU cache.
+
+    def __init__(self, op):
+        self.deps_vars = tuple(sorted(op.cache_deps_vars))
+        self.defaults = op.cache_deps_defaults
+        self.variants = stmt_cache.StatementsCache(
+            maxsize=defines.HTTP_PORT_GRAPHQL_VARIANTS_CACHE_SIZE)
+
+    cdef get_key(self, variables):
+        key = []
+        for name in self.deps_vars:
+            if variables is not None and name in variables:
+                value = variables[name]
+            else:
+                value = self.defaults.get(name)
+            key.append(json.dumps(value, sort_keys=True))
+        return tuple(key)
+
+
+class PersistedQueryNotFoundError(Exception):
+    pass
+
+
 cdef class Protocol(http.HttpProtocol):
 
-    def __init__(self, loop, server, query_cache):
+    def __init__(self, loop, server, query_cache, persisted_queries,
+                 result_cache):
         http.HttpProtocol.__init__(self, loop)
         self.server = server
         self.query_cache = query_cache
+        self.persisted_queries = persisted_queries
+        self.result_cache = result_cache
 
     async def handle_request(self, http.HttpRequest request,
                              http.HttpResponse response):
@@ -48,6 +100,7 @@ cdef class Protocol(http.HttpProtocol):
         if url_path == b'explore' and request.method == b'GET':
             response.body = explore.EXPLORE_HTML
             response.content_type = b'text/html'
+            response.use_etag = True
             return
 
         if url_path != b'':
@@ -56,27 +109,45 @@ cdef class Protocol(http.HttpProtocol):
             response.close_connection = True
             return
 
-        operation_name = None
-        variables = None
-        query = None
+        operations = None
+        is_batch = False
 
         try:
             if request.method == b'POST':
                 if request.content_type and b'json' in request.content_type:
                     body = json.loads(request.body)
-                    if not isinstance(body, dict):
+                    if isinstance(body, list):
+                        if not body:
+                            raise TypeError(
+                                'batched GraphQL request must contain '
+                                'at least one operation')
+                        max_batch = defines.HTTP_PORT_GRAPHQL_MAX_BATCH_SIZE
+                        if len(body) > max_batch:
+                            raise TypeError(
+                                f'batched GraphQL request must contain '
+                                f'at most {max_batch} operations')
+                        is_batch = True
+                        operations = [
+                            self._parse_operation(item) for item in body]
+                    elif isinstance(body, dict):
+                        operations = [self._parse_operation(body)]
+                    else:
                         raise TypeError(
-                            'the body of the request must be a JSON object')
-                    query = body.get('query')
-                    operation_name = body.get('operationName')
-                    variables = body.get('variables')
+                            'the body of the request must be a JSON object '
+                            'or an array of JSON objects')
                 elif request.content_type == 'application/graphql':
                     query = request.body.decode('utf-8')
+                    operations = [(query, None, None, None)]
                 else:
                     raise TypeError(
                         'unable to interpret GraphQL POST request')
 
             elif request.method == b'GET':
+                query = None
+                operation_name = None
+                variables = None
+                extensions = None
+
                 if request.url.query:
                     url_query = request.url.query.decode('ascii')
                     qs = urllib.parse.parse_qs(url_query)
@@ -97,18 +168,19 @@ cdef class Protocol(http.HttpProtocol):
                             raise TypeError(
                                 '"variables" must be a JSON object')
 
-            else:
-                raise TypeError('expected a GET or a POST request')
-
-            if not query:
-                raise TypeError('invalid GraphQL request: query is missing')
+                    extensions = qs.get('extensions')
+                    if extensions is not None:
+                        try:
+                            extensions = json.loads(extensions[0])
+                        except Exception:
+                            raise TypeError(
+                                '"extensions" must be a JSON object')
 
-            if (operation_name is not None and
-                    not isinstance(operation_name, str)):
-                raise TypeError('operationName must be a string')
+                operations = [self._validate_operation(
+                    query, operation_name, variables, extensions)]
 
-            if variables is not None and not isinstance(variables, dict):
-                raise TypeError('"variables" must be a JSON object')
+            else:
+                raise TypeError('expected a GET or a POST request')
 
         except Exception as ex:
             if debug.flags.server:
@@ -121,8 +193,96 @@ cdef class Protocol(http.HttpProtocol):
 
         response.status = http.HTTPStatus.OK
         response.content_type = b'application/json'
+        response.use_etag = True
+
+        if is_batch:
+            # Operations in a batch are independent of each other,
+            # so run a few of them at a time over the pool of connections.
+            sem = asyncio.Semaphore(max(1, min(
+                defines.HTTP_PORT_GRAPHQL_BATCH_CONCURRENCY,
+                self.server.concurrency // 2)))
+            async with taskgroup.TaskGroup() as g:
+                tasks = [
+                    g.create_task(self._execute_batched(sem, operation))
+                    for operation in operations
+                ]
+            response.body = (
+                b'[' + b','.join(t.result() for t in tasks) + b']')
+        else:
+            response.body = await self.execute_operation(*operations[0])
+
+    async def _execute_batched(self, sem, operation):
+        async with sem:
+            return await self.execute_operation(*operation)
+
+    def _parse_operation(self, body):
+        if not isinstance(body, dict):
+            raise TypeError(
+                'each GraphQL operation must be a JSON object')
+
+        return self._validate_operation(
+            body.get('query'),
+            body.get('operationName'),
+            body.get('variables'),
+            body.get('extensions'))
+
+    def _validate_operation(self, query, operation_name, variables,
+                            extensions):
+        query_hash = None
+
+        if extensions is not None:
+            if not isinstance(extensions, dict):
+                raise TypeError('"extensions" must be a JSON object')
+
+            persisted = extensions.get('persistedQuery')
+            if persisted is not None:
+                if (not isinstance(persisted, dict) or
+                        persisted.get('version') != 1):
+                    raise TypeError('unsupported persisted query version')
+
+                query_hash = persisted.get('sha256Hash')
+                if not isinstance(query_hash, str):
+                    raise TypeError(
+                        'persisted query hash must be a string')
+
+        if not query and query_hash is None:
+            raise TypeError('invalid GraphQL request: query is missing')
+
+        if query and not isinstance(query, str):
+            raise TypeError('query must be a string')
+
+        if (operation_name is not None and
+                not isinstance(operation_name, str)):
+            raise TypeError('operationName must be a string')
+
+        if variables is not None and not isinstance(variables, dict):
+            raise TypeError('"variables" must be a JSON object')
+
+        if query and query_hash is not None:
+            actual_hash = hashlib.sha256(query.encode()).hexdigest()
+            if actual_hash != query_hash:
+                raise TypeError(
+                    'persisted query hash does not match the query')
+            self.persisted_queries[query_hash] = query
+            self._cleanup_cache(self.persisted_queries)
+
+        return (query, operation_name, variables, query_hash)
+
+    async def execute_operation(self, query, operation_name, variables,
+                                query_hash):
         try:
+            if not query:
+                query = self.persisted_queries.get(query_hash, None)
+                if query is None:
+                    raise PersistedQueryNotFoundError()
+
             result = await self.execute(query, operation_name, variables)
+        except PersistedQueryNotFoundError:
+            # The client is expected to retry with the full query text.
+            return json.dumps({'errors': [{
+                'message': 'PersistedQueryNotFound',
+                'extensions': {'code': 'PERSISTED_QUERY_NOT_FOUND'},
+            }]}).encode()
         except Exception as ex:
             if debug.flags.server:
                 markup.dump(ex)
@@ -142,12 +302,16 @@ cdef class Protocol(http.HttpProtocol):
                     hasattr(ex, 'col')):
                 err_dct['locations'] = [{'line': ex.line, 'column': ex.col}]
 
-            response.body = json.dumps({'errors': [err_dct]}).encode()
+            return json.dumps({'errors': [err_dct]}).encode()
         else:
-            response.body = b'{"data":' + result + b'}'
+            return b'{"data":' + result + b'}'
+
+    cdef _cleanup_cache(self, stmt_cache.StatementsCache cache):
+        while cache.needs_cleanup():
+            cache.cleanup_one()
 
     async def compile(self, dbver, query, operation_name, variables):
-        compiler = await self.server.compilers.get()
+        compiler = await self.server.compilers.acquire()
         try:
             return await compiler.call(
                 'compile_graphql',
@@ -156,28 +320,46 @@ cdef class Protocol(http.HttpProtocol):
                 operation_name,
                 variables)
         finally:
-            self.server.compilers.put_nowait(compiler)
+            self.server.compilers.release(compiler)
 
     async def execute(self, query, operation_name, variables):
         dbver = self.server.get_dbver()
+        cdef OperationVariants variants
+
         cache_key = (query, operation_name, dbver)
         use_prep_stmt = False
 
-        op: compiler.CompiledOperation = self.query_cache.get(
-            cache_key, None)
+        entry = self.query_cache.get(cache_key, None)
 
-        if op is None:
+        if entry is None:
             op = await self.compile(
                 dbver, query, operation_name, variables)
-            self.query_cache[cache_key] = op
-        else:
             if op.cache_deps_vars:
-                op = await self.compile(
-                    dbver, query, operation_name, variables)
+                variants = OperationVariants(op)
+                variants.variants[variants.get_key(variables)] = op
+                entry = variants
             else:
-                # This is at least the second time this query is used
-                # and it's safe to cache.
+                entry = op
+            self.query_cache[cache_key] = entry
+            self._cleanup_cache(self.query_cache)
+        elif isinstance(entry, OperationVariants):
+            # The compiled SQL depends on the values of some variables,
+            # so look for a variant compiled with the same values.
+            variants = <OperationVariants>entry
+            variants_key = variants.get_key(variables)
+            op = variants.variants.get(variants_key, None)
+            if op is not None and _deps_vars_match(op, variables):
                 use_prep_stmt = True
+            else:
+                op = await self.compile(
+                    dbver, query, operation_name, variables)
+                variants.variants[variants_key] = op
+                self._cleanup_cache(variants.variants)
+        else:
+            # This is at least the second time this query is used
+            # and it's safe to cache.
+            op = entry
+            use_prep_stmt = True
 
         args = []
         if op.sql_args:
@@ -191,16 +373,30 @@ cdef class Protocol(http.HttpProtocol):
                 else:
                     args.append(variables[name])
 
-        pgcon = await self.server.pgcons.get()
+        result_key = None
+        if self.result_cache is not None and op.read_types is not None:
+            result_key = (op.sql_hash, json.dumps(args))
+            data_version = self.server.get_data_version(op.read_types)
+            data = self.result_cache.lookup(result_key, data_version)
+            if data is not None:
+                return data
+
+        pgcon = await self.server.pgcons.acquire()
         try:
             data = await pgcon.parse_execute_json(
                 op.sql, op.sql_hash, op.dbver,
                 use_prep_stmt, args)
         finally:
-            self.server.pgcons.put_nowait(pgcon)
+            self.server.pgcons.release(
+                pgcon, discard=not pgcon.is_connected())
 
         if data is None:
             raise errors.InternalServerError(
                 f'no data received for a JSON query {op.sql!r}')
 
+        if result_key is not None:
+            self.result_cache.store(result_key, data_version, data)
+        elif op.dml_types is None or op.dml_types:
+            self.server.signal_dml(op.dml_types)
+
         return data
@@ -0,0 +1,299 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+# Multi-process server front-end.
+#
+# With --io-workers=N the server forks N I/O worker processes, each
+# running a complete Server instance with its own event loop, backend
+# connections and compiler pools.  All workers bind the same TCP ports
+# with SO_REUSEPORT, so the kernel spreads incoming connections across
+# them.  The supervising (parent) process runs a control hub on a UNIX
+# socket: every worker connects to it and broadcasts events that other
+# workers must react to (DDL that advances a database version, data
+# modifications, system config changes).  The hub relays each message
+# to all other workers.
+
+
+from __future__ import annotations
+from typing import *  # NoQA
+
+import asyncio
+import logging
+import os
+import pickle
+import signal
+import socket
+import struct
+import sys
+
+from .procpool import amsg
+
+
+logger = logging.getLogger('edb.server')
+
+_len_packer = struct.Struct('!I').pack
+
+# Worker -> hub message announcing that the worker is serving.
+MSG_READY = 'ready'
+# A DDL command was committed in a database: (dbname,).
+MSG_DDL = 'ddl'
+# Data was modified in a database: (dbname, dml_types).
+MSG_DML = 'dml'
+# A system config operation was applied: (config.Operation,).
+MSG_SYSTEM_CONFIG = 'sysconfig'
+
+
+class ControlProtocol(amsg.BaseFramedProtocol):
+
+    def __init__(self, *, loop, on_message, on_lost, on_made=None):
+        super().__init__(loop=loop)
+        self._on_message = on_message
+        self._on_lost = on_lost
+        self._on_made = on_made
+
+    def send(self, payload: bytes):
+        if self._transport is None or self._closed:
+            return
+        self._transport.writelines((_len_packer(len(payload)), payload))
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+
+    def connection_made(self, tr):
+        super().connection_made(tr)
+        if self._on_made is not None:
+            self._on_made(self)
+
+    def process_message(self, msg):
+        self._on_message(self, msg)
+
+    def connection_lost(self, exc):
+        super().connection_lost(exc)
+        self._on_lost(self, exc)
+
+
+class ControlHub:
+
+    def __init__(self, *, loop, nworkers: int, on_ready):
+        self._loop = loop
+        self._nworkers = nworkers
+        self._nready = 0
+        self._on_ready = on_ready
+        self._clients = set()
+        self._srv = None
+
+    def _proto_factory(self):
+        return ControlProtocol(
+            loop=self._loop,
+            on_message=self._on_message,
+            on_lost=self._on_lost,
+            on_made=self._clients.add)
+
+    def _on_message(self, proto, msg: bytes):
+        kind, _ = pickle.loads(msg)
+        if kind == MSG_READY:
+            self._nready += 1
+            if self._nready == self._nworkers:
+                self._on_ready()
+            return
+
+        for client in self._clients:
+            if client is not proto:
+                client.send(msg)
+
+    def _on_lost(self, proto, exc):
+        self._clients.discard(proto)
+
+    async def start(self, sock: socket.socket):
+        self._srv = await self._loop.create_unix_server(
+            self._proto_factory, sock=sock)
+
+    async def stop(self):
+        self._srv.close()
+        await self._srv.wait_closed()
+        for client in list(self._clients):
+            client.close()
+        self._clients.clear()
+
+
+class ControlChannel:
+
+    def __init__(self, *, loop, path: str,
+                 on_message: Callable[[str, tuple], None]):
+        self._loop = loop
+        self._path = path
+        self._on_message_cb = on_message
+        self._protocol = None
+        self._closing = False
+
+    async def connect(self):
+        _, self._protocol = await self._loop.create_unix_connection(
+            lambda: ControlProtocol(
+                loop=self._loop,
+                on_message=self._on_message,
+                on_lost=self._on_lost),
+            path=self._path)
+
+    def broadcast(self, kind: str, *args):
+        self._protocol.send(pickle.dumps((kind, args)))
+
+    def close(self):
+        self._closing = True
+        if self._protocol is not None:
+            self._protocol.close()
+            self._protocol = None
+
+    def _on_message(self, proto, msg: bytes):
+        kind, args = pickle.loads(msg)
+        self._on_message_cb(kind, args)
+
+    def _on_lost(self, proto, exc):
+        if self._closing:
+            return
+        # Without the hub caches can no longer be kept coherent with
+        # other workers, so shut this worker down.
+        logger.critical('lost connection to the I/O worker supervisor')
+        os.kill(os.getpid(), signal.SIGTERM)
+
+
+def _worker_main(worker_id: int, run_worker: Callable[[int], None]):
+    code = 0
+    try:
+        run_worker(worker_id)
+    except SystemExit as ex:
+        if isinstance(ex.code, int):
+            code = ex.code
+        elif ex.code is not None:
+            code = 1
+    except KeyboardInterrupt:
+        pass
+    except BaseException:
+        logger.exception('I/O worker %d failed', worker_id)
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # Skip the parent's cleanup handlers (temporary runstate
+        # directories, the Postgres cluster) inherited via fork().
+        os._exit(code)
+
+
+def _signal_workers(pids: Iterable[int], signo: int):
+    for pid in pids:
+        try:
+            os.kill(pid, signo)
+        except ProcessLookupError:
+            pass
+
+
+async def _supervise(loop, sock: socket.socket, pids: Dict[int, int],
+                     on_ready) -> bool:
+    hub = ControlHub(loop=loop, nworkers=len(pids), on_ready=on_ready)
+    await hub.start(sock)
+
+    terminating = False
+
+    def terminate():
+        nonlocal terminating
+        terminating = True
+        _signal_workers(pids, signal.SIGTERM)
+
+    loop.add_signal_handler(signal.SIGTERM, terminate)
+    loop.add_signal_handler(signal.SIGINT, terminate)
+
+    waiters = {
+        loop.run_in_executor(None, os.waitpid, pid, 0): worker_id
+        for pid, worker_id in pids.items()
+    }
+
+    failed = False
+    try:
+        while waiters:
+            done, _ = await asyncio.wait(
+                waiters, return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                worker_id = waiters.pop(fut)
+                pid, status = fut.result()
+                pids.pop(pid, None)
+                code = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -1
+                if code:
+                    failed = True
+                    logger.error(
+                        'I/O worker %d (pid %d) exited with status %d',
+                        worker_id, pid, code)
+                else:
+                    logger.info(
+                        'I/O worker %d (pid %d) exited', worker_id, pid)
+
+            if not terminating:
+                # Workers are not restarted: once one of them is gone
+                # the server is brought down as a whole.
+                terminate()
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+        loop.remove_signal_handler(signal.SIGINT)
+        await hub.stop()
+
+    return not failed
+
+
+def run_supervisor(*, nworkers: int, control_path: str,
+                   run_worker: Callable[[int], None],
+                   on_ready: Callable[[], None]) -> bool:
+    """Fork *nworkers* I/O workers and supervise them.
+
+    *run_worker* is called in every child process with the worker id
+    and is expected to run the server until it is stopped.  Returns
+    False if any of the workers exited with an error.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    pids: Dict[int, int] = {}
+    try:
+        sock.bind(control_path)
+        sock.listen(nworkers)
+        sock.setblocking(False)
+
+        for worker_id in range(nworkers):
+            pid = os.fork()
+            if pid == 0:
+                sock.close()
+                _worker_main(worker_id, run_worker)
+            pids[pid] = worker_id
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            return loop.run_until_complete(
+                _supervise(loop, sock, pids, on_ready))
+        finally:
+            loop.close()
+            asyncio.set_event_loop(None)
+
+    except BaseException:
+        _signal_workers(pids, signal.SIGTERM)
+        for pid in pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        raise
+
+    finally:
+        sock.close()
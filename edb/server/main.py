@@ -164,10 +164,15 @@ def _sd_notify(message):
 
 
 def _init_parsers():
-    # Initialize all parsers, rebuilding grammars if
-    # necessary.  Do it earlier than later so that we don't
-    # end up in a situation where all our compiler processes
-    # are building parsers in parallel.
+    # In dev mode grammars might be stale, so initialize all parsers,
+    # rebuilding grammars if necessary.  Do it earlier than later so
+    # that we don't end up in a situation where all our compiler
+    # processes are building parsers in parallel.  Otherwise the
+    # grammar tables are prebuilt by setup.py and every process
+    # loads only the grammars it actually uses, on first use.
+
+    if not devmode.is_in_dev_mode():
+        return
 
     from edb.edgeql import parser as ql_parser
 
@@ -175,7 +180,9 @@ def _init_parsers():
 
 
 def _run_server(cluster, args: ServerConfig,
-                runstate_dir, internal_runstate_dir):
+                runstate_dir, internal_runstate_dir, *,
+                io_worker_id: Optional[int] = None,
+                control_path: Optional[str] = None):
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     # Import here to make sure that most of imports happen
@@ -194,6 +201,8 @@ def _run_server(cluster, args: ServerConfig,
         netport=args.port,
         auto_shutdown=args.auto_shutdown,
         echo_runtime_info=args.echo_runtime_info,
+        io_worker_id=io_worker_id,
+        control_path=control_path,
     )
 
     loop.run_until_complete(ss.init())
@@ -206,8 +215,10 @@ def _run_server(cluster, args: ServerConfig,
 
     loop.add_signal_handler(signal.SIGTERM, terminate_server, ss, loop)
 
-    # Notify systemd that we've started up.
-    _sd_notify('READY=1')
+    if io_worker_id is None:
+        # Notify systemd that we've started up.  I/O workers report
+        # readiness to the supervisor process instead.
+        _sd_notify('READY=1')
 
     try:
         loop.run_forever()
@@ -216,7 +227,45 @@ def _run_server(cluster, args: ServerConfig,
             logger.info('Shutting down.')
             loop.run_until_complete(ss.stop())
         finally:
-            _sd_notify('STOPPING=1')
+            if io_worker_id is None:
+                _sd_notify('STOPPING=1')
+
+
+def _run_io_workers(cluster, args: ServerConfig,
+                    runstate_dir, internal_runstate_dir):
+    from . import ioworkers
+
+    control_path = os.path.join(
+        internal_runstate_dir, defines.EDGEDB_IO_CONTROL_SOCKET)
+
+    def run_worker(worker_id):
+        setproctitle.setproctitle(
+            f'{setproctitle.getproctitle()} [io-worker-{worker_id}]')
+
+        # Every worker runs its own compiler pools, whose sockets
+        # are named after the port, so keep them apart.
+        worker_runstate_dir = os.path.join(
+            internal_runstate_dir, f'io-worker-{worker_id}')
+        os.mkdir(worker_runstate_dir)
+
+        _run_server(
+            cluster, args, runstate_dir, worker_runstate_dir,
+            io_worker_id=worker_id, control_path=control_path)
+
+    logger.info('Starting %d I/O worker processes.', args.io_workers)
+
+    try:
+        ok = ioworkers.run_supervisor(
+            nworkers=args.io_workers,
+            control_path=control_path,
+            run_worker=run_worker,
+            on_ready=lambda: _sd_notify('READY=1'),
+        )
+    finally:
+        _sd_notify('STOPPING=1')
+
+    if not ok:
+        abort('one or more I/O worker processes have failed')
 
 
 def run_server(args: ServerConfig):
@@ -301,7 +350,12 @@ def run_server(args: ServerConfig):
                         ),
                     )
 
-                _run_server(cluster, args, runstate_dir, internal_runstate_dir)
+                if args.io_workers > 1:
+                    _run_io_workers(
+                        cluster, args, runstate_dir, internal_runstate_dir)
+                else:
+                    _run_server(
+                        cluster, args, runstate_dir, internal_runstate_dir)
 
     except BaseException:
         if pg_cluster_init_by_us and not _server_initialized:
@@ -398,6 +452,7 @@ class ServerConfig(typing.NamedTuple):
     echo_runtime_info: bool
     temp_dir: bool
     auto_shutdown: bool
+    io_workers: int
 
 
 def bump_rlimit_nofile() -> None:
@@ -491,6 +546,11 @@ _server_options = [
         '--auto-shutdown', type=bool, default=False, is_flag=True,
         help='shutdown the server after the last management ' +
              'connection is closed'),
+    click.option(
+        '--io-workers', type=int, default=1,
+        help='number of front-end processes serving client connections; '
+             'when greater than 1 the processes share the listening '
+             'TCP sockets via SO_REUSEPORT'),
 ]
 
 
@@ -535,6 +595,14 @@ def server_main(*, insecure=False, **kwargs):
         elif kwargs['postgres_dsn']:
             abort('The -D and --postgres-dsn options are mutually exclusive.')
 
+    if kwargs['io_workers'] < 1:
+        abort('--io-workers must be greater than 0')
+    elif kwargs['io_workers'] > 1:
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            abort('--io-workers requires SO_REUSEPORT support')
+        if kwargs['auto_shutdown']:
+            abort('--io-workers is incompatible with --auto-shutdown')
+
     kwargs['insecure'] = insecure
 
     if kwargs['background']:
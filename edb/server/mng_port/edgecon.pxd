@@ -29,6 +29,7 @@ from edb.server.pgproto.pgproto cimport (
 )
 
 from edb.server.dbview cimport dbview
+from edb.server.pgcon cimport pgcon
 
 from edb.server.pgproto.debug cimport PG_DEBUG
 
@@ -98,7 +99,8 @@ cdef class EdgeConnection:
 
     cdef pgcon_last_sync_status(self)
 
-    cdef WriteBuffer recode_bind_args(self, bytes bind_args, dict array_tids)
+    cdef pgcon.BindData recode_bind_args(
+        self, bytes bind_args, dict array_tids)
 
     cdef WriteBuffer make_describe_msg(self, query_unit)
     cdef WriteBuffer make_command_complete_msg(self, query_unit)
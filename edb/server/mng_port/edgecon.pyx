@@ -43,8 +43,6 @@ from edb.server.pgproto.pgproto cimport (
     FRBuffer,
     frb_init,
     frb_read,
-    frb_read_all,
-    frb_get_len,
 )
 from edb.server.pgproto.pgproto import UUID as pg_UUID
 
@@ -1500,53 +1498,59 @@ cdef class EdgeConnection:
             raise errors.BinaryProtocolError(
                 f'unexpected message type {chr(mtype)!r}')
 
-    cdef WriteBuffer recode_bind_args(self, bytes bind_args, dict array_tids):
+    cdef pgcon.BindData recode_bind_args(
+            self, bytes bind_args, dict array_tids):
         cdef:
             FRBuffer in_buf
-            WriteBuffer out_buf = WriteBuffer.new()
+            pgcon.BindData out = pgcon.BindData()
             int32_t argsnum
             ssize_t in_len
             ssize_t i
+            const char *data_start
             const char *data
+            ssize_t span_start
+            ssize_t tid_pos
             object array_tid
 
         assert cpython.PyBytes_CheckExact(bind_args)
+        data_start = cpython.PyBytes_AS_STRING(bind_args)
         frb_init(
             &in_buf,
-            cpython.PyBytes_AS_STRING(bind_args),
+            data_start,
             cpython.Py_SIZE(bind_args))
 
         # all parameters are in binary
-        out_buf.write_int32(0x00010001)
+        out.write_int32(0x00010001)
 
         # number of elements in the tuple
         argsnum = hton.unpack_int32(frb_read(&in_buf, 4))
 
-        out_buf.write_int16(<int16_t>argsnum)
+        out.write_int16(<int16_t>argsnum)
+
+        # The arguments are forwarded as is (without copying large
+        # values), except for the element OIDs of array parameters.
+        span_start = 4
 
         if array_tids:
             # we have array parameters, ensure all of them
             # have correct element OIDs as per Postgres' expectations.
             for i in range(argsnum):
                 in_len = hton.unpack_int32(frb_read(&in_buf, 4))
-                out_buf.write_int32(in_len)
                 if in_len > 0:
                     data = frb_read(&in_buf, in_len)
                     array_tid = array_tids.get(i)
                     if array_tid is not None:
                         # ndimensions + flags
-                        out_buf.write_cstr(data, 8)
-                        out_buf.write_int32(<int32_t>array_tid)
-                        out_buf.write_cstr(&data[12], in_len - 12)
-                    else:
-                        out_buf.write_cstr(data, in_len)
-        else:
-            in_len = frb_get_len(&in_buf)
-            out_buf.write_cstr(frb_read_all(&in_buf), in_len)
+                        tid_pos = data - data_start + 8
+                        out.write_data(bind_args, span_start, tid_pos)
+                        out.write_int32(<int32_t>array_tid)
+                        span_start = tid_pos + 4
+
+        out.write_data(bind_args, span_start, cpython.Py_SIZE(bind_args))
 
         # All columns are in binary format
-        out_buf.write_int32(0x00010001)
-        return out_buf
+        out.write_int32(0x00010001)
+        return out
 
     def connection_made(self, transport):
         if not self.server._accepting:
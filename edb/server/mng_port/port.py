@@ -61,7 +61,8 @@ class ManagementPort(baseport.Port):
     _servers: List[asyncio.AbstractServer]
 
     def __init__(self, nethost: str, netport: int,
-                 auto_shutdown: bool, **kwargs):
+                 auto_shutdown: bool, serve_unix_sockets: bool = True,
+                 **kwargs):
         super().__init__(**kwargs)
 
         self._nethost = nethost
@@ -74,6 +75,7 @@ class ManagementPort(baseport.Port):
         self._backends = weakref.WeakSet()
 
         self._auto_shutdown = auto_shutdown
+        self._serve_unix_sockets = serve_unix_sockets
         self._accepting = False
 
     def new_view(self, *, dbname, user, query_cache):
@@ -127,8 +129,22 @@ class ManagementPort(baseport.Port):
 
         tcp_srv = await self._loop.create_server(
             lambda: edgecon.EdgeConnection(self),
-            host=nethost, port=self._netport)
+            host=nethost, port=self._netport,
+            reuse_port=self._reuse_port)
 
+        self._servers.append(tcp_srv)
+        if len(nethost) > 1:
+            host_str = f"{{{', '.join(nethost)}}}"
+        else:
+            host_str = next(iter(nethost))
+        logger.info('Serving on %s:%s', host_str, self._netport)
+
+        if self._serve_unix_sockets:
+            await self._start_unix_servers()
+
+        self._accepting = True
+
+    async def _start_unix_servers(self):
         try:
             unix_sock_path = os.path.join(
                 self._runstate_dir, f'.s.EDGEDB.{self._netport}')
@@ -136,8 +152,7 @@ class ManagementPort(baseport.Port):
                 lambda: edgecon.EdgeConnection(self),
                 unix_sock_path)
         except Exception:
-            tcp_srv.close()
-            await tcp_srv.wait_closed()
+            await self._close_servers()
             raise
 
         try:
@@ -148,33 +163,27 @@ class ManagementPort(baseport.Port):
                 admin_unix_sock_path)
             os.chmod(admin_unix_sock_path, stat.S_IRUSR | stat.S_IWUSR)
         except Exception:
-            tcp_srv.close()
-            await tcp_srv.wait_closed()
             unix_srv.close()
             await unix_srv.wait_closed()
+            await self._close_servers()
             raise
 
-        self._servers.append(tcp_srv)
-        if len(nethost) > 1:
-            host_str = f"{{{', '.join(nethost)}}}"
-        else:
-            host_str = next(iter(nethost))
-        logger.info('Serving on %s:%s', host_str, self._netport)
         self._servers.append(unix_srv)
         logger.info('Serving on %s', unix_sock_path)
         self._servers.append(admin_unix_srv)
         logger.info('Serving admin on %s', admin_unix_sock_path)
 
-        self._accepting = True
+    async def _close_servers(self):
+        async with taskgroup.TaskGroup() as g:
+            for srv in self._servers:
+                srv.close()
+                g.create_task(srv.wait_closed())
+            self._servers.clear()
 
     async def stop(self):
         self._accepting = False
         try:
-            async with taskgroup.TaskGroup() as g:
-                for srv in self._servers:
-                    srv.close()
-                    g.create_task(srv.wait_closed())
-                self._servers.clear()
+            await self._close_servers()
         finally:
             try:
                 async with taskgroup.TaskGroup() as g:
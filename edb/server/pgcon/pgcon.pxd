@@ -55,6 +55,21 @@ cdef enum PGAuthenticationState:
     PGAUTH_SASL_FINAL = 12
 
 
+@cython.final
+cdef class BindData:
+
+    cdef:
+        list chunks
+        WriteBuffer buf
+        ssize_t size
+
+    cdef write_int16(self, int16_t i)
+    cdef write_int32(self, int32_t i)
+    cdef write_data(self, bytes data, ssize_t start, ssize_t end)
+    cdef WriteBuffer write_message(self, list out, WriteBuffer packet,
+                                   bytes stmt_name)
+
+
 @cython.final
 cdef class PGProto:
 
@@ -85,6 +100,10 @@ cdef class PGProto:
 
     cdef write(self, buf)
 
+    cdef _write_json_query(self, sql, sql_hash, dbver,
+                           bint use_prep_stmt, args)
+    cdef _read_json_row(self, sql)
+
     cdef parse_error_message(self)
     cdef parse_sync_message(self)
 
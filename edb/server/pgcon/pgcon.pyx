@@ -60,6 +60,7 @@ from . import errors as pgerror
 
 DEF DATA_BUFFER_SIZE = 100_000
 DEF PREP_STMTS_CACHE = 100
+DEF BIND_DATA_COPY_THRESHOLD = 16_384
 
 DEF COPY_SIGNATURE = b"PGCOPY\n\377\r\n\0"
 
@@ -143,6 +144,70 @@ cdef class EdegDBCodecContext(pgproto.CodecContext):
         return True
 
 
+@cython.final
+cdef class BindData:
+    """Parameters part of a Bind message.
+
+    Argument data spans larger than BIND_DATA_COPY_THRESHOLD are kept
+    as memoryviews of the original data and are passed to the transport
+    as is, instead of being copied into the outgoing packet.
+    """
+
+    def __cinit__(self):
+        self.chunks = []
+        self.buf = WriteBuffer.new()
+        self.size = 0
+
+    cdef write_int16(self, int16_t i):
+        self.buf.write_int16(i)
+        self.size += 2
+
+    cdef write_int32(self, int32_t i):
+        self.buf.write_int32(i)
+        self.size += 4
+
+    cdef write_data(self, bytes data, ssize_t start, ssize_t end):
+        cdef:
+            ssize_t length = end - start
+
+        if length <= 0:
+            return
+
+        if length < BIND_DATA_COPY_THRESHOLD:
+            self.buf.write_cstr(cpython.PyBytes_AS_STRING(data) + start,
+                                length)
+        else:
+            if self.buf.len():
+                self.chunks.append(self.buf)
+                self.buf = WriteBuffer.new()
+            self.chunks.append(memoryview(data)[start:end])
+
+        self.size += length
+
+    cdef WriteBuffer write_message(self, list out, WriteBuffer packet,
+                                   bytes stmt_name):
+        # Write a complete Bind message to *packet*.  Whenever a large
+        # argument span is encountered, *packet* is appended to *out*
+        # followed by the span, and writing continues to a new packet,
+        # which is returned.
+        packet.write_byte(b'B')
+        packet.write_int32(
+            <int32_t>(4 + 1 + len(stmt_name) + 1 + self.size))
+        packet.write_bytestring(b'')  # portal name
+        packet.write_bytestring(stmt_name)  # statement name
+
+        for chunk in self.chunks:
+            if type(chunk) is WriteBuffer:
+                packet.write_buffer(<WriteBuffer>chunk)
+            else:
+                out.append(packet)
+                out.append(chunk)
+                packet = WriteBuffer.new()
+
+        packet.write_buffer(self.buf)
+        return packet
+
+
 @cython.final
 cdef class PGProto:
 
@@ -262,20 +327,16 @@ cdef class PGProto:
 
         return parse, store_stmt
 
-    async def parse_execute_json(self, sql, sql_hash, dbver,
-                                 use_prep_stmt, args):
+    cdef _write_json_query(self, sql, sql_hash, dbver,
+                           bint use_prep_stmt, args):
         cdef:
             WriteBuffer parse_buf
             WriteBuffer bind_buf
             WriteBuffer execute_buf
             WriteBuffer buf
-            char *str
-            ssize_t size
             bint parse = 1
             bint store_stmt = 0
 
-        self.before_command()
-
         buf = WriteBuffer.new()
 
         if use_prep_stmt:
@@ -318,8 +379,40 @@ cdef class PGProto:
         buf.write_bytes(SYNC_MESSAGE)
 
         self.write(buf)
-        error = None
         self.waiting_for_sync = True
+
+        return stmt_name, store_stmt
+
+    cdef _read_json_row(self, sql):
+        # Returns the JSON value of a DataRow (None for NULL), or an
+        # exception to be raised once the backend is ready for a new
+        # query.
+        cdef:
+            int16_t ncol
+            int32_t coll
+
+        ncol = self.buffer.read_int16()
+        if ncol != 1:
+            self.buffer.discard_message()
+            return RuntimeError(
+                f'received more than column in DataRow '
+                f'for a JSON query {sql!r}')
+
+        coll = self.buffer.read_int32()
+        if coll == -1:
+            self.buffer.discard_message()
+            return None
+
+        return self.buffer.read_bytes(coll)
+
+    async def parse_execute_json(self, sql, sql_hash, dbver,
+                                 use_prep_stmt, args):
+        self.before_command()
+
+        stmt_name, store_stmt = self._write_json_query(
+            sql, sql_hash, dbver, use_prep_stmt, args)
+
+        error = None
         data = None
         while True:
             if not self.buffer.take_message():
@@ -336,22 +429,14 @@ cdef class PGProto:
                         self.buffer.discard_message()
                         continue
 
-                    ncol = self.buffer.read_int16()
-                    if ncol != 1:
-                        error = RuntimeError(
-                            f'received more than column in DataRow '
-                            f'for a JSON query {sql!r}')
-                        self.buffer.discard_message()
-                        continue
-
-                    coll = self.buffer.read_int32()
-                    if coll == -1:
+                    row = self._read_json_row(sql)
+                    if isinstance(row, Exception):
+                        error = row
+                    elif row is None:
                         error = RuntimeError(
                             f'received NULL for a JSON query {sql!r}')
-                        self.buffer.discard_message()
-                        continue
-
-                    data = self.buffer.read_bytes(coll)
+                    else:
+                        data = row
 
                 elif mtype == b'E':
                     # ErrorResponse
@@ -387,18 +472,97 @@ cdef class PGProto:
 
         return data
 
+    async def parse_execute_json_stream(self, sql, sql_hash, dbver,
+                                        use_prep_stmt, args, on_row):
+        # Like parse_execute_json(), but for queries compiled to
+        # return one JSON element per row: every row is passed to
+        # *on_row* as it arrives.  *on_row* may return an awaitable,
+        # in which case reading from the backend is paused until it
+        # is done, which propagates the consumer's backpressure to
+        # Postgres.
+        self.before_command()
+
+        stmt_name, store_stmt = self._write_json_query(
+            sql, sql_hash, dbver, use_prep_stmt, args)
+
+        error = None
+        while True:
+            if not self.buffer.take_message():
+                await self.wait_for_message()
+            mtype = self.buffer.get_message_type()
+
+            try:
+                if mtype == b'D':
+                    # DataRow
+                    row = self._read_json_row(sql)
+                    if isinstance(row, Exception):
+                        error = row
+                        continue
+                    if error is not None:
+                        continue
+                    if row is None:
+                        # Same as what json_agg() would produce.
+                        row = b'null'
+
+                    try:
+                        waiter = on_row(row)
+                        if waiter is not None:
+                            self.transport.pause_reading()
+                            try:
+                                await waiter
+                            finally:
+                                if self.transport is not None:
+                                    self.transport.resume_reading()
+                    except Exception as ex:
+                        # Keep reading until ReadyForQuery to leave
+                        # the connection in a usable state.
+                        error = ex
+
+                elif mtype == b'E':
+                    # ErrorResponse
+                    fields = self.parse_error_message()
+                    error = pgerror.BackendError(fields=fields)
+
+                elif mtype == b'1':
+                    # ParseComplete
+                    self.buffer.discard_message()
+                    if store_stmt:
+                        self.prep_stmts[stmt_name] = dbver
+
+                elif mtype in {b'C', b'n', b'2', b'I'}:
+                    # CommandComplete
+                    # NoData
+                    # BindComplete
+                    # EmptyQueryResponse
+                    self.buffer.discard_message()
+
+                elif mtype == b'Z':
+                    # ReadyForQuery
+                    self.parse_sync_message()
+                    break
+
+                else:
+                    self.fallthrough()
+
+            finally:
+                self.buffer.finish_message()
+
+        if error is not None:
+            raise error
+
     async def parse_execute(self,
                             bint parse,
                             bint execute,
                             object query,
                             edgecon.EdgeConnection edgecon,
-                            WriteBuffer bind_data,
+                            BindData bind_data,
                             bint send_sync,
                             bint use_prep_stmt):
 
         cdef:
             WriteBuffer packet
             WriteBuffer buf
+            list out = []
             bytes stmt_name
             bint store_stmt = 0
 
@@ -459,11 +623,7 @@ cdef class PGProto:
 
             if stmt_name == b'' and msgs_num > 1:
                 for s in self.last_parse_prep_stmts:
-                    buf = WriteBuffer.new_message(b'B')
-                    buf.write_bytestring(b'')  # portal name
-                    buf.write_bytestring(s)  # statement name
-                    buf.write_buffer(bind_data)
-                    packet.write_buffer(buf.end_message())
+                    packet = bind_data.write_message(out, packet, s)
 
                     buf = WriteBuffer.new_message(b'E')
                     buf.write_bytestring(b'')  # portal name
@@ -471,11 +631,7 @@ cdef class PGProto:
                     packet.write_buffer(buf.end_message())
 
             else:
-                buf = WriteBuffer.new_message(b'B')
-                buf.write_bytestring(b'')  # portal name
-                buf.write_bytestring(stmt_name)  # statement name
-                buf.write_buffer(bind_data)
-                packet.write_buffer(buf.end_message())
+                packet = bind_data.write_message(out, packet, stmt_name)
 
                 buf = WriteBuffer.new_message(b'E')
                 buf.write_bytestring(b'')  # portal name
@@ -487,7 +643,12 @@ cdef class PGProto:
             self.waiting_for_sync = True
         else:
             packet.write_bytes(FLUSH_MESSAGE)
-        self.write(packet)
+
+        if out:
+            out.append(packet)
+            self.transport.writelines(out)
+        else:
+            self.write(packet)
 
         try:
             buf = None
@@ -20,6 +20,7 @@
 from __future__ import annotations
 from typing import *  # NoQA
 
+import asyncio
 import json
 import logging
 
@@ -27,12 +28,11 @@ from edb import errors
 
 from edb.common import taskgroup
 
-from edb.edgeql import parser as ql_parser
-
 from edb.server import config
 from edb.server import defines
 from edb.server import http_edgeql_port
 from edb.server import http_graphql_port
+from edb.server import ioworkers
 from edb.server import mng_port
 from edb.server import pgcon
 
@@ -53,7 +53,9 @@ class Server:
                  max_backend_connections,
                  nethost, netport,
                  auto_shutdown: bool=False,
-                 echo_runtime_info: bool = False):
+                 echo_runtime_info: bool = False,
+                 io_worker_id: Optional[int] = None,
+                 control_path: Optional[str] = None):
 
         self._loop = loop
 
@@ -83,7 +85,29 @@ class Server:
 
         self._echo_runtime_info = echo_runtime_info
 
+        # When running as one of several I/O worker processes all
+        # workers listen on the same TCP ports, and only the first
+        # one serves the UNIX sockets.
+        self._io_worker_id = io_worker_id
+        self._reuse_port = io_worker_id is not None
+        self._serve_unix_sockets = not io_worker_id
+        self._control_path = control_path
+        self._control = None
+        # Control messages received before the server is serving,
+        # replayed by start().
+        self._pending_control_messages = []
+        self._remote_config_lock = asyncio.Lock()
+
     async def init(self):
+        if self._control_path is not None:
+            # Connect before loading any state, so that no invalidation
+            # event can fall in between.
+            self._control = ioworkers.ControlChannel(
+                loop=self._loop,
+                path=self._control_path,
+                on_message=self._on_control_message)
+            await self._control.connect()
+
         self._dbindex = await dbview.DatabaseIndex.init(self)
         self._populate_sys_auth()
 
@@ -95,12 +119,8 @@ class Server:
         if not self._mgmt_port_no:
             self._mgmt_port_no = cfg.get('listen_port', defines.EDGEDB_PORT)
 
-        self._mgmt_port = self._new_port(
-            mng_port.ManagementPort,
-            nethost=self._mgmt_host_addr,
-            netport=self._mgmt_port_no,
-            auto_shutdown=self._auto_shutdown,
-        )
+        self._mgmt_port = self._new_mgmt_port(
+            self._mgmt_host_addr, self._mgmt_port_no)
 
     def _populate_sys_auth(self):
         self._sys_auth = tuple(sorted(
@@ -130,19 +150,24 @@ class Server:
             runstate_dir=self._runstate_dir,
             internal_runstate_dir=self._internal_runstate_dir,
             dbindex=self._dbindex,
+            reuse_port=self._reuse_port,
             **kwargs,
         )
 
+    def _new_mgmt_port(self, nethost, netport):
+        return self._new_port(
+            mng_port.ManagementPort,
+            nethost=nethost,
+            netport=netport,
+            auto_shutdown=self._auto_shutdown,
+            serve_unix_sockets=self._serve_unix_sockets,
+        )
+
     async def _restart_mgmt_port(self, nethost, netport):
         await self._mgmt_port.stop()
 
         try:
-            new_mgmt_port = self._new_port(
-                mng_port.ManagementPort,
-                nethost=nethost,
-                netport=netport,
-                auto_shutdown=self._auto_shutdown,
-            )
+            new_mgmt_port = self._new_mgmt_port(nethost, netport)
         except Exception:
             await self._mgmt_port.start()
             raise
@@ -184,7 +209,12 @@ class Server:
             database=portconf.database,
             user=portconf.user,
             protocol=portconf.protocol,
-            concurrency=portconf.concurrency)
+            concurrency=portconf.concurrency,
+            min_concurrency=portconf.min_concurrency,
+            idle_timeout=portconf.idle_timeout,
+            queue_timeout=portconf.queue_timeout,
+            result_cache_size=portconf.result_cache_size,
+            result_cache_ttl=portconf.result_cache_ttl)
 
         try:
             await port.start()
@@ -263,6 +293,52 @@ class Server:
         # CONFIGURE SYSTEM RESET setting_name;
         pass
 
+    def _on_database_ddl(self, dbname):
+        if self._control is not None:
+            self._control.broadcast(ioworkers.MSG_DDL, dbname)
+
+    def _on_database_dml(self, dbname, dml_types):
+        if self._control is not None:
+            self._control.broadcast(ioworkers.MSG_DML, dbname, dml_types)
+
+    def _on_system_config_persisted(self, op):
+        if self._control is not None:
+            self._control.broadcast(ioworkers.MSG_SYSTEM_CONFIG, op)
+
+    def _on_control_message(self, kind, args):
+        if self._pending_control_messages is not None:
+            # Still starting up, see start().
+            self._pending_control_messages.append((kind, args))
+        else:
+            self._handle_control_message(kind, args)
+
+    def _handle_control_message(self, kind, args, *, replay=False):
+        if kind == ioworkers.MSG_DDL:
+            self._dbindex.signal_ddl(*args)
+        elif kind == ioworkers.MSG_DML:
+            self._dbindex.signal_dml(*args, broadcast=False)
+        elif kind == ioworkers.MSG_SYSTEM_CONFIG:
+            self._loop.create_task(
+                self._apply_remote_config_op(*args, replay=replay))
+        else:
+            logger.warning('unknown I/O worker control message: %r', kind)
+
+    async def _apply_remote_config_op(self, op, *, replay=False):
+        # The lock keeps operations applied in the order they arrive.
+        async with self._remote_config_lock:
+            try:
+                # The operation has already been persisted by the
+                # worker that executed it.
+                await self._dbindex.apply_system_config_op(None, op)
+            except Exception as e:
+                if replay and isinstance(e, errors.ConstraintViolationError):
+                    # A CONFIGURE SYSTEM INSERT that init() has already
+                    # loaded from the persisted config.
+                    return
+                logger.exception(
+                    'failed to apply system config operation from '
+                    'another I/O worker: %r', op)
+
     def add_port(self, portcls, **kwargs):
         if self._serving:
             raise RuntimeError(
@@ -273,10 +349,6 @@ class Server:
         return port
 
     async def start(self):
-        # Make sure that EdgeQL parser is preloaded; edgecon might use
-        # it to restore config values.
-        ql_parser.preload()
-
         async with taskgroup.TaskGroup() as g:
             g.create_task(self._mgmt_port.start())
             for port in self._ports:
@@ -289,7 +361,21 @@ class Server:
 
         self._serving = True
 
-        if self._echo_runtime_info:
+        # Events that arrived while the state was being loaded may or
+        # may not be reflected in it, so apply them again, now that the
+        # ports they may affect are running.  Replaying them is
+        # harmless: DDL and DML only invalidate caches, and config
+        # operations either are idempotent or fail on the duplicate,
+        # see _apply_remote_config_op().
+        pending = self._pending_control_messages
+        self._pending_control_messages = None
+        for kind, args in pending:
+            self._handle_control_message(kind, args, replay=True)
+
+        if self._control is not None:
+            self._control.broadcast(ioworkers.MSG_READY)
+
+        if self._echo_runtime_info and self._serve_unix_sockets:
             ri = {
                 "port": self._mgmt_port_no,
                 "runstate_dir": str(self._runstate_dir),
@@ -309,6 +395,10 @@ class Server:
             g.create_task(self._mgmt_port.stop())
             self._mgmt_port = None
 
+        if self._control is not None:
+            self._control.close()
+            self._control = None
+
     async def get_auth_method(self, user, conn):
         authlist = self._sys_auth
 
@@ -53,6 +53,10 @@ class BaseHttpTest:
     # for no particular speedup.
     SERIALIZED = True
 
+    # Maximum number of query results cached by the port;
+    # 0 disables the result cache.
+    PORT_RESULT_CACHE_SIZE = 0
+
     @classmethod
     def get_port_proto(cls):
         raise NotImplementedError
@@ -75,6 +79,7 @@ class BaseHttpTest:
                         port := {cls.http_port},
                         user := "http",
                         concurrency := 4,
+                        result_cache_size := {cls.PORT_RESULT_CACHE_SIZE},
                     }};
                 '''))
 
@@ -89,10 +94,12 @@ class BaseHttpTest:
         finally:
             con.true_close()
 
-    def http_con_send_request(self, con, params: dict, *, path=''):
+    def http_con_send_request(self, con, params: dict, *, path='',
+                              headers=None):
         con.request(
             'GET',
-            f'{self.http_addr}/{path}?{urllib.parse.urlencode(params)}')
+            f'{self.http_addr}/{path}?{urllib.parse.urlencode(params)}',
+            headers=headers or {})
 
     def http_con_read_response(self, con):
         resp = con.getresponse()
@@ -100,8 +107,9 @@ class BaseHttpTest:
         resp_headers = {k.lower(): v.lower() for k, v in resp.getheaders()}
         return resp_body, resp_headers, resp.status
 
-    def http_con_request(self, con, params: dict, *, path=''):
-        self.http_con_send_request(con, params, path=path)
+    def http_con_request(self, con, params: dict, *, path='',
+                         headers=None):
+        self.http_con_send_request(con, params, path=path, headers=headers)
         return self.http_con_read_response(con)
 
 
@@ -166,6 +174,13 @@ class GraphQLTestCase(BaseHttpTest, server.QueryTestCase):
     def get_port_proto(cls):
         return 'graphql+http'
 
+    def graphql_post(self, req_data):
+        req = urllib.request.Request(self.http_addr, method='POST')
+        req.add_header('Content-Type', 'application/json')
+        response = urllib.request.urlopen(
+            req, json.dumps(req_data).encode())
+        return json.loads(response.read())
+
     def graphql_query(self, query, *, operation_name=None,
                       use_http_post=True,
                       variables=None):
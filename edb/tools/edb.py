@@ -54,6 +54,7 @@ from . import gen_errors  # noqa
 from . import gen_types  # noqa
 from . import gen_meta_grammars  # noqa
 from . import inittestdb  # noqa
+from . import startup_bench  # noqa
 from . import test  # noqa
 from . import wipe  # noqa
 from .profiling import cli  # noqa
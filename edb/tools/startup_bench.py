@@ -0,0 +1,70 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+import time
+
+import click
+
+from edb.tools.edb import edbcommands
+
+
+# Each scenario runs in a fresh interpreter and covers what the
+# corresponding process does before it can serve its first request.
+SCENARIOS = {
+    'server': '''
+from edb.server import main
+main._init_parsers()
+from edb.edgeql import parser
+parser.parse_fragment('1')
+''',
+    'worker': '''
+from edb.server.procpool import worker
+worker.load_class('edb.server.compiler.Compiler')
+from edb.edgeql import parser
+parser.parse_block('SELECT 1')
+''',
+}
+
+
+def _run(code: str) -> float:
+    started = time.monotonic()
+    subprocess.run([sys.executable, '-c', code], check=True)
+    return time.monotonic() - started
+
+
+@edbcommands.command('startup-bench')
+@click.option('-n', '--runs', type=int, default=10, show_default=True,
+              help='number of cold starts to measure per scenario')
+@click.argument('scenarios', nargs=-1,
+                type=click.Choice(sorted(SCENARIOS)))
+def startup_bench(runs, scenarios):
+    """Measure cold start time of the server and of compiler workers."""
+
+    for name in scenarios or sorted(SCENARIOS):
+        code = SCENARIOS[name]
+        # Warm-up run: rebuild stale grammars, populate caches.
+        _run(code)
+        timings = [_run(code) for _ in range(runs)]
+        print(f'{name}: min {min(timings) * 1000:.1f}ms, '
+              f'median {statistics.median(timings) * 1000:.1f}ms')
@@ -105,7 +105,7 @@ if platform.uname().system != 'Windows':
 
 
 def _compile_parsers(build_lib, inplace=False):
-    import parsing
+    from edb.common import parsing
 
     import edb.edgeql.parser.grammar.single as edgeql_spec
     import edb.edgeql.parser.grammar.block as edgeql_spec2
@@ -516,6 +516,12 @@ setuptools.setup(
             extra_compile_args=EXT_CFLAGS,
             extra_link_args=EXT_LDFLAGS),
 
+        distutils_extension.Extension(
+            "edb.server.cache.result_cache",
+            ["edb/server/cache/result_cache.pyx"],
+            extra_compile_args=EXT_CFLAGS,
+            extra_link_args=EXT_LDFLAGS),
+
         distutils_extension.Extension(
             "edb.server.pgcon.pgcon",
             ["edb/server/pgcon/pgcon.pyx"],
@@ -18,11 +18,14 @@
 
 
 import copy
+import pickle
 import typing
 import unittest
 import unittest.mock
 
 from edb.common import ast
+from edb.common import context as pctx
+from edb.common.ast import codegen
 from edb.common.ast import match
 
 
@@ -32,7 +35,7 @@ class tast:
         pass
 
     class BinOp(Base):
-        __fields = ['op', 'left', 'right']
+        __fields = ['op', 'left', 'right', 'context']
 
     class UnaryOp(Base):
         __fields = ['op', 'operand']
@@ -84,6 +87,43 @@ class ASTBaseTests(unittest.TestCase):
         assert ctree22.left.args[0].node['lconst'] is not lconst
         assert ctree22.left.args[0].node['lconst'].value == lconst.value
 
+        # Shared nodes stay shared in the copy.
+        tree3 = tast.BinOp(left=lconst, right=lconst)
+        ctree3 = copy.deepcopy(tree3)
+        assert ctree3.left is not lconst
+        assert ctree3.left is ctree3.right
+
+    def test_common_ast_copy_context(self):
+        buffer = 'SELECT 1 + 2'
+        context = pctx.ParserContext(
+            name='<string>',
+            buffer=buffer,
+            start=pctx.SourcePoint(1, 8, 7),
+            end=pctx.SourcePoint(1, 13, 12),
+        )
+        tree = tast.BinOp(op='+', context=context)
+
+        ctree = copy.deepcopy(tree)
+        self.assertIsNot(ctree.context, context)
+        self.assertIs(ctree.context.buffer, buffer)
+        self.assertEqual(
+            (ctree.context.start.line, ctree.context.start.column,
+             ctree.context.start.pointer),
+            (1, 8, 7))
+
+        # Rebasing the context of a copy does not affect the original.
+        base = pctx.ParserContext(
+            name='<schema>',
+            buffer='x' * 100,
+            start=pctx.SourcePoint(3, 5, 50),
+            end=pctx.SourcePoint(3, 30, 75),
+        )
+        pctx.rebase_context(base, ctree.context)
+        self.assertEqual(ctree.context.start.line, 3)
+        self.assertEqual(context.start.line, 1)
+        self.assertEqual(context.start.pointer, 7)
+        self.assertEqual(context.name, '<string>')
+
     @unittest.mock.patch(
         'edb.common.ast.base._check_type',
         ast.base._check_type_real,
@@ -187,6 +227,62 @@ class ASTBaseTests(unittest.TestCase):
             class Node5(ast.AST):
                 field: list = list
 
+    def test_common_ast_slots(self):
+        class Base(ast.AST):
+            __abstract_node__ = True
+
+        class NameMixin(Base):
+            __abstract_node__ = True
+            name: str
+            flag: bool = False
+
+        class Node(Base):
+            items: typing.List[Base]
+
+        class NamedNode(Node, NameMixin):
+            pass
+
+        class PropNode(NamedNode):
+            @property
+            def name(self):
+                return 'prop'
+
+        self.assertEqual(Base.__dict__.get('__slots__'), None)
+        self.assertEqual(NameMixin.__dict__.get('__slots__'), None)
+        self.assertEqual(Node.__slots__, ('items',))
+        self.assertEqual(NamedNode.__slots__, ('name', 'flag'))
+        self.assertEqual(PropNode.__slots__, ())
+
+        n1 = NamedNode(name='foo')
+        n2 = NamedNode(items=[n1], flag=True)
+        self.assertEqual((n1.name, n1.flag, n1.items), ('foo', False, []))
+        self.assertEqual((n2.name, n2.flag, n2.items), (None, True, [n1]))
+        self.assertIsNot(n1.items, NamedNode().items)
+        self.assertEqual(PropNode(name='foo').name, 'prop')
+
+        # Ad-hoc attributes are still allowed.
+        n2.extra = 1
+        self.assertEqual(n2.extra, 1)
+
+        n3 = copy.deepcopy(n2)
+        self.assertEqual(n3.items[0].name, 'foo')
+        self.assertIsNot(n3.items[0], n1)
+
+        tree = tast.BinOp(op='+', left=tast.Constant(value=1))
+        tree.extra = 1
+        tree2 = pickle.loads(pickle.dumps(tree))
+        self.assertEqual(
+            (tree2.op, tree2.left.value, tree2.right, tree2.extra),
+            ('+', 1, None, 1))
+
+        class Other(Base):
+            other: int
+
+        with self.assertRaisesRegex(RuntimeError,
+                                    r"more than one of its bases"):
+            class Conflict(Node, Other):
+                pass
+
 
 class ASTMatchTests(unittest.TestCase):
     tree1 = tast.BinOp(
@@ -279,3 +375,101 @@ class ASTMatchTests(unittest.TestCase):
         # but the single constant matches just fine
         result = match.match(self.pat4, self.tree4)
         assert result and result.recursive[0].node.value == 'one and only'
+
+
+class ASTVisitorTests(unittest.TestCase):
+
+    class ConstCollector(ast.NodeVisitor):
+
+        def __init__(self):
+            super().__init__()
+            self.visited = []
+
+        def visit_Base(self, node):
+            self.visited.append(type(node).__name__)
+            return self.generic_visit(node)
+
+        def visit_Constant(self, node):
+            self.visited.append(node.value)
+            return node.value
+
+    class TreeConstCollector(ConstCollector):
+        memoize = False
+
+        def visit_UnaryOp(self, node):
+            self.visited.append(node.op)
+            return self.generic_visit(node)
+
+    def test_common_ast_visitor_01(self):
+        const = tast.Constant(value=1)
+        tree = tast.FunctionCall(
+            name='f',
+            args=[
+                tast.UnaryOp(op='-', operand=const),
+                const,
+            ],
+        )
+
+        visitor = self.ConstCollector()
+        self.assertEqual(visitor.visit(tree), [[1], 1])
+        # The shared node is visited once; visitors for base classes
+        # of a node are used when there is no exact match.
+        self.assertEqual(visitor.visited, ['FunctionCall', 'UnaryOp', 1])
+
+        visitor = self.TreeConstCollector()
+        self.assertEqual(visitor.visit(tree), [[1], 1])
+        self.assertEqual(visitor.visited, ['FunctionCall', '-', 1, 1])
+        self.assertEqual(visitor.memo, {})
+
+        # Dispatch tables are per visitor class.
+        self.assertIs(
+            self.ConstCollector._visitors[tast.UnaryOp],
+            self.ConstCollector.visit_Base)
+        self.assertIs(
+            self.TreeConstCollector._visitors[tast.UnaryOp],
+            self.TreeConstCollector.visit_UnaryOp)
+
+    class ExprCodegen(codegen.SourceGenerator):
+
+        def visit_BinOp(self, node):
+            self.write('(')
+            self.visit(node.left)
+            self.write(' ', node.op, ' ')
+            self.visit(node.right)
+            self.write(')')
+
+        def visit_FunctionCall(self, node):
+            self.write(node.name, '(')
+            self.visit_list(node.args, newlines=False)
+            self.write(')')
+
+        def visit_Constant(self, node):
+            self.write(node.value)
+
+    def test_common_ast_codegen_01(self):
+        tree = tast.FunctionCall(
+            name='f',
+            args=[
+                tast.BinOp(
+                    op='+',
+                    left=tast.Constant(value='1'),
+                    right=tast.Constant(value='2'),
+                ),
+                tast.Constant(value='3'),
+            ],
+        )
+
+        self.assertEqual(
+            self.ExprCodegen.to_source(tree), 'f((1 + 2), 3)')
+        self.assertEqual(
+            self.ExprCodegen.to_source([tree.args[1], tree.args[1]]),
+            '33')
+
+        gen = self.ExprCodegen()
+        gen.write('a', 'b', 'c', delimiter=', ')
+        gen.newline()
+        gen.write('d')
+        self.assertEqual(''.join(gen.result), 'a, b, c\nd')
+
+        with self.assertRaisesRegex(ValueError, 'invalid text chunk'):
+            self.ExprCodegen.to_source(tast.Constant(value=1))
@@ -197,3 +197,28 @@ class TestEdgeQLIRPathID(tb.BaseEdgeQLCompilerTest):
                 '.>deck[IS test::Card]',
             ]
         )
+
+    def test_edgeql_ir_pathid_hash(self):
+        User = self.schema.get('test::User')
+        deck_ptr = User.getptr(self.schema, 'deck')
+        deck_ptr_ref = irtyputils.ptrref_from_ptrcls(
+            schema=self.schema,
+            ptrcls=deck_ptr,
+        )
+
+        pid_1 = pathid.PathId.from_type(self.schema, User)
+        pid_2 = pid_1.extend(ptrref=deck_ptr_ref, schema=self.schema)
+        ptr_pid = pid_2.ptr_path()
+
+        # Hash is cached on first use and is not carried over
+        # to the PathIds derived from an already hashed one.
+        paths = {pid_1: 1, pid_2: 2, ptr_pid: 3}
+        ns_pid = pid_2.replace_namespace({'foo'})
+        tgt_pid = ptr_pid.tgt_path()
+        self.assertNotIn(ns_pid, paths)
+        self.assertIsNot(tgt_pid, pid_2)
+        self.assertEqual(paths[tgt_pid], 2)
+        self.assertEqual(paths[ns_pid.strip_namespace({'foo'})], 2)
+        self.assertEqual(paths[pid_2.src_path()], 1)
+        self.assertEqual(
+            hash(ns_pid.strip_namespace({'foo'})), hash(pid_2))
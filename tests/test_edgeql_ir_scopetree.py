@@ -19,6 +19,7 @@
 
 import difflib
 import os.path
+import random
 import re
 import textwrap
 
@@ -28,6 +29,8 @@ from edb.testbase import lang as tb
 
 from edb.edgeql import compiler
 from edb.edgeql import parser as qlparser
+from edb.ir import pathid
+from edb.ir import scopetree
 
 
 class TestEdgeQLIRScopeTree(tb.BaseEdgeQLCompilerTest):
@@ -61,6 +64,220 @@ class TestEdgeQLIRScopeTree(tb.BaseEdgeQLCompilerTest):
                 f'\nEXPECTED:\n{expected_scope}\nACTUAL:\n{path_scope}'
                 f'\nDIFF:\n{diff}')
 
+    def test_edgeql_ir_scope_tree_visibility_memo(self):
+        Card = self.schema.get('test::Card')
+        card_pid = pathid.PathId.from_type(self.schema, Card)
+
+        root = scopetree.ScopeTreeNode(fenced=True)
+        fence = root.attach_fence()
+        inner = fence.attach_branch()
+        self.assertIsNone(inner.find_visible(card_pid))
+
+        # Memoized visibility is recomputed whenever the tree changes.
+        node = scopetree.ScopeTreeNode(path_id=card_pid)
+        root.attach_child(node)
+        self.assertIs(inner.find_visible(card_pid), node)
+
+        _, finfo = inner.find_visible_ex(card_pid)
+        self.assertFalse(finfo.factoring_fence)
+        fence.factoring_fence = True
+        _, finfo = inner.find_visible_ex(card_pid)
+        self.assertTrue(finfo.factoring_fence)
+        root.add_factoring_whitelist(card_pid)
+        _, finfo = inner.find_visible_ex(card_pid)
+        self.assertFalse(finfo.factoring_fence)
+
+        ns_pid = card_pid.replace_namespace({'ns'})
+        self.assertIsNone(inner.find_visible(ns_pid))
+        fence.add_namespaces({'ns'})
+        self.assertIs(inner.find_visible(ns_pid), node)
+
+        node.remove()
+        self.assertIsNone(inner.find_visible(ns_pid))
+        self.assertIsNone(inner.find_visible(card_pid))
+
+    def _find_child(self, node, path_id, in_branches):
+        for child in node.children:
+            if child.path_id == path_id:
+                return child
+            if in_branches and child.path_id is None and not child.fenced:
+                desc = self._find_child(child, path_id, in_branches)
+                if desc is not None:
+                    return desc
+        return None
+
+    def _check_scope_tree_index(self, root, path_ids, unique_ids):
+        nodes = list(root.descendants)
+
+        # All nodes of a tree share one index, which knows about them.
+        indexes = {id(node._index): node._index for node in nodes}
+        if len(nodes) > 1:
+            self.assertEqual(len(indexes), 1)
+            index = next(iter(indexes.values()))
+            self.assertIsNotNone(index)
+            indexed = {id(n) for n in index.nodes}
+            for node in nodes:
+                self.assertIn(id(node), indexed)
+                if node.path_id is not None:
+                    self.assertIn(
+                        node,
+                        index.by_path[scopetree._path_key(node.path_id)])
+                if node.unique_id is not None:
+                    self.assertIn(node, index.by_unique_id[node.unique_id])
+
+        # Indexed lookups return what a traversal of the tree does.
+        for node in nodes:
+            for path_id in path_ids:
+                desc_and_ns = node.strict_descendants_and_namespaces
+                matched = [
+                    (desc, dns, finfo)
+                    for desc, dns, finfo in desc_and_ns
+                    if desc.path_id is not None
+                    and scopetree._paths_equal(desc.path_id, path_id, dns)
+                ]
+
+                self.assertEqual(
+                    node.find_descendants(path_id),
+                    [desc for desc, _, _ in matched])
+                self.assertEqual(
+                    node.find_descendant_and_ns(path_id),
+                    matched[0] if matched else (None, frozenset(), None))
+
+                unfenced = (None, False)
+                namespaces = set()
+                unnest_fence_seen = False
+                for anc, ans in node.ancestors_and_namespaces:
+                    unfenced = next(
+                        ((desc, unnest_fence_seen)
+                         for desc in anc.unfenced_descendants
+                         if desc.path_id is not None
+                         and scopetree._paths_equal(
+                             desc.path_id, path_id, namespaces)),
+                        None)
+                    if unfenced is not None:
+                        break
+                    namespaces |= ans
+                    unnest_fence_seen = (
+                        unnest_fence_seen or anc.unnest_fence)
+                else:
+                    unfenced = (None, unnest_fence_seen)
+                self.assertEqual(node.find_unfenced(path_id), unfenced)
+
+                for in_branches in (False, True):
+                    self.assertIs(
+                        node.find_child(path_id, in_branches=in_branches),
+                        self._find_child(node, path_id, in_branches))
+
+                # Memoized visibility matches a fresh lookup.
+                memoized = node.find_visible_ex(path_id)
+                if node._index is not None:
+                    node._index.visible.clear()
+                self.assertEqual(node.find_visible_ex(path_id), memoized)
+
+            for unique_id in unique_ids:
+                self.assertIs(
+                    node.find_by_unique_id(unique_id),
+                    next((d for d in node.descendants
+                          if d.unique_id == unique_id), None))
+
+    def _get_index_test_path_ids(self):
+        path_ids = []
+        for name in ('test::Card', 'test::User', 'test::Award'):
+            path_id = pathid.PathId.from_type(
+                self.schema, self.schema.get(name))
+            path_ids.append(path_id)
+            path_ids.append(path_id.replace_namespace({'a'}))
+            path_ids.append(path_id.replace_namespace({'b'}))
+        return path_ids
+
+    def test_edgeql_ir_scope_tree_index_01(self):
+        # Randomly grow, split and join trees, and check that indexed
+        # lookups keep matching a traversal of every tree.
+        rng = random.Random(42)
+        path_ids = self._get_index_test_path_ids()
+        unique_ids = [1, 2, 3]
+
+        root = scopetree.ScopeTreeNode(fenced=True)
+        detached = []
+
+        for _ in range(150):
+            op = rng.choice(['attach', 'attach', 'attach', 'remove',
+                             'join', 'namespaces', 'unique_id', 'copy'])
+            trees = [root] + detached
+            target = rng.choice(
+                [node for tree in trees for node in tree.descendants])
+
+            try:
+                if op == 'attach':
+                    node = scopetree.ScopeTreeNode(
+                        path_id=rng.choice([None] + path_ids),
+                        fenced=rng.random() < 0.3,
+                        unique_id=rng.choice([None, None] + unique_ids))
+                    target.attach_child(node)
+                    detached.append(node)
+                elif op == 'remove':
+                    if target.parent is not None:
+                        target.remove()
+                        detached.append(target)
+                elif op == 'join':
+                    # Merges the indexes of two trees.
+                    if detached:
+                        subtree = rng.choice(detached)
+                        if target.root is not subtree:
+                            target.attach_child(subtree)
+                elif op == 'namespaces':
+                    target.add_namespaces({rng.choice(['a', 'b'])})
+                elif op == 'unique_id':
+                    target.unique_id = rng.choice(unique_ids)
+                elif op == 'copy':
+                    detached.append(target.copy())
+            except scopetree.InvalidScopeConfiguration:
+                pass
+
+            detached = [node for node in detached if node.parent is None]
+            for tree in [root] + detached:
+                self._check_scope_tree_index(tree, path_ids, unique_ids)
+
+    def test_edgeql_ir_scope_tree_index_02(self):
+        path_ids = self._get_index_test_path_ids()
+        card, _, _, user, user_a, _, award, _, award_b = path_ids
+        unique_ids = [1]
+
+        root = scopetree.ScopeTreeNode(fenced=True)
+        root.attach_path(card)
+        root.attach_path(user_a)
+        branch = root.attach_branch()
+        branch.add_namespaces({'a'})
+        fence = branch.attach_fence()
+        fence.attach_path(award_b)
+        self._check_scope_tree_index(root, path_ids, unique_ids)
+
+        # Fuse a separately built tree.
+        subtree = scopetree.ScopeTreeNode(path_id=user)
+        subtree.attach_child(
+            scopetree.ScopeTreeNode(path_id=award, unique_id=1))
+        subtree.attach_child(scopetree.ScopeTreeNode(path_id=award_b))
+        self._check_scope_tree_index(subtree, path_ids, unique_ids)
+        card_node = root.find_child(card)
+        card_node.fuse_subtree(subtree)
+        self._check_scope_tree_index(root, path_ids, unique_ids)
+        self._check_scope_tree_index(subtree, path_ids, unique_ids)
+        self.assertIs(
+            root.find_by_unique_id(1), card_node.find_child(award))
+
+        # Split the tree and check both halves.
+        fence.remove()
+        self._check_scope_tree_index(root, path_ids, unique_ids)
+        self._check_scope_tree_index(fence, path_ids, unique_ids)
+        self.assertEqual(len(root.find_descendants(award_b)), 1)
+        self.assertEqual(len(fence.find_descendants(award_b)), 1)
+
+        branch.collapse()
+        self._check_scope_tree_index(root, path_ids, unique_ids)
+
+        root.find_child(user_a).remove_descendants(user_a)
+        self._check_scope_tree_index(root, path_ids, unique_ids)
+
     def test_edgeql_ir_scope_tree_01(self):
         """
         WITH MODULE test
@@ -75,6 +75,20 @@ class TestEdgeQLParser(EdgeQLSyntaxTest):
         SeLeCT 1;
         """
 
+    def test_edgeql_syntax_case_02(self):
+        """
+        SELECT select_;
+        SELECT Orders FILTER Orders.filter_by;
+        SELECT _select.or_;
+        """
+
+    @tb.must_fail(errors.EdgeQLSyntaxError, "Unexpected 'or'",
+                  line=2, col=17)
+    def test_edgeql_syntax_case_03(self):
+        """
+        SELECT 1or;
+        """
+
     def test_edgeql_syntax_omit_semicolon_01(self):
         """
         SELECT 1
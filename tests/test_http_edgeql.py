@@ -17,7 +17,10 @@
 #
 
 
+import gzip
+import json
 import os
+import zlib
 
 import edgedb
 
@@ -38,6 +41,8 @@ class TestHttpEdgeQL(tb.EdgeQLTestCase):
     # EdgeQL/HTTP queries cannot run in a transaction
     ISOLATED_METHODS = False
 
+    PORT_RESULT_CACHE_SIZE = 100
+
     def test_http_edgeql_proto_errors_01(self):
         with self.http_con() as con:
             data, headers, status = self.http_con_request(
@@ -231,3 +236,241 @@ class TestHttpEdgeQL(tb.EdgeQLTestCase):
                     bad := sys::sleep(0)
                 };
             """)
+
+    def test_http_edgeql_stream_01(self):
+        # Results larger than HTTP_PORT_STREAM_CHUNK_SIZE are streamed
+        # with chunked transfer encoding.
+        query = r"""
+            FOR x IN {0, 1, 2, 3, 4, 5, 6, 7, 8, 9}
+            UNION (
+                FOR y IN {0, 1, 2, 3, 4, 5, 6, 7, 8, 9}
+                UNION <str>(x * 10 + y) ++ str_repeat('x', 1000)
+            );
+        """
+
+        with self.http_con() as con:
+            data, headers, status = self.http_con_request(
+                con, {'query': query})
+
+            self.assertEqual(status, 200)
+            self.assertEqual(headers.get('transfer-encoding'), 'chunked')
+            self.assertNotIn('content-length', headers)
+
+            result = json.loads(data)
+            self.assertEqual(
+                sorted(result['data']),
+                sorted(f'{i}' + 'x' * 1000 for i in range(100)))
+
+            # The connection is still usable, and small results
+            # are not streamed.
+            data, headers, status = self.http_con_request(
+                con, {'query': 'SELECT 42;'})
+
+            self.assertEqual(status, 200)
+            self.assertNotIn('transfer-encoding', headers)
+            self.assertEqual(json.loads(data), {'data': [42]})
+
+    def test_http_edgeql_stream_02(self):
+        # An error in the middle of a streamed result is reported
+        # in the "error" key of the response document.
+        query = r"""
+            FOR x IN {0, 1, 2, 3, 4, 5, 6, 7, 8, 9}
+            UNION (
+                FOR y IN {0, 1, 2, 3, 4, 5, 6, 7, 8, 9}
+                UNION
+                    <str>(1 // (99 - x * 10 - y)) ++ str_repeat('x', 1000)
+            );
+        """
+
+        with self.http_con() as con:
+            data, headers, status = self.http_con_request(
+                con, {'query': query})
+
+            self.assertEqual(status, 200)
+            result = json.loads(data)
+            self.assertEqual(
+                result['error']['type'], 'DivisionByZeroError')
+
+    def test_http_edgeql_compression_01(self):
+        query = r"""
+            FOR x IN {0, 1, 2, 3, 4, 5, 6, 7, 8, 9}
+            UNION <str>x ++ str_repeat('x', 1000);
+        """
+        expected = sorted(f'{i}' + 'x' * 1000 for i in range(10))
+
+        with self.http_con() as con:
+            for encoding in ['gzip', 'deflate']:
+                data, headers, status = self.http_con_request(
+                    con, {'query': query},
+                    headers={'Accept-Encoding': f'{encoding}, br'})
+
+                self.assertEqual(status, 200)
+                self.assertEqual(headers['content-encoding'], encoding)
+                self.assertEqual(headers['vary'], 'accept-encoding')
+                self.assertLess(len(data), 1000)
+
+                if encoding == 'gzip':
+                    data = gzip.decompress(data)
+                else:
+                    data = zlib.decompress(data)
+                self.assertEqual(sorted(json.loads(data)['data']), expected)
+
+            # No compression unless asked for.
+            data, headers, status = self.http_con_request(
+                con, {'query': query})
+            self.assertEqual(status, 200)
+            self.assertNotIn('content-encoding', headers)
+            self.assertEqual(sorted(json.loads(data)['data']), expected)
+
+            # Small bodies are not compressed.
+            data, headers, status = self.http_con_request(
+                con, {'query': 'SELECT 1;'},
+                headers={'Accept-Encoding': 'gzip'})
+            self.assertEqual(status, 200)
+            self.assertNotIn('content-encoding', headers)
+            self.assertEqual(json.loads(data), {'data': [1]})
+
+    def test_http_edgeql_compression_02(self):
+        query = r"""
+            SELECT str_repeat('x', 2000);
+        """
+
+        cases = [
+            ('gzip;q=0', None),
+            ('*;q=0', None),
+            ('gzip;q=0, *', 'deflate'),
+            ('gzip;q=0, deflate;q=0, *', None),
+            ('deflate;q=0.5, gzip;q=0.4', 'deflate'),
+            ('deflate, gzip', 'gzip'),
+            ('*', 'gzip'),
+            ('identity', None),
+        ]
+
+        with self.http_con() as con:
+            for accept_encoding, expected in cases:
+                with self.subTest(accept_encoding=accept_encoding):
+                    data, headers, status = self.http_con_request(
+                        con, {'query': query},
+                        headers={'Accept-Encoding': accept_encoding})
+
+                    self.assertEqual(status, 200)
+                    self.assertEqual(
+                        headers.get('content-encoding'), expected)
+
+                    if expected == 'gzip':
+                        data = gzip.decompress(data)
+                    elif expected == 'deflate':
+                        data = zlib.decompress(data)
+                    self.assertEqual(
+                        json.loads(data), {'data': ['x' * 2000]})
+
+    def test_http_edgeql_etag_01(self):
+        with self.http_con() as con:
+            data, headers, status = self.http_con_request(
+                con, {'query': 'SELECT 42;'})
+
+            self.assertEqual(status, 200)
+            # http_con_read_response() lowercases header values.
+            self.assertTrue(headers['etag'].startswith('w/"'))
+            etag = 'W/' + headers['etag'][2:]
+
+            data, headers, status = self.http_con_request(
+                con, {'query': 'SELECT 42;'},
+                headers={'If-None-Match': etag})
+
+            self.assertEqual(status, 304)
+            self.assertEqual(data, b'')
+            self.assertEqual(headers['etag'], etag.lower())
+
+            data, headers, status = self.http_con_request(
+                con, {'query': 'SELECT 43;'},
+                headers={'If-None-Match': etag})
+
+            self.assertEqual(status, 200)
+            self.assertNotEqual(headers['etag'], etag.lower())
+            self.assertEqual(json.loads(data), {'data': [43]})
+
+            # Errors are never tagged.
+            data, headers, status = self.http_con_request(
+                con, {'query': 'SELECT 1 // 0;'})
+
+            self.assertEqual(status, 200)
+            self.assertNotIn('etag', headers)
+
+    async def test_http_edgeql_result_cache_01(self):
+        query = r"""
+            SELECT Setting { value }
+            FILTER .name = <str>$name;
+        """
+
+        def check(value):
+            for _ in range(2):
+                self.assert_edgeql_query_result(
+                    query, [{'value': value}],
+                    variables={'name': 'template'})
+
+        check('blue')
+        self.assert_edgeql_query_result(
+            query, [{'value': 'full'}], variables={'name': 'perks'})
+
+        try:
+            # A mutation through the binary protocol.
+            await self.con.execute(r"""
+                UPDATE Setting
+                FILTER .name = 'template'
+                SET { value := 'red' };
+            """)
+            check('red')
+
+            # A mutation through the HTTP port itself.
+            self.edgeql_query(r"""
+                UPDATE Setting
+                FILTER .name = 'template'
+                SET { value := 'green' };
+            """)
+            check('green')
+
+            # Transactions invalidate the results on commit.
+            async with self.con.transaction():
+                await self.con.execute(r"""
+                    UPDATE Setting
+                    FILTER .name = 'template'
+                    SET { value := 'yellow' };
+                """)
+                check('green')
+            check('yellow')
+
+        finally:
+            await self.con.execute(r"""
+                UPDATE Setting
+                FILTER .name = 'template'
+                SET { value := 'blue' };
+            """)
+
+        check('blue')
+
+    async def test_http_edgeql_result_cache_02(self):
+        # Mutations invalidate the results of queries reading
+        # the ancestors of the modified type.
+        query = r"""
+            SELECT count(NamedObject FILTER .name = 'cache test');
+        """
+
+        self.assert_edgeql_query_result(query, [0])
+        self.assert_edgeql_query_result(query, [0])
+
+        try:
+            await self.con.execute(r"""
+                INSERT Setting {
+                    name := 'cache test',
+                    value := 'none'
+                };
+            """)
+            self.assert_edgeql_query_result(query, [1])
+
+        finally:
+            await self.con.execute(r"""
+                DELETE Setting FILTER .name = 'cache test';
+            """)
+
+        self.assert_edgeql_query_result(query, [0])
@@ -39,6 +39,9 @@ class TestGraphQLMutation(tb.GraphQLTestCase):
     ISOLATED_METHODS = False
     SERIALIZED = True
 
+    # Make sure mutations invalidate cached query results.
+    PORT_RESULT_CACHE_SIZE = 100
+
     def test_graphql_mutation_insert_scalars_01(self):
         data = {
             'p_bool': False,
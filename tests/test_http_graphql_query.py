@@ -17,12 +17,14 @@
 #
 
 
+import hashlib
 import json
 import os
 import uuid
 
 import edgedb
 
+from edb.server import defines
 from edb.testbase import http as tb
 from edb.tools import test
 
@@ -129,6 +131,135 @@ class TestGraphQLFunctional(tb.GraphQLTestCase):
             with self.assertRaises(OSError):
                 self.http_con_request(con, {}, path='non-existant')
 
+    def test_graphql_http_batch_01(self):
+        resp = self.graphql_post([
+            {
+                'query': r"""
+                    query {
+                        Setting(order: {value: {dir: ASC}}) {
+                            value
+                        }
+                    }
+                """
+            },
+            {
+                'query': r"""
+                    query($name: String) {
+                        User(filter: {name: {eq: $name}}) {
+                            age
+                        }
+                    }
+                """,
+                'variables': {'name': 'John'},
+            },
+            {
+                'query': r"""
+                    query {
+                        NON_EXISTING_TYPE {
+                            name
+                        }
+                    }
+                """
+            },
+        ])
+
+        self.assertEqual(len(resp), 3)
+        self.assertEqual(
+            resp[0]['data'],
+            {'Setting': [{'value': 'blue'}, {'value': 'full'}]})
+        self.assertEqual(
+            resp[1]['data'],
+            {'User': [{'age': 25}]})
+        self.assertIn('QueryError:', resp[2]['errors'][0]['message'])
+
+    def test_graphql_http_batch_02(self):
+        with self.http_con() as con:
+            con.request(
+                'POST', self.http_addr, body=b'[]',
+                headers={'Content-Type': 'application/json'})
+            data, headers, status = self.http_con_read_response(con)
+
+            self.assertEqual(status, 400)
+            self.assertIn(b'at least one operation', data)
+
+    def test_graphql_http_batch_03(self):
+        op = {'query': 'query { Setting { value } }'}
+        body = json.dumps(
+            [op] * (defines.HTTP_PORT_GRAPHQL_MAX_BATCH_SIZE + 1))
+
+        with self.http_con() as con:
+            con.request(
+                'POST', self.http_addr, body=body.encode(),
+                headers={'Content-Type': 'application/json'})
+            data, headers, status = self.http_con_read_response(con)
+
+            self.assertEqual(status, 400)
+            self.assertIn(b'at most', data)
+
+        # A batch of the maximum size is still accepted.
+        resp = self.graphql_post(
+            [op] * defines.HTTP_PORT_GRAPHQL_MAX_BATCH_SIZE)
+        self.assertEqual(
+            len(resp), defines.HTTP_PORT_GRAPHQL_MAX_BATCH_SIZE)
+        for result in resp:
+            self.assertEqual(len(result['data']['Setting']), 2)
+
+    def test_graphql_http_persisted_01(self):
+        query = r"""
+            query {
+                Setting(order: {value: {dir: ASC}}) {
+                    value
+                }
+            }
+        """
+        query_hash = hashlib.sha256(query.encode()).hexdigest()
+        extensions = {
+            'persistedQuery': {
+                'version': 1,
+                'sha256Hash': query_hash,
+            },
+        }
+
+        resp = self.graphql_post({
+            'extensions': {
+                'persistedQuery': {
+                    'version': 1,
+                    'sha256Hash': '0' * 64,
+                },
+            },
+        })
+        self.assertEqual(
+            resp['errors'][0]['message'], 'PersistedQueryNotFound')
+
+        resp = self.graphql_post({
+            'query': query,
+            'extensions': extensions,
+        })
+        self.assertEqual(
+            resp['data'],
+            {'Setting': [{'value': 'blue'}, {'value': 'full'}]})
+
+        for _ in range(3):
+            resp = self.graphql_post({'extensions': extensions})
+            self.assertEqual(
+                resp['data'],
+                {'Setting': [{'value': 'blue'}, {'value': 'full'}]})
+
+    def test_graphql_http_persisted_02(self):
+        with self.http_con() as con:
+            data, headers, status = self.http_con_request(con, {
+                'query': '{ Setting { value } }',
+                'extensions': json.dumps({
+                    'persistedQuery': {
+                        'version': 1,
+                        'sha256Hash': '0' * 64,
+                    },
+                }),
+            })
+
+            self.assertEqual(status, 400)
+            self.assertIn(b'hash does not match', data)
+
     def test_graphql_functional_query_01(self):
         for _ in range(10):  # repeat to test prepared pgcon statements
             self.assert_graphql_query_result(r"""
@@ -2805,6 +2936,83 @@ class TestGraphQLFunctional(tb.GraphQLTestCase):
                 variables={'limit': '1'},
             )
 
+    def test_graphql_functional_variables_40(self):
+        # The compiled query depends on the value of $val, so
+        # alternating values must each get their own cached variant.
+        query = r"""
+            query($val: Boolean!) {
+                User(order: {name: {dir: ASC}}) {
+                    name @include(if: $val),
+                    age @skip(if: $val)
+                }
+            }
+        """
+
+        for _ in range(3):
+            self.assert_graphql_query_result(
+                query,
+                {
+                    "User": [
+                        {"name": "Alice"},
+                        {"name": "Bob"},
+                        {"name": "Jane"},
+                        {"name": "John"},
+                    ]
+                },
+                variables={'val': True},
+            )
+
+            self.assert_graphql_query_result(
+                query,
+                {
+                    "User": [
+                        {"age": 27},
+                        {"age": 21},
+                        {"age": 25},
+                        {"age": 25},
+                    ]
+                },
+                variables={'val': False},
+            )
+
+    def test_graphql_functional_variables_41(self):
+        # A request that omits a critical variable must use its
+        # declared default, not the value sent by whichever request
+        # happened to compile the cached variant first.
+        query = r"""
+            query($val: Boolean = true) {
+                User(order: {name: {dir: ASC}}) {
+                    name @include(if: $val),
+                    age @skip(if: $val)
+                }
+            }
+        """
+
+        self.assert_graphql_query_result(
+            query,
+            {
+                "User": [
+                    {"age": 27},
+                    {"age": 21},
+                    {"age": 25},
+                    {"age": 25},
+                ]
+            },
+            variables={'val': False},
+        )
+
+        self.assert_graphql_query_result(
+            query,
+            {
+                "User": [
+                    {"name": "Alice"},
+                    {"name": "Bob"},
+                    {"name": "Jane"},
+                    {"name": "John"},
+                ]
+            },
+        )
+
     def test_graphql_functional_enum_01(self):
         with self.assertRaisesRegex(
                 edgedb.QueryError,
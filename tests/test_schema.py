@@ -17,7 +17,11 @@
 #
 
 
+import gc
+import pickle
 import re
+import unittest.mock
+import weakref
 
 from edb import errors
 
@@ -29,10 +33,14 @@ from edb.edgeql import compiler as qlcompiler
 from edb.edgeql import parser as qlparser
 from edb.edgeql import qltypes
 
+from edb.schema import casts as s_casts
 from edb.schema import delta as s_delta
 from edb.schema import ddl as s_ddl
 from edb.schema import links as s_links
+from edb.schema import modules as s_mod
+from edb.schema import objects as so
 from edb.schema import objtypes as s_objtypes
+from edb.schema import schema as s_schema
 
 from edb.tools import test
 
@@ -426,6 +434,281 @@ _123456789_123456789_123456789 -> str
             })
         )
 
+    def test_schema_refs_04(self):
+        schema = self.load_schema("""
+            type Object1 {
+                property num -> int64;
+                link next -> Object1;
+            };
+        """)
+
+        Obj1 = schema.get('test::Object1')
+        obj1_num = Obj1.getptr(schema, 'num')
+        referrers = schema.get_referrers(Obj1)
+
+        ir = qlcompiler.compile_ast_to_ir(
+            qlparser.parse('''
+                SELECT test::Object1 {
+                    num,
+                    next: {num},
+                    double := .num * 2,
+                }
+            '''),
+            schema,
+        )
+
+        # Views derived by the query compiler are query-local: they are
+        # in the schema, but are not recorded as referrers of the types
+        # they are derived from.
+        view = ir.schema.get_by_id(ir.stype.id)
+        self.assertTrue(view.get_is_derived(ir.schema))
+        self.assertEqual(view.get_bases(ir.schema).objects(ir.schema),
+                         (Obj1,))
+        self.assertEqual(ir.schema.get_referrers(Obj1), referrers)
+        self.assertEqual(ir.schema.get_descendants(Obj1), frozenset())
+        self.assertEqual(
+            ir.schema.get_referrers(obj1_num),
+            schema.get_referrers(obj1_num),
+        )
+
+    def _assert_get_objects_consistent(self, schema):
+        # Indexed get_objects() must return what filtering every
+        # object in the schema does.
+        def brute_force(type, included_modules, excluded_modules):
+            if included_modules and excluded_modules:
+                included_modules = (
+                    set(included_modules) - set(excluded_modules))
+                excluded_modules = None
+
+            result = set()
+            for obj in schema._id_to_type.values():
+                if type is not None and not isinstance(obj, type):
+                    continue
+                if isinstance(obj, so.UnqualifiedObject):
+                    module = None
+                else:
+                    module = obj.get_name(schema).module
+                if included_modules:
+                    if module not in included_modules:
+                        continue
+                elif excluded_modules:
+                    if module in excluded_modules:
+                        continue
+                result.add(obj)
+            return result
+
+        for type in (None, s_objtypes.ObjectType, s_links.Link, s_mod.Module):
+            for included_modules in (None, ['test'], ['test', 'other']):
+                for excluded_modules in (None, ['std', 'schema'], ['test']):
+                    with self.subTest(type=type,
+                                      included_modules=included_modules,
+                                      excluded_modules=excluded_modules):
+                        objects = list(schema.get_objects(
+                            type=type,
+                            included_modules=included_modules,
+                            excluded_modules=excluded_modules,
+                        ))
+                        self.assertEqual(len(objects), len(set(objects)))
+                        self.assertEqual(
+                            set(objects),
+                            brute_force(
+                                type, included_modules, excluded_modules),
+                        )
+
+    def test_schema_get_objects_01(self):
+        schema = self.load_schema("""
+            type A;
+            type B extending A {
+                property p -> str;
+                link l -> A;
+            };
+        """)
+        self._assert_get_objects_consistent(schema)
+
+        schema = self.run_ddl(schema, '''
+            CREATE MODULE other;
+            CREATE TYPE other::C {
+                CREATE LINK l -> test::B;
+            };
+        ''')
+        self._assert_get_objects_consistent(schema)
+
+        # Rename within the module.
+        schema = self.run_ddl(schema, '''
+            ALTER TYPE test::A {
+                RENAME TO test::A2;
+            };
+        ''')
+        self._assert_get_objects_consistent(schema)
+        self.assertNotIn(
+            'test::A',
+            {str(o.get_name(schema))
+             for o in schema.get_objects(included_modules=['test'])})
+
+        # Move to another module.
+        schema = self.run_ddl(schema, '''
+            ALTER TYPE test::B {
+                RENAME TO other::B;
+            };
+        ''')
+        self._assert_get_objects_consistent(schema)
+        self.assertIn(
+            schema.get('other::B'),
+            set(schema.get_objects(
+                type=s_objtypes.ObjectType, included_modules=['other'])))
+
+        schema = self.run_ddl(schema, '''
+            DROP TYPE other::C;
+            DROP TYPE other::B;
+        ''')
+        self._assert_get_objects_consistent(schema)
+        self.assertEqual(
+            list(schema.get_objects(
+                type=s_objtypes.ObjectType, included_modules=['other'])),
+            [])
+
+    def test_schema_lookup_cache_01(self):
+        schema = self.load_schema("""
+            type Object1;
+            type Object2 extending Object1;
+        """)
+
+        Obj1 = schema.get('test::Object1')
+        Obj2 = schema.get('test::Object2')
+        referrers = schema.get_referrers(
+            Obj1, scls_type=s_objtypes.ObjectType)
+        self.assertEqual(referrers, {Obj2})
+
+        # An unrelated change keeps the cached lookup...
+        schema = self.run_ddl(schema, '''
+            CREATE TYPE test::Object3;
+        ''')
+        self.assertIs(
+            schema.get_referrers(Obj1, scls_type=s_objtypes.ObjectType),
+            referrers,
+        )
+
+        # ...but a change to the data it depends on invalidates it.
+        schema = self.run_ddl(schema, '''
+            CREATE TYPE test::Object4 EXTENDING test::Object1;
+        ''')
+        Obj4 = schema.get('test::Object4')
+        self.assertEqual(
+            schema.get_referrers(Obj1, scls_type=s_objtypes.ObjectType),
+            {Obj2, Obj4},
+        )
+
+        # The cache is bounded.
+        with unittest.mock.patch.object(s_schema, 'LOOKUP_CACHE_SIZE', 2):
+            for obj in (Obj1, Obj2, Obj4):
+                schema.get_referrers_ex(obj)
+                self.assertLessEqual(len(schema._lookup_cache), 2)
+            self.assertEqual(
+                schema.get_referrers(Obj1, scls_type=s_objtypes.ObjectType),
+                {Obj2, Obj4},
+            )
+
+    def test_schema_memo_01(self):
+        schema = self.load_schema("""
+            type Object1 {
+                property num -> int64;
+            };
+        """)
+
+        int16 = schema.get('std::int16')
+        int64 = schema.get('std::int64')
+        float64 = schema.get('std::float64')
+        self.assertEqual(
+            s_casts.get_implicit_cast_distance(schema, int64, int64), 0)
+        self.assertEqual(
+            s_casts.get_implicit_cast_distance(schema, int16, float64), 2)
+        self.assertEqual(
+            s_casts.get_implicit_cast_distance(schema, float64, int16), -1)
+
+        schema.set_memoized('test', 42)
+
+        # Compiling a query only adds query-local objects to the schema,
+        # so the memo is retained...
+        ir = qlcompiler.compile_ast_to_ir(
+            qlparser.parse('''
+                SELECT test::Object1 {
+                    double := .num * 2 + <int16>1,
+                }
+            '''),
+            schema,
+        )
+        self.assertEqual(ir.schema.get_memoized('test'), 42)
+
+        # ...but not across schema changes.
+        schema = self.run_ddl(schema, '''
+            CREATE TYPE test::Object2;
+        ''')
+        self.assertIsNone(schema.get_memoized('test'))
+
+    def test_schema_storage_01(self):
+        schema = self.load_schema("""
+            type Base;
+            type Object1 extending Base {
+                property num -> int64;
+            };
+            type Object2 extending Base {
+                property num -> int64;
+            };
+        """)
+
+        Obj1 = schema.get('test::Object1')
+        Obj2 = schema.get('test::Object2')
+        obj1_num = Obj1.getptr(schema, 'num')
+        obj2_num = Obj2.getptr(schema, 'num')
+
+        # Objects with the same set of fields share the field layout,
+        # and equal field values are stored once.
+        data1 = schema._id_to_data[Obj1.id]
+        data2 = schema._id_to_data[Obj2.id]
+        self.assertIs(data1[0], data2[0])
+        self.assertIs(pickle.loads(pickle.dumps(data1))[0], data1[0])
+        self.assertIs(Obj1.get_bases(schema), Obj2.get_bases(schema))
+        self.assertIs(obj1_num.get_target(schema), schema.get('std::int64'))
+        self.assertIs(
+            obj1_num.get_inherited_fields(schema),
+            obj2_num.get_inherited_fields(schema),
+        )
+
+        schema = self.run_ddl(schema, '''
+            ALTER TYPE test::Object2 {
+                DROP PROPERTY num;
+                CREATE PROPERTY name -> str;
+            };
+        ''')
+        Obj2 = schema.get('test::Object2')
+        self.assertIsNone(Obj2.getptr(schema, 'num'))
+        self.assertIs(Obj2.getptr(schema, 'name').get_target(schema),
+                      schema.get('std::str'))
+        self.assertIs(Obj1.get_bases(schema), Obj2.get_bases(schema))
+
+    def test_schema_storage_02(self):
+        schema = self.load_schema("""
+            type Base1;
+            type Base2;
+            type Object1 extending Base1, Base2;
+        """)
+
+        Obj1 = schema.get('test::Object1')
+        bases = Obj1.get_bases(schema)
+        bases_ref = weakref.ref(bases)
+        interned = schema._interned[type(bases)]
+        bases_hash = hash(bases)
+        self.assertIs(interned[bases_hash], bases)
+        del bases
+
+        # Interned values are released once no schema stores them.
+        schema = self.run_ddl(schema, '''
+            DROP TYPE test::Object1;
+        ''')
+        gc.collect()
+        self.assertIsNone(bases_ref())
+        self.assertNotIn(bases_hash, interned)
+
     def test_schema_annotation_inheritance_01(self):
         schema = self.load_schema("""
             abstract annotation noninh;
@@ -111,3 +111,101 @@ class TestServerOps(tb.TestCase):
             if proc.returncode is None:
                 proc.terminate()
                 await proc.wait()
+
+    async def test_server_ops_io_workers(self):
+        # Test that "edgedb-server --io-workers=N" serves connections
+        # from several processes and that system config changes and DDL
+        # are propagated to all of them.
+
+        async def read_runtime_info(stdout: asyncio.StreamReader):
+            while True:
+                line = await stdout.readline()
+                if line.startswith(b'EDGEDB_SERVER_DATA:'):
+                    break
+
+            dataline = line.decode().split('EDGEDB_SERVER_DATA:', 1)[1]
+            data = json.loads(dataline)
+            return data
+
+        async def retry(func, exc_type):
+            # Events are propagated to the workers asynchronously,
+            # so poll until *func* stops failing with *exc_type*.
+            i = 10 * 30  # Give it up to 30 seconds.
+            while True:
+                try:
+                    return await func()
+                except exc_type:
+                    i -= 1
+                    if i <= 0:
+                        raise
+                    await asyncio.sleep(0.1)
+
+        cmd = [
+            sys.executable, '-m', 'edb.server.main',
+            '--port', 'auto',
+            '--temp-dir',
+            '--io-workers', '3',
+            '--echo-runtime-info'
+        ]
+
+        # Note: for debug comment "stderr=subprocess.PIPE".
+        proc: asyncio.Process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stderr=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+        cons = []
+        try:
+            data = await asyncio.wait_for(
+                read_runtime_info(proc.stdout),
+                timeout=100)
+
+            runstate_dir = data['runstate_dir']
+            port = data['port']
+
+            admin_con = await edgedb.async_connect(
+                host=runstate_dir, port=port, admin=True)
+            cons.append(admin_con)
+
+            # Only the admin socket accepts connections without
+            # a password, every worker must see the new Auth.
+            await admin_con.fetchall('''
+                CONFIGURE SYSTEM INSERT Auth {
+                    priority := 0,
+                    method := (INSERT Trust),
+                }
+            ''')
+
+            # SO_REUSEPORT spreads connections across the workers.
+            for _ in range(12):
+                con = await retry(
+                    lambda: edgedb.async_connect(
+                        host='127.0.0.1', port=port,
+                        user='edgedb', database='edgedb'),
+                    edgedb.AuthenticationError)
+                cons.append(con)
+                with self.assertRaises(edgedb.InvalidReferenceError):
+                    await con.fetchall('SELECT test_io::Foo')
+
+            await admin_con.fetchall('''
+                CREATE MODULE test_io;
+                CREATE TYPE test_io::Foo;
+            ''')
+
+            for con in cons:
+                self.assertEqual(
+                    await retry(
+                        lambda: con.fetchall('SELECT count(test_io::Foo)'),
+                        edgedb.InvalidReferenceError),
+                    [0])
+
+        finally:
+            for con in cons:
+                await con.aclose()
+
+            if proc.returncode is None:
+                proc.terminate()
+                await proc.wait()
+
+            self.assertEqual(proc.returncode, 0)
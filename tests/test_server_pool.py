@@ -0,0 +1,127 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import asyncio
+import itertools
+
+from edb import errors
+from edb.server.http import pool
+from edb.testbase import server as tb
+
+
+class TestResourcePool(tb.TestCase):
+
+    def make_pool(self, **kwargs):
+        counter = itertools.count()
+        self.closed = []
+
+        async def connect():
+            return next(counter)
+
+        async def disconnect(resource):
+            self.closed.append(resource)
+
+        kwargs.setdefault('min_size', 1)
+        kwargs.setdefault('max_size', 3)
+        kwargs.setdefault('idle_timeout', 10)
+        kwargs.setdefault('queue_timeout', 10)
+
+        return pool.ResourcePool(
+            loop=self.loop,
+            name='resource',
+            connect=connect,
+            disconnect=disconnect,
+            **kwargs)
+
+    async def test_server_pool_01(self):
+        p = self.make_pool()
+        await p.start()
+        self.assertEqual(p.size, 1)
+
+        r1 = await p.acquire()
+        r2 = await p.acquire()
+        r3 = await p.acquire()
+        self.assertEqual({r1, r2, r3}, {0, 1, 2})
+        self.assertEqual(p.size, 3)
+
+        p.release(r2)
+        # The most recently released resource is reused first.
+        p.release(r3)
+        self.assertEqual(await p.acquire(), r3)
+        self.assertEqual(p.size, 3)
+
+        p.release(r1)
+        p.release(r3)
+        await p.close()
+        self.assertEqual(sorted(self.closed), [0, 1, 2])
+        self.assertEqual(p.size, 0)
+
+    async def test_server_pool_02(self):
+        p = self.make_pool(max_size=1, queue_timeout=0.1)
+        await p.start()
+
+        r1 = await p.acquire()
+        with self.assertRaises(errors.QueryTimeoutError):
+            await p.acquire()
+
+        waiter = self.loop.create_task(p.acquire())
+        await asyncio.sleep(0.01)
+        self.assertEqual(p.get_stats()['waiting'], 1)
+        p.release(r1)
+        self.assertEqual(await waiter, r1)
+
+        p.release(r1)
+        await p.close()
+
+    async def test_server_pool_03(self):
+        p = self.make_pool(min_size=1, idle_timeout=0.1)
+        await p.start()
+
+        resources = [await p.acquire() for _ in range(3)]
+        for r in resources:
+            p.release(r)
+        self.assertEqual(p.size, 3)
+
+        await asyncio.sleep(0.3)
+        self.assertEqual(p.size, 1)
+        self.assertEqual(len(self.closed), 2)
+
+        await p.close()
+
+    async def test_server_pool_04(self):
+        p = self.make_pool(max_size=1)
+        await p.start()
+
+        r1 = await p.acquire()
+        waiter = self.loop.create_task(p.acquire())
+        await asyncio.sleep(0.01)
+
+        # A broken resource is replaced for the waiting request.
+        p.release(r1, discard=True)
+        r2 = await waiter
+        self.assertNotEqual(r1, r2)
+        self.assertEqual(p.size, 1)
+
+        p.release(r2)
+        await p.close()
+        self.assertEqual(sorted(self.closed), [r1, r2])
+
+    async def test_server_pool_05(self):
+        with self.assertRaises(ValueError):
+            self.make_pool(min_size=4, max_size=3)
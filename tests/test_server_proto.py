@@ -679,6 +679,88 @@ class TestServerProto(tb.QueryTestCase):
             await self.con.fetchone(
                 'select schema::Object {name} filter .id=$id', id='asd')
 
+    async def test_server_proto_args_08(self):
+        # Arguments larger than the threshold above which the server
+        # forwards argument data to Postgres without copying it.
+        big_str = 'x' * 100_000 + '你好'
+        big_bytes = bytes(range(256)) * 400
+
+        # Repeat so that both the anonymous and the prepared statement
+        # paths are taken.
+        for _ in range(3):
+            self.assertEqual(
+                await self.con.fetchone('select <str>$0', big_str),
+                big_str)
+
+            self.assertEqual(
+                await self.con.fetchone('select <bytes>$0', big_bytes),
+                big_bytes)
+
+            # Empty values between large ones.
+            result = await self.con.fetchone(
+                'select (<str>$0, <str>$1, <bytes>$2, <str>$3, <int64>$4)',
+                '', big_str, b'', big_str[:10], 42)
+            self.assertEqual(
+                tuple(result), ('', big_str, b'', big_str[:10], 42))
+
+    async def test_server_proto_args_09(self):
+        # Array arguments have their element type OIDs patched on the
+        # way to Postgres; make sure that works when the array, or the
+        # data around it, is larger than the no-copy threshold.
+        big_str = 'y' * 50_000
+        big_strs = ['a', big_str, '', big_str + 'z', 'b']
+        big_ints = list(range(5000))
+
+        for _ in range(3):
+            result = await self.con.fetchone(
+                r'''
+                    select (
+                        <array<str>>$0,
+                        <str>$1,
+                        <array<int64>>$2,
+                        <array<str>>$3,
+                        <str>$4,
+                    )
+                ''',
+                big_strs, big_str, big_ints, [], 'tail')
+
+            self.assertEqual(list(result[0]), big_strs)
+            self.assertEqual(result[1], big_str)
+            self.assertEqual(list(result[2]), big_ints)
+            self.assertEqual(list(result[3]), [])
+            self.assertEqual(result[4], 'tail')
+
+            self.assertEqual(
+                await self.con.fetchone(
+                    r'''
+                        select sum(array_unpack(<array<int64>>$0))
+                            + len(<str>$1)
+                    ''',
+                    big_ints, big_str),
+                sum(big_ints) + len(big_str))
+
+    async def test_server_proto_args_10(self):
+        # Large arguments in DML inside a transaction.
+        big_str = 'z' * 70_000
+
+        async with self.con.transaction():
+            for i in range(3):
+                await self.con.fetchall(
+                    'insert test::Tmp { tmp := <str>$0 ++ <str>$1 }',
+                    big_str, str(i))
+
+            self.assertEqual(
+                await self.con.fetchall(
+                    r'''
+                        select test::Tmp.tmp
+                        filter test::Tmp.tmp like <str>$0 ++ '%'
+                        order by test::Tmp.tmp
+                    ''',
+                    big_str),
+                edgedb.Set([big_str + str(i) for i in range(3)]))
+
+            await self.con.execute('delete test::Tmp')
+
     async def test_server_proto_wait_cancel_01(self):
         # Test that client protocol handles waits interrupted
         # by closing.
@@ -0,0 +1,160 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os.path
+import unittest.mock
+
+from edb.testbase import lang as tb
+from edb.edgeql import compiler
+from edb.edgeql import parser as qlparser
+from edb.schema import types as s_types
+from edb.server.compiler import sertypes
+
+
+class TestServerSerTypes(tb.BaseEdgeQLCompilerTest):
+
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'cards.esdl')
+
+    def describe_query(self, query, schema=None):
+        ir = compiler.compile_ast_to_ir(
+            qlparser.parse(query),
+            self.schema if schema is None else schema,
+            modaliases={None: 'test'},
+            implicit_tid_in_shapes=True,
+            implicit_id_in_shapes=True,
+        )
+        return sertypes.TypeSerializer.describe(
+            ir.schema, ir.stype, ir.view_shapes, ir.view_shapes_metadata)
+
+    def test_server_sertypes_shape_01(self):
+        query = r'''
+            SELECT User {
+                name,
+                deck: {
+                    name,
+                    @count
+                },
+                avatar: {
+                    name
+                }
+            }
+        '''
+
+        desc, type_id = self.describe_query(query)
+        shape = sertypes.TypeSerializer.parse(desc)
+        self.assertIsInstance(shape, sertypes.ShapeDesc)
+        self.assertEqual(shape.tid, type_id)
+        self.assertEqual(
+            list(shape.fields),
+            ['__tid__', 'id', 'name', 'deck', 'avatar'])
+        self.assertEqual(
+            shape.flags['__tid__'],
+            sertypes.TypeSerializer.EDGE_POINTER_IS_IMPLICIT)
+        self.assertEqual(
+            shape.flags['deck'],
+            sertypes.TypeSerializer.EDGE_POINTER_IS_LINK)
+
+        deck = shape.fields['deck']
+        self.assertIsInstance(deck, sertypes.SetDesc)
+        self.assertEqual(
+            list(deck.subtype.fields),
+            ['__tid__', 'id', 'name', 'count'])
+        self.assertEqual(
+            deck.subtype.flags['count'],
+            sertypes.TypeSerializer.EDGE_POINTER_IS_LINKPROP)
+
+        # Describing the same shape compiled again reuses the
+        # memoized descriptor.
+        desc2, type_id2 = self.describe_query(query)
+        self.assertIs(desc2, desc)
+        self.assertEqual(type_id2, type_id)
+
+    def test_server_sertypes_shape_02(self):
+        # A shape sharing a subshape with another one gets the same
+        # descriptor for it.
+        desc1, _ = self.describe_query(r'''
+            SELECT User { name, avatar: { name, cost } }
+        ''')
+        desc2, _ = self.describe_query(r'''
+            SELECT User { avatar: { name, cost } }
+        ''')
+
+        avatar1 = sertypes.TypeSerializer.parse(desc1).fields['avatar']
+        avatar2 = sertypes.TypeSerializer.parse(desc2).fields['avatar']
+        self.assertEqual(avatar1, avatar2)
+        self.assertNotEqual(
+            sertypes.TypeSerializer.parse(desc1).tid,
+            sertypes.TypeSerializer.parse(desc2).tid)
+
+    def test_server_sertypes_tuple_01(self):
+        schema = self.schema
+        params = s_types.Tuple.create(
+            schema,
+            element_types={
+                'a': schema.get('std::str'),
+                'b': s_types.Array.create(
+                    schema, element_type=schema.get('std::int64')),
+            },
+            named=True,
+        )
+
+        desc, type_id = sertypes.TypeSerializer.describe(
+            schema, params, {}, {})
+        tup = sertypes.TypeSerializer.parse(desc)
+        self.assertIsInstance(tup, sertypes.NamedTupleDesc)
+        self.assertEqual(tup.tid, type_id)
+        self.assertEqual(list(tup.fields), ['a', 'b'])
+        self.assertIsInstance(tup.fields['a'], sertypes.BaseScalarDesc)
+        self.assertIsInstance(tup.fields['b'], sertypes.ArrayDesc)
+        self.assertEqual(
+            tup.fields['b'].subtype.tid,
+            schema.get('std::int64').id)
+
+        empty = s_types.Tuple.create(schema, element_types={}, named=False)
+        desc, type_id = sertypes.TypeSerializer.describe(
+            schema, empty, {}, {})
+        self.assertEqual(desc, sertypes.EMPTY_TUPLE_DESC)
+        self.assertEqual(type_id.bytes, sertypes.EMPTY_TUPLE_ID)
+
+    def test_server_sertypes_cache_01(self):
+        queries = [
+            'SELECT User { name, avatar: { name, cost } }',
+            'SELECT User { avatar: { name, cost } }',
+            'SELECT Card { name, element, cost }',
+        ]
+        expected = [self.describe_query(q) for q in queries]
+
+        # The memoized descriptors and nodes are bounded, and evicted
+        # nodes, scalar ones included, are rebuilt as needed.
+        with unittest.mock.patch.object(
+                sertypes, 'TYPE_DESCRIPTOR_CACHE_SIZE', 1), \
+                unittest.mock.patch.object(
+                    sertypes, 'TYPE_DESCRIPTOR_NODES_CACHE_SIZE', 1):
+            # A fresh schema version, so that the memo is empty.
+            schema = self.schema._replace()
+            for _ in range(2):
+                for query, (desc, type_id) in zip(queries, expected):
+                    self.assertEqual(
+                        self.describe_query(query, schema),
+                        (desc, type_id))
+
+            self.assertEqual(len(schema.get_memoized('type_descriptors')), 1)
+            self.assertEqual(
+                len(schema.get_memoized('type_descriptor_nodes')), 1)